@@ -0,0 +1,75 @@
+"""add_report_rollups
+
+Revision ID: a3c1f7e92b5d
+Revises: 6d8b82171b04
+Create Date: 2026-01-10 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1f7e92b5d'
+down_revision: Union[str, Sequence[str], None] = '6d8b82171b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sales_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('scope', sa.String(length=16), nullable=False),
+    sa.Column('bucket', sa.String(length=32), nullable=False),
+    sa.Column('sale_count', sa.Integer(), nullable=False),
+    sa.Column('total_quantity', sa.Integer(), nullable=False),
+    sa.Column('total_revenue', sa.Float(), nullable=False),
+    sa.Column('total_cost', sa.Float(), nullable=False),
+    sa.Column('total_extra_cost', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('scope', 'bucket', name='uq_sales_rollups_scope_bucket')
+    )
+    op.create_table('inventory_rollup',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('total_products', sa.Integer(), nullable=False),
+    sa.Column('total_items', sa.Integer(), nullable=False),
+    sa.Column('low_stock_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+    # پر کردن rollup ها از روی داده‌های موجود
+    sums = (
+        "COUNT(*), COALESCE(SUM(quantity), 0), COALESCE(SUM(total_sale), 0), "
+        "COALESCE(SUM(total_cost), 0), COALESCE(SUM(extra_cost), 0)"
+    )
+    columns = (
+        "scope, bucket, sale_count, total_quantity, total_revenue, total_cost, total_extra_cost"
+    )
+    op.execute(
+        f"INSERT INTO sales_rollups ({columns}) "
+        f"SELECT 'total', '', {sums} FROM sales"
+    )
+    op.execute(
+        f"INSERT INTO sales_rollups ({columns}) "
+        f"SELECT 'product', CAST(product_id AS VARCHAR), {sums} FROM sales "
+        "WHERE product_id IS NOT NULL GROUP BY product_id"
+    )
+    op.execute(
+        f"INSERT INTO sales_rollups ({columns}) "
+        f"SELECT 'day', TO_CHAR(sale_date, 'YYYY-MM-DD'), {sums} FROM sales "
+        "WHERE sale_date IS NOT NULL GROUP BY TO_CHAR(sale_date, 'YYYY-MM-DD')"
+    )
+    op.execute(
+        "INSERT INTO inventory_rollup (id, total_products, total_items, low_stock_count) "
+        "SELECT 1, COUNT(*), COALESCE(SUM(stock), 0), "
+        "COUNT(*) FILTER (WHERE stock > 0 AND stock <= 2) FROM products"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('inventory_rollup')
+    op.drop_table('sales_rollups')
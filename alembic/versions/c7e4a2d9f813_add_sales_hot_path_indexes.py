@@ -0,0 +1,49 @@
+"""add_sales_hot_path_indexes
+
+Revision ID: c7e4a2d9f813
+Revises: a3c1f7e92b5d
+Create Date: 2026-01-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e4a2d9f813'
+down_revision: Union[str, Sequence[str], None] = 'a3c1f7e92b5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY تا ساخت index جلوی ثبت فروش را نگیرد (بیرون از تراکنش اجرا می‌شود)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_sales_sale_date_id', 'sales',
+            [sa.text('sale_date DESC'), sa.text('id DESC')],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_sales_product_id_sale_date', 'sales',
+            ['product_id', 'sale_date'],
+            postgresql_concurrently=True,
+        )
+        # آستانه کم‌موجودی (LOW_STOCK_THRESHOLD) در زمان این migration برابر 2 است
+        op.create_index(
+            'ix_products_low_stock', 'products',
+            ['stock'],
+            postgresql_where=sa.text('stock <= 2'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_products_low_stock', table_name='products', postgresql_concurrently=True)
+        op.drop_index('ix_sales_product_id_sale_date', table_name='sales', postgresql_concurrently=True)
+        op.drop_index('ix_sales_sale_date_id', table_name='sales', postgresql_concurrently=True)
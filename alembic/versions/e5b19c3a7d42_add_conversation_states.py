@@ -0,0 +1,35 @@
+"""add_conversation_states
+
+Revision ID: e5b19c3a7d42
+Revises: c7e4a2d9f813
+Create Date: 2026-01-24 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b19c3a7d42'
+down_revision: Union[str, Sequence[str], None] = 'c7e4a2d9f813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('conversation_states',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('value', sa.Text(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_conversation_states_expires_at'), 'conversation_states', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_conversation_states_expires_at'), table_name='conversation_states')
+    op.drop_table('conversation_states')
@@ -0,0 +1,46 @@
+"""add_sale_jalali_date
+
+Revision ID: f2a8d6c41b97
+Revises: e5b19c3a7d42
+Create Date: 2026-02-07 12:00:00.000000
+
+"""
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.utils.jalali import to_jalali
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a8d6c41b97'
+down_revision: Union[str, Sequence[str], None] = 'e5b19c3a7d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('sales', sa.Column('jalali_date', sa.String(length=10), nullable=True))
+
+    # پر کردن تاریخ شمسی فروش‌های موجود: یک UPDATE برای هر روز (با ix_sales_sale_date_id)
+    connection = op.get_bind()
+    days = connection.execute(
+        sa.text("SELECT DISTINCT CAST(sale_date AS DATE) FROM sales WHERE sale_date IS NOT NULL")
+    ).scalars().all()
+    update = sa.text(
+        "UPDATE sales SET jalali_date = :jalali_date "
+        "WHERE sale_date >= :start AND sale_date < :end"
+    )
+    for day in days:
+        connection.execute(
+            update,
+            {"jalali_date": str(to_jalali(day)), "start": day, "end": day + timedelta(days=1)},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('sales', 'jalali_date')
@@ -0,0 +1,22 @@
+# هندلرهای runtime ناهمگام
+from .report import AsyncReportHandlers
+from .inventory import AsyncViewInventory
+from .sales import AsyncViewSales
+from .fallback import SyncFallback
+
+
+def register_async_handlers(bot, data_manager):
+    """ثبت هندلرهای ناهمگام و در آخر ارسال باقی آپدیت‌ها به هندلرهای همگام"""
+    AsyncReportHandlers(bot, data_manager).register()
+    AsyncViewInventory(bot, data_manager).register()
+    AsyncViewSales(bot, data_manager).register()
+    SyncFallback(bot).register()
+
+
+__all__ = [
+    "AsyncReportHandlers",
+    "AsyncViewInventory",
+    "AsyncViewSales",
+    "SyncFallback",
+    "register_async_handlers",
+]
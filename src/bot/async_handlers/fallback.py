@@ -0,0 +1,27 @@
+"""
+سپردن باقی آپدیت‌ها به هندلرهای همگام
+گفتگوهای چندمرحله‌ای (register_next_step_handler) و عملیات ثبت/ویرایش/حذف
+روی thread pool و با همان هندلرهای همگام اجرا می‌شوند
+"""
+
+from telebot import util
+
+
+class SyncFallback:
+    """ارسال پیام‌ها و callback هایی که هندلر ناهمگام ندارند به ربات همگام"""
+    
+    def __init__(self, bot):
+        self.bot = bot
+    
+    def register(self):
+        """ثبت هندلرهای catch-all (باید آخر از همه ثبت شوند)"""
+        @self.bot.message_handler(
+            func=lambda message: True,
+            content_types=util.content_type_media + util.content_type_service
+        )
+        async def forward_message(message):
+            await self.bot.run_sync(self.bot.sync_bot.process_new_messages, [message])
+        
+        @self.bot.callback_query_handler(func=lambda call: True)
+        async def forward_callback_query(call):
+            await self.bot.run_sync(self.bot.sync_bot.process_new_callback_query, [call])
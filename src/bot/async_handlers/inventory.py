@@ -0,0 +1,62 @@
+"""
+هندلرهای ناهمگام مشاهده موجودی محصولات
+"""
+
+from ..keyboards import back_button
+from ..keyboards.pagination import pagination_keyboard
+from ..page_cache import page_cache
+from ...services.async_services import AsyncInventoryService
+from ...utils.pagination import PageRef, parse_page_callback
+
+
+class AsyncViewInventory:
+    """مدیریت مشاهده موجودی در runtime ناهمگام"""
+    
+    ITEMS_PER_PAGE = 20
+    
+    def __init__(self, bot, data_manager):
+        self.bot = bot
+        self.data_manager = data_manager
+        self.inventory_service = AsyncInventoryService(data_manager)
+    
+    def register(self):
+        """ثبت هندلرهای مشاهده موجودی"""
+        @self.bot.callback_query_handler(func=lambda call: call.data == "view_inventory")
+        async def view_inventory(call):
+            await self._show_page(call, PageRef(1))
+        
+        @self.bot.callback_query_handler(func=lambda call: call.data.startswith("products_page_"))
+        async def handle_pagination(call):
+            await self._show_page(call, parse_page_callback(call.data, "products_page"))
+    
+    async def _show_page(self, call, page_ref):
+        """نمایش یک صفحه از موجودی (از کش صفحه‌ها در صورت تغییر نکردن داده‌ها)"""
+        text, keyboard = await page_cache.async_get_or_render(
+            "inventory", page_ref, self.ITEMS_PER_PAGE, lambda: self._render_page(page_ref)
+        )
+        
+        await self.bot.edit_message_text(
+            text,
+            call.message.chat.id,
+            call.message.message_id,
+            parse_mode="Markdown",
+            reply_markup=keyboard
+        )
+    
+    async def _render_page(self, page_ref):
+        """ساخت متن و کیبورد یک صفحه از لیست موجودی"""
+        page_data = await self.inventory_service.get_inventory_page(
+            page=page_ref.page,
+            items_per_page=self.ITEMS_PER_PAGE,
+            cursor=page_ref.cursor,
+            direction=page_ref.direction
+        )
+        keyboard = pagination_keyboard(
+            "products_page",
+            page_data['page'],
+            page_data['total_pages'],
+            page_data.get('prev_cursor'),
+            page_data.get('next_cursor')
+        )
+        keyboard.add(back_button("inventory").keyboard[0][0])
+        return page_data['text'], keyboard
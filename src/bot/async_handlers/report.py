@@ -0,0 +1,90 @@
+"""
+هندلرهای ناهمگام گزارش‌ها
+شامل: گزارش خلاصه، گزارش کامل و صفحه‌بندی آن
+"""
+
+from ..keyboards import main_menu_keyboard, back_button
+from ..keyboards.pagination import pagination_keyboard
+from ..page_cache import page_cache
+from ..states.state import is_user_processing
+from ...utils import REPORT_SHARED_MESSAGE
+from ...services.async_services import (
+    AsyncInventoryService,
+    AsyncSalesService,
+    AsyncReportService,
+)
+
+
+class AsyncReportHandlers:
+    """مدیریت گزارش‌ها در runtime ناهمگام"""
+    
+    ITEMS_PER_PAGE = 20
+    
+    def __init__(self, bot, data_manager):
+        self.bot = bot
+        self.data_manager = data_manager
+        self.report_service = AsyncReportService(
+            data_manager,
+            AsyncInventoryService(data_manager),
+            AsyncSalesService(data_manager)
+        )
+    
+    def register(self):
+        """ثبت هندلرهای گزارش"""
+        self._register_summary_report_handler()
+        self._register_share_report_handler()
+        self._register_share_report_pagination_handler()
+    
+    def _is_summary_request(self, message):
+        """درخواست گزارش خلاصه از کیبورد کشویی، وقتی کاربر وسط یک گفتگو نیست"""
+        return (
+            message.text == "📊 گزارش خلاصه"
+            and not is_user_processing(message.chat.id)
+            and not self.bot.has_pending_step(message.chat.id)
+        )
+    
+    def _register_summary_report_handler(self):
+        """گزارش خلاصه"""
+        @self.bot.message_handler(func=self._is_summary_request)
+        async def summary_report(message):
+            report_text = await self.report_service.generate_summary_report()
+            await self.bot.send_message(
+                message.chat.id,
+                report_text,
+                parse_mode="Markdown",
+                reply_markup=main_menu_keyboard()
+            )
+    
+    async def _show_report_page(self, call, page):
+        """نمایش یک صفحه از گزارش کامل (از کش صفحه‌ها در صورت تغییر نکردن داده‌ها)"""
+        text, keyboard = await page_cache.async_get_or_render(
+            "full_report", page, self.ITEMS_PER_PAGE, lambda: self._render_report_page(page)
+        )
+        
+        await self.bot.edit_message_text(
+            text,
+            call.message.chat.id,
+            call.message.message_id,
+            parse_mode="Markdown",
+            reply_markup=keyboard
+        )
+    
+    async def _render_report_page(self, page):
+        """ساخت متن و کیبورد یک صفحه از گزارش کامل"""
+        page_data = await self.report_service.get_full_report_page(page=page, items_per_page=self.ITEMS_PER_PAGE)
+        keyboard = pagination_keyboard("report_page", page_data['page'], page_data['total_pages'])
+        keyboard.add(back_button("share").keyboard[0][0])
+        return page_data['text'], keyboard
+    
+    def _register_share_report_handler(self):
+        """اشتراک‌گذاری گزارش کامل"""
+        @self.bot.callback_query_handler(func=lambda call: call.data == "share_full_report")
+        async def share_report(call):
+            await self._show_report_page(call, 1)
+            await self.bot.answer_callback_query(call.id, REPORT_SHARED_MESSAGE)
+    
+    def _register_share_report_pagination_handler(self):
+        """صفحه‌بندی گزارش کامل"""
+        @self.bot.callback_query_handler(func=lambda call: call.data.startswith("report_page_"))
+        async def handle_report_pagination(call):
+            await self._show_report_page(call, int(call.data.split("_")[-1]))
@@ -0,0 +1,87 @@
+"""
+هندلرهای ناهمگام مشاهده لیست فروش‌ها
+"""
+
+from ..keyboards import back_button, sales_list_keyboard_with_pagination
+from ..page_cache import page_cache
+from ..states.state import (
+    set_user_state,
+    try_lock_user,
+    unlock_user
+)
+from ...services.async_services import AsyncSalesService
+from ...utils.pagination import parse_page_callback
+
+
+class AsyncViewSales:
+    """مدیریت مشاهده فروش‌ها در runtime ناهمگام"""
+    
+    ITEMS_PER_PAGE = 20
+    
+    def __init__(self, bot, data_manager):
+        self.bot = bot
+        self.data_manager = data_manager
+        self.sales_service = AsyncSalesService(data_manager)
+    
+    def register(self):
+        """ثبت هندلرهای مشاهده فروش‌ها"""
+        @self.bot.callback_query_handler(func=lambda call: call.data == "view_sales_list")
+        async def view_sales_list(call):
+            user_id = call.message.chat.id
+            
+            if not try_lock_user(user_id):
+                await self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
+                return
+            
+            try:
+                page_data = await self.sales_service.get_sales_page(page=1, items_per_page=self.ITEMS_PER_PAGE)
+                
+                if not page_data['has_sales']:
+                    await self.bot.send_message(user_id, page_data['message'], reply_markup=back_button("sales"))
+                    return
+                
+                set_user_state(user_id, 'view_sales')
+                await self._edit_page(call, *self._render(page_data))
+            finally:
+                unlock_user(user_id)
+        
+        @self.bot.callback_query_handler(func=lambda call: call.data.startswith("sales_page_"))
+        async def handle_sales_pagination(call):
+            page_ref = parse_page_callback(call.data, "sales_page")
+            # صفحه رندرشده از کش (در صورت تغییر نکردن داده‌ها) یا از سرویس
+            text, keyboard = await page_cache.async_get_or_render(
+                "sales", page_ref, self.ITEMS_PER_PAGE, lambda: self._render_page(page_ref)
+            )
+            await self._edit_page(call, text, keyboard)
+    
+    async def _render_page(self, page_ref):
+        """ساخت متن و کیبورد یک صفحه از فروش‌ها"""
+        page_data = await self.sales_service.get_sales_page(
+            page=page_ref.page,
+            items_per_page=self.ITEMS_PER_PAGE,
+            cursor=page_ref.cursor,
+            direction=page_ref.direction
+        )
+        return self._render(page_data)
+    
+    @staticmethod
+    def _render(page_data):
+        """ساخت متن و کیبورد انتخاب از داده‌های صفحه"""
+        keyboard = sales_list_keyboard_with_pagination(
+            page_data['sales'],
+            page_data['page'],
+            page_data['total_pages'],
+            prev_cursor=page_data.get('prev_cursor'),
+            next_cursor=page_data.get('next_cursor')
+        )
+        return page_data['text'], keyboard
+    
+    async def _edit_page(self, call, text, keyboard):
+        """نمایش یک صفحه از فروش‌ها"""
+        await self.bot.edit_message_text(
+            text,
+            call.message.chat.id,
+            call.message.message_id,
+            reply_markup=keyboard,
+            parse_mode="Markdown"
+        )
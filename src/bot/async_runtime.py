@@ -0,0 +1,140 @@
+"""
+runtime ناهمگام بر پایه AsyncTeleBot و AsyncSession
+- دریافت آپدیت‌ها و درخواست‌های HTTP تلگرام بدون بلاک شدن event loop
+- صفحه‌های نمایشی و گزارش‌ها با هندلرهای ناهمگام و AsyncSession اجرا می‌شوند
+- باقی آپدیت‌ها (گفتگوهای چندمرحله‌ای) روی thread pool به هندلرهای همگام سپرده می‌شوند
+- آپدیت‌های یک چت به ترتیب رسیدن پردازش می‌شوند
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from telebot import asyncio_helper
+from telebot.async_telebot import AsyncTeleBot
+
+from .dispatcher import get_update_chat_id
+from .async_handlers import register_async_handlers
+from .callback_gate import callback_gate
+from .http_session import install_async_http_session
+from .states.state import async_conversation_scope, conversation_scope
+from ..core.config import settings
+from ..db.async_database import async_engine
+from ..repository.dependencies import session_scope
+from ..repository.async_repository import async_session_scope, AsyncDataManagerAdapter
+
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRuntimeBot(AsyncTeleBot):
+    """
+    AsyncTeleBot با پردازش ترتیبی آپدیت‌های هر چت و یک AsyncSession برای هر آپدیت
+    آپدیت‌هایی که هندلر ناهمگام ندارند به ربات همگام (sync_bot) سپرده می‌شوند
+    """
+
+    def __init__(self, token: str, sync_bot, workers: int = 4, **kwargs):
+        """
+        Args:
+            token: توکن ربات
+            sync_bot: ربات همگام (ScopedTeleBot) که هندلرهای همگام روی آن ثبت شده‌اند
+            workers: تعداد thread ها برای اجرای هندلرهای همگام
+        """
+        super().__init__(token, **kwargs)
+        self.sync_bot = sync_bot
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync-handler")
+        self.callback_gate = callback_gate
+        # چت -> task آخرین آپدیتِ آن چت؛ آپدیت بعدی منتظر همین task می‌ماند
+        self._chat_tasks = {}
+
+    async def process_new_updates(self, updates):
+        """زنجیر کردن آپدیت‌ها پشت آپدیت قبلی همان چت"""
+        for update in updates:
+            if not self.callback_gate.note(update):
+                continue
+            key = get_update_chat_id(update)
+            task = asyncio.create_task(self._process_update(self._chat_tasks.get(key), update))
+            self._chat_tasks[key] = task
+            task.add_done_callback(partial(self._forget_task, key))
+
+    def _forget_task(self, key, task):
+        """حذف task تمام‌شده اگر آپدیت دیگری از آن چت پشتش نیامده باشد"""
+        if self._chat_tasks.get(key) is task:
+            del self._chat_tasks[key]
+
+    async def _process_update(self, previous, update):
+        """پردازش یک آپدیت بعد از آپدیت قبلی همان چت، داخل unit of work خودش"""
+        if previous is not None:
+            await asyncio.wait([previous])
+        try:
+            call = update.callback_query
+            if call is not None and not self.callback_gate.admit(call):
+                # کلیک ادغام‌شده یا debounce شده: فقط answer تا دکمه از حالت انتظار خارج شود
+                await self.answer_callback_query(call.id)
+                return
+            async with async_session_scope(), async_conversation_scope():
+                await super().process_new_updates([update])
+        except Exception:
+            logger.exception("Error while processing update %s", update.update_id)
+
+    def has_pending_step(self, chat_id) -> bool:
+        """آیا ربات همگام برای این چت منتظر پاسخ مرحله بعد (next step) است"""
+        return chat_id in self.sync_bot.next_step_backend.handlers
+
+    async def run_sync(self, process, items):
+        """
+        اجرای یکی از متدهای process_new_* ربات همگام روی thread pool
+
+        Args:
+            process: متد ربات همگام (مثل process_new_messages)
+            items: لیست پیام‌ها یا callback ها
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._run_sync, process, items)
+
+    @staticmethod
+    def _run_sync(process, items):
+        """اجرای هندلرهای همگام داخل session_scope و conversation_scope همان thread"""
+        with session_scope(), conversation_scope():
+            process(items)
+
+    def shutdown(self, wait: bool = True):
+        """توقف thread های هندلرهای همگام"""
+        self._executor.shutdown(wait=wait)
+
+
+def configure_async_proxy():
+    """تنظیم پراکسی برای aiohttp (فقط پراکسی HTTP پشتیبانی می‌شود)"""
+    proxy_config = settings.PROXY
+    if not proxy_config:
+        return
+
+    if proxy_config.username and proxy_config.password:
+        asyncio_helper.proxy = f"http://{proxy_config.username}:{proxy_config.password}@{proxy_config.url}"
+    else:
+        asyncio_helper.proxy = f"http://{proxy_config.url}"
+
+
+async def run_async_bot(sync_bot):
+    """
+    اجرای ربات در runtime ناهمگام
+
+    Args:
+        sync_bot: ربات همگام با هندلرهای ثبت‌شده
+    """
+    configure_async_proxy()
+    install_async_http_session()
+
+    bot = AsyncRuntimeBot(
+        settings.BOT_TOKEN,
+        sync_bot,
+        workers=settings.UPDATE_WORKERS or 4,
+    )
+    register_async_handlers(bot, AsyncDataManagerAdapter())
+
+    try:
+        await bot.infinity_polling()
+    finally:
+        bot.shutdown()
+        await async_engine.dispose()
@@ -0,0 +1,97 @@
+"""
+فیلتر callback ها پیش از اجرای هندلر
+- حذف callback تکراری (همان call.id که دوباره رسیده)
+- ادغام رگبار کلیک‌های صفحه‌بندی روی یک پیام: فقط آخرین صفحه رندر می‌شود
+- debounce: کلیک دوباره روی همان دکمه یک پیام در فاصله کوتاه نادیده گرفته می‌شود
+callback های ردشده بدون اجرای هندلر (بدون کوئری دیتابیس و edit_message_text) فقط answer می‌شوند
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from ..core.config import settings
+from ..utils.pagination import is_page_callback
+
+
+def _message_key(call):
+    """کلید پیامی که دکمه آن زده شده"""
+    if call.message is not None:
+        return call.message.chat.id, call.message.message_id
+    return call.inline_message_id
+
+
+class CallbackGate:
+    """تصمیم‌گیری درباره اجرای callback ها (امن برای چند thread)"""
+
+    def __init__(self, debounce: float, max_entries: int = 4096):
+        """
+        Args:
+            debounce: فاصله‌ای (ثانیه) که در آن کلیک دوباره روی همان دکمه نادیده گرفته می‌شود (0 = غیرفعال)
+            max_entries: بیشترین تعداد ورودی‌های نگه‌داری‌شده در هر جدول
+        """
+        self.debounce = debounce
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # call.id های دیده‌شده
+        self._seen = OrderedDict()
+        # پیام -> call.id آخرین کلیک صفحه‌بندی که هنوز اجرا نشده
+        self._latest_page = OrderedDict()
+        # پیام -> (callback_data، زمان) آخرین callback اجراشده
+        self._last_run = OrderedDict()
+        self.stats = {"duplicates": 0, "coalesced": 0, "debounced": 0}
+
+    def note(self, update) -> bool:
+        """
+        ثبت آپدیت در لحظه رسیدن (قبل از صف شدن)
+
+        Returns:
+            False اگر callback تکراری است و باید کامل کنار گذاشته شود
+        """
+        call = update.callback_query
+        if call is None:
+            return True
+
+        with self._lock:
+            if call.id in self._seen:
+                self.stats["duplicates"] += 1
+                return False
+            self._remember(self._seen, call.id, None)
+            if is_page_callback(call.data):
+                self._remember(self._latest_page, _message_key(call), call.id)
+        return True
+
+    def admit(self, call) -> bool:
+        """
+        تصمیم نهایی درست قبل از اجرای هندلر
+
+        Returns:
+            False اگر کلیک صفحه‌بندی جدیدتری روی همین پیام در صف است یا کلیک تکراری در بازه debounce است
+        """
+        key = _message_key(call)
+        now = time.monotonic()
+        with self._lock:
+            if is_page_callback(call.data):
+                latest = self._latest_page.get(key)
+                if latest is not None and latest != call.id:
+                    self.stats["coalesced"] += 1
+                    return False
+                self._latest_page.pop(key, None)
+
+            last = self._last_run.get(key)
+            if last is not None and last[0] == call.data and now - last[1] < self.debounce:
+                self.stats["debounced"] += 1
+                return False
+            self._remember(self._last_run, key, (call.data, now))
+        return True
+
+    def _remember(self, table: OrderedDict, key, value):
+        """افزودن به یک جدول با سقف max_entries (داخل lock)"""
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.max_entries:
+            table.popitem(last=False)
+
+
+# فیلتر مشترک callback ها برای ربات همگام و runtime ناهمگام
+callback_gate = CallbackGate(settings.CALLBACK_DEBOUNCE_MS / 1000)
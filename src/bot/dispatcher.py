@@ -0,0 +1,181 @@
+"""
+dispatch آپدیت‌ها با یک Session دیتابیس برای هر آپدیت
+- ScopedTeleBot: پردازش ترتیبی آپدیت‌ها
+- ConcurrentTeleBot: پردازش هم‌زمان روی thread pool؛ آپدیت‌های یک چت به ترتیب رسیدن پردازش می‌شوند
+- callback های تکراری، ادغام‌شده یا debounce شده با CallbackGate قبل از هندلر کنار گذاشته می‌شوند
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import telebot
+
+from .callback_gate import callback_gate
+from .states.state import conversation_scope
+from ..repository.dependencies import session_scope
+
+
+logger = logging.getLogger(__name__)
+
+
+class ChatOrderedExecutor:
+    """اجرای task ها روی thread pool با صف ترتیبی برای هر کلید (چت)"""
+
+    def __init__(self, max_workers: int):
+        """
+        Args:
+            max_workers: تعداد thread های worker
+        """
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="update-worker")
+        self._lock = threading.Lock()
+        # کلید -> صف task های منتظر؛ وجود کلید یعنی یک worker در حال اجرای آن چت است
+        self._queues = {}
+
+    def submit(self, key, fn, *args):
+        """
+        ثبت یک task برای یک کلید
+
+        Args:
+            key: کلید ترتیب (شناسه چت)
+            fn: تابع
+            *args: آرگومان‌های تابع
+        """
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is not None:
+                queue.append((fn, args))
+                return
+            self._queues[key] = deque()
+
+        self._pool.submit(self._drain, key, fn, args)
+
+    def _drain(self, key, fn, args):
+        """اجرای task و سپس task های بعدی همان کلید تا خالی شدن صف"""
+        while True:
+            try:
+                fn(*args)
+            except Exception:
+                logger.exception("Error while processing update for chat %s", key)
+
+            with self._lock:
+                queue = self._queues[key]
+                if not queue:
+                    del self._queues[key]
+                    return
+                fn, args = queue.popleft()
+
+    def shutdown(self, wait: bool = True):
+        """توقف pool"""
+        self._pool.shutdown(wait=wait)
+
+
+def get_update_chat_id(update):
+    """
+    استخراج شناسه چت از آپدیت (کلید ترتیب)
+
+    Returns:
+        شناسه چت، یا شناسه کاربر، یا در نبود هر دو یک کلید یکتا برای همان آپدیت
+    """
+    for message in (update.message, update.edited_message, update.channel_post, update.edited_channel_post):
+        if message:
+            return message.chat.id
+
+    if update.callback_query:
+        if update.callback_query.message:
+            return update.callback_query.message.chat.id
+        return update.callback_query.from_user.id
+
+    for event in (update.inline_query, update.chosen_inline_result, update.shipping_query, update.pre_checkout_query):
+        if event:
+            return event.from_user.id
+
+    for event in (update.my_chat_member, update.chat_member, update.chat_join_request):
+        if event:
+            return event.chat.id
+
+    return ("update", update.update_id)
+
+
+class ScopedTeleBot(telebot.TeleBot):
+    """
+    TeleBot که هر آپدیت را داخل یک session_scope (unit of work) پردازش می‌کند
+    تا identity map بعد از هر آپدیت خالی شود و تراکنش خراب به آپدیت بعدی نرسد
+    """
+
+    def __init__(self, token: str, **kwargs):
+        """
+        Args:
+            token: توکن ربات
+        """
+        # هندلرها باید در همان thread ای اجرا شوند که session_scope را باز کرده
+        kwargs["threaded"] = False
+        super().__init__(token, **kwargs)
+        self.callback_gate = callback_gate
+
+    def process_new_updates(self, updates):
+        """پردازش آپدیت‌ها یکی‌یکی"""
+        self._advance_offset(updates)
+        # ثبت کل دسته قبل از پردازش تا کلیک‌های صفحه‌بندی قدیمی‌تر همین دسته ادغام شوند
+        updates = [update for update in updates if self.callback_gate.note(update)]
+        for update in updates:
+            self._process_update(update)
+
+    def _advance_offset(self, updates):
+        """جلو بردن offset برای همه آپدیت‌ها (حتی آن‌هایی که پردازش نمی‌شوند) تا polling بعدی تکراری نگیرد"""
+        for update in updates:
+            if update.update_id > self.last_update_id:
+                self.last_update_id = update.update_id
+
+    def _process_update(self, update):
+        """پردازش یک آپدیت داخل unit of work خودش (Session دیتابیس و وضعیت گفتگو)"""
+        if not self._admit(update):
+            return
+        with session_scope(), conversation_scope():
+            super().process_new_updates([update])
+
+    def _admit(self, update) -> bool:
+        """
+        آیا هندلر این آپدیت اجرا شود
+        callback ادغام‌شده یا debounce شده فقط answer می‌شود تا دکمه از حالت انتظار خارج شود
+        """
+        call = update.callback_query
+        if call is None or self.callback_gate.admit(call):
+            return True
+        try:
+            self.answer_callback_query(call.id)
+        except Exception:
+            logger.warning("Could not answer skipped callback %s", call.id, exc_info=True)
+        return False
+
+    def shutdown(self, wait: bool = True):
+        """توقف (در حالت ترتیبی کاری لازم نیست)"""
+
+
+class ConcurrentTeleBot(ScopedTeleBot):
+    """
+    ScopedTeleBot با dispatch آپدیت‌ها روی ChatOrderedExecutor
+    هر آپدیت روی یک worker و با Session دیتابیس مخصوص خودش اجرا می‌شود
+    """
+
+    def __init__(self, token: str, workers: int = 4, **kwargs):
+        """
+        Args:
+            token: توکن ربات
+            workers: تعداد worker ها
+        """
+        super().__init__(token, **kwargs)
+        self.executor = ChatOrderedExecutor(workers)
+
+    def process_new_updates(self, updates):
+        """تقسیم آپدیت‌ها بین worker ها بر اساس چت"""
+        # offset باید همین‌جا جلو برود تا polling بعدی آپدیت تکراری نگیرد
+        self._advance_offset(updates)
+        for update in updates:
+            if self.callback_gate.note(update):
+                self.executor.submit(get_update_chat_id(update), self._process_update, update)
+
+    def shutdown(self, wait: bool = True):
+        """توقف worker ها"""
+        self.executor.shutdown(wait=wait)
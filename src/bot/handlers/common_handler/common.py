@@ -3,6 +3,9 @@
 شامل: start, help, back, share
 """
 
+import tempfile
+from datetime import datetime
+
 from ...keyboards import (
     main_menu_keyboard,
     main_reply_keyboard,
@@ -14,10 +17,15 @@ from ...keyboards import (
     back_button
 )
 from ...keyboards.pagination import pagination_keyboard
+from ...page_cache import page_cache
+from ...progress import ProgressMessage
 from ...states.state import (
     set_user_state,
     clear_user_data,
-    is_user_processing
+    is_user_processing,
+    try_lock_user,
+    unlock_user,
+    get_state_step
 )
 from ....utils import (
     HELP_TEXT,
@@ -30,12 +38,14 @@ from ....utils import (
 from ....services.common_services import ReportService
 from ....services.inventory_services import InventoryService
 from ....services.sale_services import SalesService
+from ....utils.table_io import TableFormatError
 
 
 class CommonCommands:
     """مدیریت دستورات اساسی"""
     
     ITEMS_PER_PAGE = 20
+    SALES_REPORT_SPOOL_BYTES = 1024 * 1024
     
     def __init__(self, bot, data_manager):
         self.bot = bot
@@ -57,6 +67,7 @@ class CommonCommands:
         self._register_help_handler()
         self._register_share_report_handler()
         self._register_share_report_pagination_handler()
+        self._register_sales_report_file_handler()
         self._register_text_message_handler()
     
     def _register_start_handler(self):
@@ -115,15 +126,13 @@ class CommonCommands:
             user_id = call.message.chat.id
             message_id = call.message.message_id
             
-            # دریافت صفحه اول از سرویس
-            page_data = self.report_service.get_full_report_page(page=1, items_per_page=self.ITEMS_PER_PAGE)
-            
-            # ساخت کیبورد
-            keyboard = pagination_keyboard("report_page", page_data['page'], page_data['total_pages'])
-            keyboard.add(back_button("share").keyboard[0][0])
+            # صفحه رندرشده از کش (در صورت تغییر نکردن داده‌ها) یا از سرویس
+            text, keyboard = page_cache.get_or_render(
+                "full_report", 1, self.ITEMS_PER_PAGE, lambda: self._render_report_page(1)
+            )
             
             self.bot.edit_message_text(
-                page_data['text'],
+                text,
                 user_id,
                 message_id,
                 parse_mode="Markdown",
@@ -140,21 +149,65 @@ class CommonCommands:
             message_id = call.message.message_id
             page = int(call.data.split("_")[-1])
             
-            # دریافت صفحه از سرویس
-            page_data = self.report_service.get_full_report_page(page=page, items_per_page=self.ITEMS_PER_PAGE)
-            
-            # ساخت کیبورد
-            keyboard = pagination_keyboard("report_page", page_data['page'], page_data['total_pages'])
-            keyboard.add(back_button("share").keyboard[0][0])
+            # صفحه رندرشده از کش (در صورت تغییر نکردن داده‌ها) یا از سرویس
+            text, keyboard = page_cache.get_or_render(
+                "full_report", page, self.ITEMS_PER_PAGE, lambda: self._render_report_page(page)
+            )
             
             self.bot.edit_message_text(
-                page_data['text'],
+                text,
                 user_id,
                 message_id,
                 parse_mode="Markdown",
                 reply_markup=keyboard
             )
     
+    def _render_report_page(self, page):
+        """ساخت متن و کیبورد یک صفحه از گزارش کامل"""
+        page_data = self.report_service.get_full_report_page(page=page, items_per_page=self.ITEMS_PER_PAGE)
+        keyboard = pagination_keyboard("report_page", page_data['page'], page_data['total_pages'])
+        keyboard.add(back_button("share").keyboard[0][0])
+        return page_data['text'], keyboard
+    
+    def _register_sales_report_file_handler(self):
+        """ارسال گزارش کامل فروش‌ها به صورت فایل (CSV / XLSX)"""
+        @self.bot.callback_query_handler(func=lambda call: call.data in ("sales_report_csv", "sales_report_xlsx"))
+        def send_sales_report(call):
+            user_id = call.message.chat.id
+            extension = ".xlsx" if call.data == "sales_report_xlsx" else ".csv"
+            
+            if not try_lock_user(user_id):
+                self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
+                return
+            
+            try:
+                self.bot.answer_callback_query(call.id)
+                progress = ProgressMessage(self.bot, user_id, "⏳ در حال آماده‌سازی گزارش فروش‌ها...")
+                
+                # فایل موقت (تا SALES_REPORT_SPOOL_BYTES در حافظه، بیشتر از آن روی دیسک)
+                with tempfile.SpooledTemporaryFile(max_size=self.SALES_REPORT_SPOOL_BYTES) as stream:
+                    try:
+                        result = self.report_service.write_sales_report(
+                            stream,
+                            extension,
+                            progress=lambda total: progress.update(f"⏳ {total} فروش نوشته شد...")
+                        )
+                    except TableFormatError:
+                        progress.finish("❌ ساخت فایل XLSX روی سرور ممکن نیست؛ از CSV استفاده کنید.", reply_markup=share_keyboard())
+                        return
+                    
+                    stream.seek(0)
+                    self.bot.send_document(
+                        user_id,
+                        stream,
+                        visible_file_name=f"sales-report-{datetime.now():%Y%m%d-%H%M}{extension}",
+                        caption=f"📄 گزارش {result['total_sales']} فروش"
+                    )
+                
+                progress.finish("✅ گزارش فروش‌ها ارسال شد.", reply_markup=share_keyboard())
+            finally:
+                unlock_user(user_id)
+    
     def _register_text_message_handler(self):
         """هندلر پیام‌های متنی(کیبورد کشویی)"""
         @self.bot.message_handler(func=lambda message: True)
@@ -165,6 +218,13 @@ class CommonCommands:
             if is_user_processing(user_id):
                 return
             
+            # گفتگوی نیمه‌کاره‌ای که next step handler آن در این نمونه ربات نیست
+            # (بعد از restart یا در نمونه دیگر) از روی وضعیت ذخیره‌شده ادامه پیدا می‌کند
+            step = get_state_step(user_id)
+            if step is not None:
+                step(message)
+                return
+            
             if text == "📦 موجودی محصولات":
                 set_user_state(user_id, 'inventory_menu')
                 self.bot.send_message(
@@ -6,8 +6,8 @@
 from ...keyboards import back_button, main_menu_keyboard
 from ...states.state import (
     set_user_state,
-    is_user_processing,
-    set_user_processing
+    try_lock_user,
+    unlock_user
 )
 from ....utils import (
     ERROR_MESSAGE,
@@ -39,11 +39,10 @@ class ConfirmationManager:
         def handle_confirmation(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, PROCESSING_MESSAGE, show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 parts = call.data.split("_")
                 if len(parts) < 4:
@@ -67,7 +66,7 @@ class ConfirmationManager:
                 
                 set_user_state(user_id, 'main_menu')
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
     
     def _process_delete_product(self, user_id, call, product_id):
         """پردازش حذف محصول"""
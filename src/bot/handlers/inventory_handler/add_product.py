@@ -6,8 +6,9 @@ from ...keyboards import back_button, cancel_button
 from ...states.state import (
     set_user_state,
     get_user_data,
-    is_user_processing,
-    set_user_processing
+    try_lock_user,
+    unlock_user,
+    register_state_step
 )
 from ....services.inventory_services import InventoryService
 
@@ -23,6 +24,12 @@ class AddProduct:
     def register(self):
         """ثبت هندلرهای اضافه کردن محصول"""
         self._register_add_product_handlers()
+        self._register_state_steps()
+    
+    def _register_state_steps(self):
+        """ثبت مراحل گفتگو برای ادامه آن از روی وضعیت ذخیره‌شده"""
+        register_state_step('add_product_name', self._process_product_name)
+        register_state_step('add_product_qty', self._process_product_quantity)
     
     def _register_add_product_handlers(self):
         """هندلرهای اضافه کردن محصول"""
@@ -30,18 +37,17 @@ class AddProduct:
         def add_product_start(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 set_user_state(user_id, 'add_product_name')
                 
                 msg = self.bot.send_message(user_id, "📝 لطفاً نام محصول را وارد کنید:", reply_markup=cancel_button())
                 self.bot.register_next_step_handler(msg, self._process_product_name)
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
     
     def _process_product_name(self, message):
         """دریافت نام محصول"""
@@ -7,8 +7,8 @@ from ...keyboards import (
     confirmation_keyboard
 )
 from ...states.state import (
-    is_user_processing,
-    set_user_processing
+    try_lock_user,
+    unlock_user
 )
 from ....services.inventory_services import InventoryService
 
@@ -31,11 +31,10 @@ class DeleteProduct:
         def delete_product(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 product_id = int(call.data.split("_")[2])
                 
@@ -53,4 +52,4 @@ class DeleteProduct:
                 else:
                     self.bot.send_message(user_id, "❌ محصول یافت نشد.", reply_markup=back_button("inventory"))
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
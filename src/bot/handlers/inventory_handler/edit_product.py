@@ -8,14 +8,17 @@ from ...keyboards import (
     cancel_button,
     products_list_keyboard_with_pagination,
 )
+from ...page_cache import page_cache
 from ...states.state import (
     get_user_state,
     set_user_state,
     get_user_data,
-    is_user_processing,
-    set_user_processing
+    try_lock_user,
+    unlock_user,
+    register_state_step
 )
 from ....services.inventory_services import InventoryService
+from ....utils.pagination import parse_page_callback
 
 
 class EditProduct:
@@ -32,6 +35,12 @@ class EditProduct:
         """ثبت هندلرهای ویرایش محصول"""
         self._register_edit_product_handlers()
         self._register_pagination_handler()
+        self._register_state_steps()
+    
+    def _register_state_steps(self):
+        """ثبت مراحل گفتگو برای ادامه آن از روی وضعیت ذخیره‌شده"""
+        register_state_step('edit_product_name', self._process_edit_name)
+        register_state_step('edit_product_qty', self._process_edit_quantity)
     
     def _register_edit_product_handlers(self):
         """هندلرهای ویرایش محصول"""
@@ -39,11 +48,10 @@ class EditProduct:
         def edit_product_list(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 # دریافت صفحه اول از سرویس
                 page_data = self.inventory_service.get_products_for_edit_page(page=1, items_per_page=self.ITEMS_PER_PAGE)
@@ -59,7 +67,9 @@ class EditProduct:
                     page_data['products'],
                     page_data['page'],
                     page_data['total_pages'],
-                    for_sale=False
+                    for_sale=False,
+                    prev_cursor=page_data.get('prev_cursor'),
+                    next_cursor=page_data.get('next_cursor')
                 )
                 
                 self.bot.edit_message_text(
@@ -70,17 +80,16 @@ class EditProduct:
                     parse_mode="Markdown"
                 )
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
         
         @self.bot.callback_query_handler(func=lambda call: call.data.startswith("select_product_") and get_user_state(call.message.chat.id) == 'edit_product')
         def select_product(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 product_id = int(call.data.split("_")[2])
                 product = self.data_manager.get_product(product_id)
@@ -102,17 +111,16 @@ class EditProduct:
                     reply_markup=edit_product_keyboard(product_id)
                 )
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
         
         @self.bot.callback_query_handler(func=lambda call: call.data.startswith("edit_name_"))
         def edit_name_start(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 product_id = int(call.data.split("_")[2])
                 
@@ -130,17 +138,16 @@ class EditProduct:
                 msg = self.bot.send_message(user_id, f"📝 نام جدید را وارد کنید (فعلی: {product['name']}):", reply_markup=cancel_button())
                 self.bot.register_next_step_handler(msg, self._process_edit_name)
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
         
         @self.bot.callback_query_handler(func=lambda call: call.data.startswith("edit_qty_"))
         def edit_quantity_start(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 product_id = int(call.data.split("_")[2])
                 
@@ -158,7 +165,7 @@ class EditProduct:
                 msg = self.bot.send_message(user_id, f"📝 موجودی جدید را وارد کنید (فعلی: {product['quantity']}):", reply_markup=cancel_button())
                 self.bot.register_next_step_handler(msg, self._process_edit_quantity)
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
     
     def _process_edit_name(self, message):
         """پردازش ویرایش نام محصول"""
@@ -210,23 +217,35 @@ class EditProduct:
         def handle_edit_products_pagination(call):
             user_id = call.message.chat.id
             message_id = call.message.message_id
-            page = int(call.data.split("_")[-1])
-            
-            # دریافت صفحه از سرویس
-            page_data = self.inventory_service.get_products_for_edit_page(page=page, items_per_page=self.ITEMS_PER_PAGE)
+            page_ref = parse_page_callback(call.data, "edit_products_page")
             
-            # ساخت کیبورد
-            keyboard = products_list_keyboard_with_pagination(
-                page_data['products'],
-                page_data['page'],
-                page_data['total_pages'],
-                for_sale=False
+            # صفحه رندرشده از کش (در صورت تغییر نکردن داده‌ها) یا از سرویس
+            text, keyboard = page_cache.get_or_render(
+                "edit_products", page_ref, self.ITEMS_PER_PAGE, lambda: self._render_page(page_ref)
             )
             
             self.bot.edit_message_text(
-                page_data['text'],
+                text,
                 user_id,
                 message_id,
                 reply_markup=keyboard,
                 parse_mode="Markdown"
             )
+    
+    def _render_page(self, page_ref):
+        """ساخت متن و کیبورد یک صفحه از محصولات برای ویرایش"""
+        page_data = self.inventory_service.get_products_for_edit_page(
+            page=page_ref.page,
+            items_per_page=self.ITEMS_PER_PAGE,
+            cursor=page_ref.cursor,
+            direction=page_ref.direction
+        )
+        keyboard = products_list_keyboard_with_pagination(
+            page_data['products'],
+            page_data['page'],
+            page_data['total_pages'],
+            for_sale=False,
+            prev_cursor=page_data.get('prev_cursor'),
+            next_cursor=page_data.get('next_cursor')
+        )
+        return page_data['text'], keyboard
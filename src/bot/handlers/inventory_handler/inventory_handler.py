@@ -1,11 +1,12 @@
 """
 کلاس مدیریت هندلرهای موجودی محصولات
-سازماندهی شده به پنج ماژول:
+سازماندهی شده به شش ماژول:
 - menu.py: منوی موجودی
 - add_product.py: اضافه کردن محصول
 - edit_product.py: ویرایش محصول
 - delete_product.py: حذف محصول
 - view.py: مشاهده موجودی
+- transfer.py: ورود گروهی از فایل و خروجی CSV
 """
 
 from .menu import InventoryMenu
@@ -13,6 +14,7 @@ from .add_product import AddProduct
 from .edit_product import EditProduct
 from .delete_product import DeleteProduct
 from .view import ViewInventory
+from .transfer import ProductTransfer
 
 
 class InventoryHandler:
@@ -28,6 +30,7 @@ class InventoryHandler:
         self.edit_product = EditProduct(bot, data_manager)
         self.delete_product = DeleteProduct(bot, data_manager)
         self.view = ViewInventory(bot, data_manager)
+        self.transfer = ProductTransfer(bot, data_manager)
     
     def register(self):
         """ثبت تمام هندلرهای موجودی از طریق ماژول‌ها"""
@@ -36,3 +39,4 @@ class InventoryHandler:
         self.edit_product.register()
         self.delete_product.register()
         self.view.register()
+        self.transfer.register()
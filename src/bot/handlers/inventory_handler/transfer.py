@@ -0,0 +1,186 @@
+"""
+هندلرهای ورود گروهی محصولات از فایل (CSV / XLSX) و خروجی CSV محصولات
+"""
+
+import io
+import tempfile
+from datetime import datetime
+
+from ...keyboards import back_button, cancel_button
+from ...progress import ProgressMessage
+from ...states.state import (
+    set_user_state,
+    get_user_state,
+    try_lock_user,
+    unlock_user,
+    register_state_step
+)
+from ....core.config import settings
+from ....services.inventory_services import ProductTransferService
+from ....utils.table_io import table_extension, TableFormatError
+
+
+IMPORT_PROMPT = (
+    "📥 فایل CSV یا XLSX محصولات را ارسال کنید.\n\n"
+    "ستون اول: نام محصول، ستون دوم: موجودی\n"
+    "(یا ردیف عنوان با ستون‌های name و stock / نام و موجودی)\n"
+    "موجودی محصولاتی که از قبل وجود دارند با مقدار فایل جایگزین می‌شود."
+)
+
+
+class ProductTransfer:
+    """مدیریت ورود و خروج گروهی محصولات"""
+
+    def __init__(self, bot, data_manager):
+        self.bot = bot
+        self.data_manager = data_manager
+        self.transfer_service = ProductTransferService(data_manager)
+
+    def register(self):
+        """ثبت هندلرهای ورود و خروج گروهی"""
+        self._register_import_handlers()
+        self._register_export_handler()
+        self._register_state_steps()
+
+    def _register_state_steps(self):
+        """ثبت مراحل گفتگو برای ادامه آن از روی وضعیت ذخیره‌شده"""
+        register_state_step('import_products_file', self._process_import_file)
+
+    def _register_import_handlers(self):
+        """هندلرهای ورود گروهی محصولات"""
+        @self.bot.callback_query_handler(func=lambda call: call.data == "import_products")
+        def import_products_start(call):
+            user_id = call.message.chat.id
+
+            if not try_lock_user(user_id):
+                self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
+                return
+
+            try:
+                set_user_state(user_id, 'import_products_file')
+
+                msg = self.bot.send_message(user_id, IMPORT_PROMPT, reply_markup=cancel_button())
+                self.bot.register_next_step_handler(msg, self._process_import_file)
+            finally:
+                unlock_user(user_id)
+
+        # فایلی که بعد از restart یا در نمونه دیگر ربات (بدون next step handler) می‌رسد
+        @self.bot.message_handler(
+            content_types=['document'],
+            func=lambda message: get_user_state(message.chat.id) == 'import_products_file'
+        )
+        def import_products_file(message):
+            self._process_import_file(message)
+
+    def _process_import_file(self, message):
+        """دریافت فایل و ورود گروهی محصولات"""
+        user_id = message.chat.id
+        document = message.document
+
+        error_message = self._validate_document(document)
+        if error_message:
+            msg = self.bot.send_message(user_id, f"{error_message} دوباره تلاش کنید:", reply_markup=cancel_button())
+            self.bot.register_next_step_handler(msg, self._process_import_file)
+            return
+
+        if not try_lock_user(user_id):
+            self.bot.send_message(user_id, "⏳ لطفاً صبر کنید...")
+            return
+
+        try:
+            progress = ProgressMessage(self.bot, user_id, "⏳ در حال دریافت فایل...")
+            file_info = self.bot.get_file(document.file_id)
+            content = self.bot.download_file(file_info.file_path)
+
+            try:
+                result = self.transfer_service.import_products(
+                    io.BytesIO(content),
+                    document.file_name,
+                    progress=lambda current: progress.update(self._import_progress_text(current))
+                )
+            except TableFormatError:
+                progress.finish("❌ این فایل قابل خواندن نیست.", reply_markup=back_button("inventory"))
+            else:
+                progress.finish(self._import_result_text(result), reply_markup=back_button("inventory"))
+
+            set_user_state(user_id, 'inventory_menu')
+        finally:
+            unlock_user(user_id)
+
+    @staticmethod
+    def _validate_document(document):
+        """
+        بررسی فایل ارسال‌شده
+
+        Returns:
+            پیام خطا یا None
+        """
+        if document is None:
+            return "❌ لطفاً فایل CSV یا XLSX ارسال کنید."
+
+        try:
+            table_extension(document.file_name)
+        except TableFormatError:
+            return "❌ فقط فایل‌های CSV و XLSX پشتیبانی می‌شوند."
+
+        if (document.file_size or 0) > settings.BULK_MAX_FILE_MB * 1024 * 1024:
+            return f"❌ حجم فایل نباید بیشتر از {settings.BULK_MAX_FILE_MB} مگابایت باشد."
+
+        return None
+
+    @staticmethod
+    def _import_progress_text(result):
+        """متن پیشرفت ورود"""
+        return (
+            f"⏳ در حال ورود محصولات...\n\n"
+            f"ردیف‌های خوانده‌شده: {result['total_rows']}\n"
+            f"➕ جدید: {result['created']}  ✏️ به‌روزشده: {result['updated']}  ❌ نامعتبر: {result['invalid']}"
+        )
+
+    @staticmethod
+    def _import_result_text(result):
+        """متن نتیجه نهایی ورود"""
+        text = (
+            f"✅ ورود محصولات تمام شد.\n\n"
+            f"ردیف‌ها: {result['total_rows']}\n"
+            f"➕ محصول جدید: {result['created']}\n"
+            f"✏️ به‌روزشده: {result['updated']}\n"
+            f"❌ نامعتبر: {result['invalid']}"
+        )
+        if result['errors']:
+            text += "\n\n" + "\n".join(result['errors'])
+            if result['invalid'] > len(result['errors']):
+                text += f"\n... و {result['invalid'] - len(result['errors'])} ردیف دیگر"
+        return text
+
+    def _register_export_handler(self):
+        """هندلر خروجی CSV محصولات"""
+        @self.bot.callback_query_handler(func=lambda call: call.data == "export_products")
+        def export_products(call):
+            user_id = call.message.chat.id
+
+            if not try_lock_user(user_id):
+                self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
+                return
+
+            try:
+                self.bot.answer_callback_query(call.id)
+                progress = ProgressMessage(self.bot, user_id, "⏳ در حال آماده‌سازی خروجی...")
+
+                # فایل موقت روی دیسک: حافظه مستقل از تعداد محصولات
+                with tempfile.TemporaryFile() as stream:
+                    result = self.transfer_service.export_products(
+                        stream,
+                        progress=lambda total: progress.update(f"⏳ {total} محصول نوشته شد...")
+                    )
+                    stream.seek(0)
+                    self.bot.send_document(
+                        user_id,
+                        stream,
+                        visible_file_name=f"products-{datetime.now():%Y%m%d-%H%M}.csv",
+                        caption=f"📤 خروجی {result['total_products']} محصول"
+                    )
+
+                progress.finish("✅ خروجی محصولات ارسال شد.", reply_markup=back_button("inventory"))
+            finally:
+                unlock_user(user_id)
@@ -4,7 +4,9 @@
 
 from ...keyboards import back_button
 from ...keyboards.pagination import pagination_keyboard
+from ...page_cache import page_cache
 from ....services.inventory_services import InventoryService
+from ....utils.pagination import PageRef, parse_page_callback
 
 
 class ViewInventory:
@@ -29,15 +31,13 @@ class ViewInventory:
             user_id = call.message.chat.id
             message_id = call.message.message_id
             
-            # دریافت صفحه اول از سرویس
-            page_data = self.inventory_service.get_inventory_page(page=1, items_per_page=self.ITEMS_PER_PAGE)
-            
-            # ساخت کیبورد
-            keyboard = pagination_keyboard("products_page", page_data['page'], page_data['total_pages'])
-            keyboard.add(back_button("inventory").keyboard[0][0])
+            # صفحه رندرشده از کش (در صورت تغییر نکردن داده‌ها) یا از سرویس
+            text, keyboard = page_cache.get_or_render(
+                "inventory", PageRef(1), self.ITEMS_PER_PAGE, lambda: self._render_page(PageRef(1))
+            )
             
             self.bot.edit_message_text(
-                page_data['text'],
+                text,
                 user_id,
                 message_id,
                 parse_mode="Markdown",
@@ -50,19 +50,35 @@ class ViewInventory:
         def handle_pagination(call):
             user_id = call.message.chat.id
             message_id = call.message.message_id
-            page = int(call.data.split("_")[-1])
-            
-            # دریافت صفحه از سرویس
-            page_data = self.inventory_service.get_inventory_page(page=page, items_per_page=self.ITEMS_PER_PAGE)
+            page_ref = parse_page_callback(call.data, "products_page")
             
-            # ساخت کیبورد
-            keyboard = pagination_keyboard("products_page", page_data['page'], page_data['total_pages'])
-            keyboard.add(back_button("inventory").keyboard[0][0])
+            # صفحه رندرشده از کش (در صورت تغییر نکردن داده‌ها) یا از سرویس
+            text, keyboard = page_cache.get_or_render(
+                "inventory", page_ref, self.ITEMS_PER_PAGE, lambda: self._render_page(page_ref)
+            )
             
             self.bot.edit_message_text(
-                page_data['text'],
+                text,
                 user_id,
                 message_id,
                 parse_mode="Markdown",
                 reply_markup=keyboard
             )
+    
+    def _render_page(self, page_ref):
+        """ساخت متن و کیبورد یک صفحه از لیست موجودی"""
+        page_data = self.inventory_service.get_inventory_page(
+            page=page_ref.page,
+            items_per_page=self.ITEMS_PER_PAGE,
+            cursor=page_ref.cursor,
+            direction=page_ref.direction
+        )
+        keyboard = pagination_keyboard(
+            "products_page",
+            page_data['page'],
+            page_data['total_pages'],
+            page_data.get('prev_cursor'),
+            page_data.get('next_cursor')
+        )
+        keyboard.add(back_button("inventory").keyboard[0][0])
+        return page_data['text'], keyboard
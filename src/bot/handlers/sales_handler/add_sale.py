@@ -7,16 +7,19 @@ from ...keyboards import (
     cancel_button,
     products_list_keyboard_with_pagination,
 )
+from ...page_cache import page_cache
 from ...states.state import (
     set_user_state,
     get_user_state,
     get_user_data,
     clear_user_data,
-    is_user_processing,
-    set_user_processing
+    try_lock_user,
+    unlock_user,
+    register_state_step
 )
 from ....services.sale_services import SalesService
 from ....services.inventory_services import InventoryService
+from ....utils.pagination import parse_page_callback
 
 
 class AddSale:
@@ -34,6 +37,15 @@ class AddSale:
         """ثبت هندلرهای اضافه کردن فروش"""
         self._register_add_sale_handlers()
         self._register_pagination_handler()
+        self._register_state_steps()
+    
+    def _register_state_steps(self):
+        """ثبت مراحل گفتگو برای ادامه آن از روی وضعیت ذخیره‌شده"""
+        register_state_step('add_sale_quantity', self._process_sale_quantity)
+        register_state_step('add_sale_price', self._process_sale_price)
+        register_state_step('add_sale_cost', self._process_sale_cost)
+        register_state_step('add_sale_extra_cost', self._process_extra_cost)
+        register_state_step('add_sale_date', self._process_sale_date)
     
     def _register_add_sale_handlers(self):
         """هندلرهای اضافه کردن فروش جدید"""
@@ -41,11 +53,10 @@ class AddSale:
         def add_sale_start(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 # دریافت صفحه اول از سرویس
                 page_data = self.sales_service.get_products_for_sale_page(page=1, items_per_page=self.ITEMS_PER_PAGE)
@@ -66,7 +77,9 @@ class AddSale:
                     page_data['products'],
                     page_data['page'],
                     page_data['total_pages'],
-                    for_sale=True
+                    for_sale=True,
+                    prev_cursor=page_data.get('prev_cursor'),
+                    next_cursor=page_data.get('next_cursor')
                 )
                 
                 self.bot.edit_message_text(
@@ -77,7 +90,7 @@ class AddSale:
                     parse_mode="Markdown"
                 )
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
         
         @self.bot.callback_query_handler(
             func=lambda call: call.data.startswith("select_product_")
@@ -86,11 +99,10 @@ class AddSale:
         def select_product_for_sale(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 product_id = int(call.data.split("_")[2])
                 product = self.data_manager.get_product(product_id)
@@ -119,7 +131,7 @@ class AddSale:
                 )
                 self.bot.register_next_step_handler(msg, self._process_sale_quantity)
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
     
     def _process_sale_quantity(self, message):
         """دریافت تعداد فروش"""
@@ -261,23 +273,35 @@ class AddSale:
         def handle_sale_products_pagination(call):
             user_id = call.message.chat.id
             message_id = call.message.message_id
-            page = int(call.data.split("_")[-1])
-            
-            # دریافت صفحه از سرویس
-            page_data = self.sales_service.get_products_for_sale_page(page=page, items_per_page=self.ITEMS_PER_PAGE)
+            page_ref = parse_page_callback(call.data, "sale_products_page")
             
-            # ساخت کیبورد
-            keyboard = products_list_keyboard_with_pagination(
-                page_data['products'],
-                page_data['page'],
-                page_data['total_pages'],
-                for_sale=True
+            # صفحه رندرشده از کش (در صورت تغییر نکردن داده‌ها) یا از سرویس
+            text, keyboard = page_cache.get_or_render(
+                "sale_products", page_ref, self.ITEMS_PER_PAGE, lambda: self._render_page(page_ref)
             )
             
             self.bot.edit_message_text(
-                page_data['text'],
+                text,
                 user_id,
                 message_id,
                 reply_markup=keyboard,
                 parse_mode="Markdown"
             )
+    
+    def _render_page(self, page_ref):
+        """ساخت متن و کیبورد یک صفحه از محصولات قابل فروش"""
+        page_data = self.sales_service.get_products_for_sale_page(
+            page=page_ref.page,
+            items_per_page=self.ITEMS_PER_PAGE,
+            cursor=page_ref.cursor,
+            direction=page_ref.direction
+        )
+        keyboard = products_list_keyboard_with_pagination(
+            page_data['products'],
+            page_data['page'],
+            page_data['total_pages'],
+            for_sale=True,
+            prev_cursor=page_data.get('prev_cursor'),
+            next_cursor=page_data.get('next_cursor')
+        )
+        return page_data['text'], keyboard
@@ -0,0 +1,117 @@
+"""
+هندلرهای تحلیل فروش (روند فروش در بازه‌های شمسی، پرسودترین محصولات، گزارش یک محصول)
+"""
+
+from ...keyboards import (
+    back_button,
+    sales_analytics_keyboard,
+    analytics_page_keyboard,
+)
+from ...page_cache import page_cache
+from ...states.state import set_user_state
+from ....services.common_services import AnalyticsService
+from ....services.common_services.analytics_service import TOP_WINDOWS, TOP_WINDOW_ALL
+from ....utils.jalali import PERIODS, local_today, period_start
+from ....utils.pagination import parse_page_callback
+
+
+class SalesAnalytics:
+    """مدیریت گزارش‌های تحلیلی فروش"""
+
+    ITEMS_PER_PAGE = 10
+
+    def __init__(self, bot, data_manager):
+        self.bot = bot
+        self.data_manager = data_manager
+        self.analytics_service = AnalyticsService(data_manager)
+
+    def register(self):
+        """ثبت هندلرهای تحلیل فروش"""
+        self._register_analytics_menu()
+        self._register_trend_handler()
+        self._register_top_products_handler()
+        self._register_product_report_handler()
+
+    def _register_analytics_menu(self):
+        """هندلر منوی تحلیل فروش"""
+        @self.bot.callback_query_handler(func=lambda call: call.data == "sales_analytics")
+        def sales_analytics(call):
+            user_id = call.message.chat.id
+            set_user_state(user_id, 'sales_analytics')
+
+            self.bot.edit_message_text(
+                "📈 تحلیل فروش\n\nگزارش مورد نظر را انتخاب کنید:",
+                user_id,
+                call.message.message_id,
+                reply_markup=sales_analytics_keyboard()
+            )
+
+    def _register_trend_handler(self):
+        """هندلر روند فروش روزانه/هفتگی/ماهانه/سالانه (همراه با صفحه‌بندی)"""
+        @self.bot.callback_query_handler(
+            func=lambda call: call.data.startswith(tuple(f"trend_{period}_page_" for period in PERIODS))
+        )
+        def sales_trend(call):
+            period = call.data.split("_")[1]
+            action_prefix = f"trend_{period}_page"
+            page = parse_page_callback(call.data, action_prefix).page
+            today = local_today()
+
+            def render():
+                page_data = self.analytics_service.get_trend_page(period, page, self.ITEMS_PER_PAGE, today)
+                keyboard = analytics_page_keyboard(action_prefix, page_data['page'], page_data['total_pages'])
+                return page_data['text'], keyboard
+
+            # شروع بازه جاری در کلید کش: با عوض شدن روز/هفته/ماه صفحه قدیمی از کش برنمی‌گردد
+            self._show_page(call, f"trend_{period}:{period_start(today, period)}", page, render)
+
+    def _register_top_products_handler(self):
+        """هندلر پرسودترین محصولات (همراه با صفحه‌بندی)"""
+        @self.bot.callback_query_handler(
+            func=lambda call: call.data.startswith(tuple(f"top_{window}_page_" for window in TOP_WINDOWS))
+        )
+        def top_products(call):
+            window = call.data.split("_")[1]
+            action_prefix = f"top_{window}_page"
+            page = parse_page_callback(call.data, action_prefix).page
+            today = local_today()
+
+            def render():
+                page_data = self.analytics_service.get_top_products_page(window, page, self.ITEMS_PER_PAGE, today)
+                keyboard = analytics_page_keyboard(
+                    action_prefix, page_data['page'], page_data['total_pages'], page_data['products']
+                )
+                return page_data['text'], keyboard
+
+            view = f"top_{window}"
+            if window != TOP_WINDOW_ALL:
+                view += f":{period_start(today, window)}"
+            self._show_page(call, view, page, render)
+
+    def _show_page(self, call, view, page, render):
+        """نمایش صفحه رندرشده از کش (در صورت تغییر نکردن داده‌ها) یا از سرویس"""
+        text, keyboard = page_cache.get_or_render(view, page, self.ITEMS_PER_PAGE, render)
+
+        self.bot.edit_message_text(
+            text,
+            call.message.chat.id,
+            call.message.message_id,
+            parse_mode="Markdown",
+            reply_markup=keyboard
+        )
+
+    def _register_product_report_handler(self):
+        """هندلر گزارش یک محصول"""
+        @self.bot.callback_query_handler(func=lambda call: call.data.startswith("product_analytics_"))
+        def product_report(call):
+            user_id = call.message.chat.id
+            product_id = int(call.data.split("_")[2])
+
+            result = self.analytics_service.get_product_report(product_id)
+
+            self.bot.send_message(
+                user_id,
+                result['text'],
+                parse_mode="Markdown",
+                reply_markup=back_button("sales")
+            )
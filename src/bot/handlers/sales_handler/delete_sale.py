@@ -4,8 +4,8 @@
 
 from ...keyboards import back_button, confirmation_keyboard
 from ...states.state import (
-    is_user_processing,
-    set_user_processing
+    try_lock_user,
+    unlock_user
 )
 from ....services.sale_services import SalesService
 
@@ -28,11 +28,10 @@ class DeleteSale:
         def delete_sale(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 sale_id = int(call.data.split("_")[2])
                 
@@ -50,4 +49,4 @@ class DeleteSale:
                 else:
                     self.bot.send_message(user_id, "❌ فروش یافت نشد.", reply_markup=back_button("sales"))
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
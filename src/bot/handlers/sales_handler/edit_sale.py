@@ -6,8 +6,9 @@ from ...keyboards import back_button, cancel_button
 from ...states.state import (
     set_user_state,
     get_user_data,
-    is_user_processing,
-    set_user_processing
+    try_lock_user,
+    unlock_user,
+    register_state_step
 )
 from ....services.sale_services import SalesService
 
@@ -23,6 +24,15 @@ class EditSale:
     def register(self):
         """ثبت هندلرهای ویرایش فروش"""
         self._register_edit_sale_handlers()
+        self._register_state_steps()
+    
+    def _register_state_steps(self):
+        """ثبت مراحل گفتگو برای ادامه آن از روی وضعیت ذخیره‌شده"""
+        register_state_step('edit_sale_quantity', self._process_edit_sale_quantity)
+        register_state_step('edit_sale_price', self._process_edit_sale_price)
+        register_state_step('edit_sale_cost', self._process_edit_sale_cost)
+        register_state_step('edit_sale_extra_cost', self._process_edit_sale_extra_cost)
+        register_state_step('edit_sale_date', self._process_edit_sale_date)
     
     def _register_edit_sale_handlers(self):
         """هندلرهای ویرایش فروش"""
@@ -30,11 +40,10 @@ class EditSale:
         def edit_sale_start(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 sale_id = int(call.data.split("_")[2])
                 
@@ -53,7 +62,7 @@ class EditSale:
                 msg = self.bot.send_message(user_id, f"🔢 تعداد جدید را وارد کنید (فعلی: {sale['quantity']}):", reply_markup=cancel_button())
                 self.bot.register_next_step_handler(msg, self._process_edit_sale_quantity)
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
     
     def _process_edit_sale_quantity(self, message):
         """پردازش ویرایش تعداد فروش"""
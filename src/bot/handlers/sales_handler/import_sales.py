@@ -0,0 +1,150 @@
+"""
+هندلرهای ورود گروهی فروش‌ها از فایل (CSV / XLSX)
+"""
+
+import io
+
+from ...keyboards import back_button, cancel_button
+from ...progress import ProgressMessage
+from ...states.state import (
+    set_user_state,
+    get_user_state,
+    try_lock_user,
+    unlock_user,
+    register_state_step
+)
+from ....core.config import settings
+from ....services.sale_services import SaleImportService
+from ....utils.table_io import table_extension, TableFormatError
+
+
+IMPORT_PROMPT = (
+    "📥 فایل CSV یا XLSX فروش‌ها را ارسال کنید.\n\n"
+    "ستون‌ها به ترتیب: نام محصول، تعداد، کل فروش، کل خرید، هزینه جانبی (اختیاری)، تاریخ (اختیاری)\n"
+    "(یا ردیف عنوان با ستون‌های product, quantity, total_sale, total_cost, extra_cost, date)\n"
+    "تعداد هر فروش از موجودی محصول کم می‌شود."
+)
+
+
+class ImportSales:
+    """مدیریت ورود گروهی فروش‌ها"""
+
+    def __init__(self, bot, data_manager):
+        self.bot = bot
+        self.data_manager = data_manager
+        self.import_service = SaleImportService(data_manager)
+
+    def register(self):
+        """ثبت هندلرهای ورود گروهی فروش‌ها"""
+        self._register_import_handlers()
+        self._register_state_steps()
+
+    def _register_state_steps(self):
+        """ثبت مراحل گفتگو برای ادامه آن از روی وضعیت ذخیره‌شده"""
+        register_state_step('import_sales_file', self._process_import_file)
+
+    def _register_import_handlers(self):
+        """هندلرهای ورود گروهی فروش‌ها"""
+        @self.bot.callback_query_handler(func=lambda call: call.data == "import_sales")
+        def import_sales_start(call):
+            user_id = call.message.chat.id
+
+            if not try_lock_user(user_id):
+                self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
+                return
+
+            try:
+                set_user_state(user_id, 'import_sales_file')
+
+                msg = self.bot.send_message(user_id, IMPORT_PROMPT, reply_markup=cancel_button())
+                self.bot.register_next_step_handler(msg, self._process_import_file)
+            finally:
+                unlock_user(user_id)
+
+        # فایلی که بعد از restart یا در نمونه دیگر ربات (بدون next step handler) می‌رسد
+        @self.bot.message_handler(
+            content_types=['document'],
+            func=lambda message: get_user_state(message.chat.id) == 'import_sales_file'
+        )
+        def import_sales_file(message):
+            self._process_import_file(message)
+
+    def _process_import_file(self, message):
+        """دریافت فایل و ثبت گروهی فروش‌ها"""
+        user_id = message.chat.id
+        document = message.document
+
+        error_message = self._validate_document(document)
+        if error_message:
+            msg = self.bot.send_message(user_id, f"{error_message} دوباره تلاش کنید:", reply_markup=cancel_button())
+            self.bot.register_next_step_handler(msg, self._process_import_file)
+            return
+
+        if not try_lock_user(user_id):
+            self.bot.send_message(user_id, "⏳ لطفاً صبر کنید...")
+            return
+
+        try:
+            progress = ProgressMessage(self.bot, user_id, "⏳ در حال دریافت فایل...")
+            file_info = self.bot.get_file(document.file_id)
+            content = self.bot.download_file(file_info.file_path)
+
+            try:
+                result = self.import_service.import_sales(
+                    io.BytesIO(content),
+                    document.file_name,
+                    progress=lambda current: progress.update(self._import_progress_text(current))
+                )
+            except TableFormatError:
+                progress.finish("❌ این فایل قابل خواندن نیست.", reply_markup=back_button("sales"))
+            else:
+                progress.finish(self._import_result_text(result), reply_markup=back_button("sales"))
+
+            set_user_state(user_id, 'sales_menu')
+        finally:
+            unlock_user(user_id)
+
+    @staticmethod
+    def _validate_document(document):
+        """
+        بررسی فایل ارسال‌شده
+
+        Returns:
+            پیام خطا یا None
+        """
+        if document is None:
+            return "❌ لطفاً فایل CSV یا XLSX ارسال کنید."
+
+        try:
+            table_extension(document.file_name)
+        except TableFormatError:
+            return "❌ فقط فایل‌های CSV و XLSX پشتیبانی می‌شوند."
+
+        if (document.file_size or 0) > settings.BULK_MAX_FILE_MB * 1024 * 1024:
+            return f"❌ حجم فایل نباید بیشتر از {settings.BULK_MAX_FILE_MB} مگابایت باشد."
+
+        return None
+
+    @staticmethod
+    def _import_progress_text(result):
+        """متن پیشرفت ورود"""
+        return (
+            f"⏳ در حال ثبت فروش‌ها...\n\n"
+            f"ردیف‌های خوانده‌شده: {result['total_rows']}\n"
+            f"✅ ثبت‌شده: {result['created']}  ❌ نامعتبر: {result['invalid']}"
+        )
+
+    @staticmethod
+    def _import_result_text(result):
+        """متن نتیجه نهایی ورود"""
+        text = (
+            f"✅ ورود فروش‌ها تمام شد.\n\n"
+            f"ردیف‌ها: {result['total_rows']}\n"
+            f"✅ فروش ثبت‌شده: {result['created']}\n"
+            f"❌ نامعتبر: {result['invalid']}"
+        )
+        if result['failed_batches']:
+            text += f"\n⚠️ دسته‌های ثبت‌نشده: {result['failed_batches']}"
+        if result['errors']:
+            text += "\n\n" + "\n".join(result['errors'])
+        return text
@@ -1,11 +1,13 @@
 """
 کلاس مدیریت هندلرهای فروش
-سازماندهی شده به پنج ماژول:
+سازماندهی شده به هفت ماژول:
 - menu.py: منوی فروش
 - add_sale.py: اضافه کردن فروش
 - view_sales.py: مشاهده فروش
 - delete_sale.py: حذف فروش
 - edit_sale.py: ویرایش فروش
+- import_sales.py: ورود گروهی فروش‌ها از فایل
+- analytics.py: گزارش‌های تحلیلی فروش
 """
 
 from .menu import SalesMenu
@@ -13,6 +15,8 @@ from .add_sale import AddSale
 from .view_sales import ViewSales
 from .delete_sale import DeleteSale
 from .edit_sale import EditSale
+from .import_sales import ImportSales
+from .analytics import SalesAnalytics
 
 
 class SalesHandler:
@@ -28,6 +32,8 @@ class SalesHandler:
         self.view_sales = ViewSales(bot, data_manager)
         self.delete_sale = DeleteSale(bot, data_manager)
         self.edit_sale = EditSale(bot, data_manager)
+        self.import_sales = ImportSales(bot, data_manager)
+        self.analytics = SalesAnalytics(bot, data_manager)
     
     def register(self):
         """ثبت تمام هندلرهای فروش از طریق ماژول‌ها"""
@@ -36,3 +42,5 @@ class SalesHandler:
         self.view_sales.register()
         self.delete_sale.register()
         self.edit_sale.register()
+        self.import_sales.register()
+        self.analytics.register()
@@ -7,13 +7,15 @@ from ...keyboards import (
     back_button,
     sales_list_keyboard_with_pagination,
 )
+from ...page_cache import page_cache
 from ...states.state import (
     set_user_state,
     get_user_data,
-    is_user_processing,
-    set_user_processing
+    try_lock_user,
+    unlock_user
 )
 from ....services.sale_services import SalesService
+from ....utils.pagination import parse_page_callback
 
 
 class ViewSales:
@@ -37,11 +39,10 @@ class ViewSales:
         def view_sales_list(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 # دریافت صفحه اول از سرویس
                 page_data = self.sales_service.get_sales_page(page=1, items_per_page=self.ITEMS_PER_PAGE)
@@ -56,7 +57,9 @@ class ViewSales:
                 keyboard = sales_list_keyboard_with_pagination(
                     page_data['sales'],
                     page_data['page'],
-                    page_data['total_pages']
+                    page_data['total_pages'],
+                    prev_cursor=page_data.get('prev_cursor'),
+                    next_cursor=page_data.get('next_cursor')
                 )
                 
                 self.bot.edit_message_text(
@@ -67,17 +70,16 @@ class ViewSales:
                     parse_mode="Markdown"
                 )
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
         
         @self.bot.callback_query_handler(func=lambda call: call.data.startswith("select_sale_"))
         def select_sale(call):
             user_id = call.message.chat.id
             
-            if is_user_processing(user_id):
+            if not try_lock_user(user_id):
                 self.bot.answer_callback_query(call.id, "⏳ لطفاً صبر کنید...", show_alert=False)
                 return
             
-            set_user_processing(user_id, True)
             try:
                 sale_id = int(call.data.split("_")[2])
                 
@@ -92,7 +94,7 @@ class ViewSales:
                 
                 self.bot.send_message(user_id, result['text'], reply_markup=edit_sale_keyboard(sale_id))
             finally:
-                set_user_processing(user_id, False)
+                unlock_user(user_id)
     
     def _register_pagination_handler(self):
         """هندلر صفحه‌بندی فروش‌ها"""
@@ -100,22 +102,34 @@ class ViewSales:
         def handle_sales_pagination(call):
             user_id = call.message.chat.id
             message_id = call.message.message_id
-            page = int(call.data.split("_")[-1])
+            page_ref = parse_page_callback(call.data, "sales_page")
             
-            # دریافت صفحه از سرویس
-            page_data = self.sales_service.get_sales_page(page=page, items_per_page=self.ITEMS_PER_PAGE)
-            
-            # ساخت کیبورد
-            keyboard = sales_list_keyboard_with_pagination(
-                page_data['sales'],
-                page_data['page'],
-                page_data['total_pages']
+            # صفحه رندرشده از کش (در صورت تغییر نکردن داده‌ها) یا از سرویس
+            text, keyboard = page_cache.get_or_render(
+                "sales", page_ref, self.ITEMS_PER_PAGE, lambda: self._render_page(page_ref)
             )
             
             self.bot.edit_message_text(
-                page_data['text'],
+                text,
                 user_id,
                 message_id,
                 reply_markup=keyboard,
                 parse_mode="Markdown"
             )
+    
+    def _render_page(self, page_ref):
+        """ساخت متن و کیبورد یک صفحه از لیست فروش‌ها"""
+        page_data = self.sales_service.get_sales_page(
+            page=page_ref.page,
+            items_per_page=self.ITEMS_PER_PAGE,
+            cursor=page_ref.cursor,
+            direction=page_ref.direction
+        )
+        keyboard = sales_list_keyboard_with_pagination(
+            page_data['sales'],
+            page_data['page'],
+            page_data['total_pages'],
+            prev_cursor=page_data.get('prev_cursor'),
+            next_cursor=page_data.get('next_cursor')
+        )
+        return page_data['text'], keyboard
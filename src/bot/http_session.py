@@ -0,0 +1,219 @@
+"""
+اتصال HTTP مشترک برای درخواست‌های API تلگرام
+- یک requests.Session با pool اتصال برای تمام thread ها (به جای Session جدا و موقت برای هر thread)
+  تا اتصال‌های TLS/SOCKS باز بمانند و دوباره استفاده شوند
+- TCP keep-alive روی اتصال‌ها (و اتصال‌های پراکسی SOCKS) و timeout های اتصال/خواندن از Settings
+- در runtime ناهمگام: TCPConnector با همان اندازه pool و keep-alive
+- هیستوگرام زمان پاسخ به ازای هر متد API (فقط زمان HTTP، بدون انتظار در صف ارسال)
+"""
+
+import bisect
+import socket
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from ..core.config import settings
+
+
+# مرزهای bucket های هیستوگرام (میلی‌ثانیه)
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """هیستوگرام زمان پاسخ به ازای هر متد (امن برای چند thread)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # متد -> {"counts": [...], "count", "errors", "total", "max"}
+        self._methods = {}
+
+    def record(self, method: str, seconds: float, ok: bool = True):
+        """ثبت زمان یک درخواست"""
+        ms = seconds * 1000
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = {
+                    "counts": [0] * (len(self.buckets) + 1),
+                    "count": 0,
+                    "errors": 0,
+                    "total": 0.0,
+                    "max": 0.0,
+                }
+            stats["counts"][bisect.bisect_left(self.buckets, ms)] += 1
+            stats["count"] += 1
+            stats["total"] += ms
+            stats["max"] = max(stats["max"], ms)
+            if not ok:
+                stats["errors"] += 1
+
+    def reset(self):
+        """صفر کردن هیستوگرام"""
+        with self._lock:
+            self._methods.clear()
+
+    def snapshot(self) -> dict:
+        """
+        دریافت آمار هر متد
+
+        Returns:
+            متد -> count, errors, avg_ms, max_ms, p50_ms, p95_ms (مرز بالای bucket) و buckets
+        """
+        with self._lock:
+            return {method: self._summary(stats) for method, stats in self._methods.items()}
+
+    def _summary(self, stats: dict) -> dict:
+        labels = [f"<={bound}" for bound in self.buckets] + [f">{self.buckets[-1]}"]
+        return {
+            "count": stats["count"],
+            "errors": stats["errors"],
+            "avg_ms": stats["total"] / stats["count"],
+            "max_ms": stats["max"],
+            "p50_ms": self._percentile(stats, 0.50),
+            "p95_ms": self._percentile(stats, 0.95),
+            "buckets": dict(zip(labels, stats["counts"])),
+        }
+
+    def _percentile(self, stats: dict, fraction: float) -> float:
+        """مرز بالای bucket ای که صدک مورد نظر در آن است (حداکثر برابر بیشینه)"""
+        target = stats["count"] * fraction
+        seen = 0
+        for bound, count in zip(self.buckets, stats["counts"]):
+            seen += count
+            if seen >= target:
+                return min(float(bound), stats["max"])
+        return stats["max"]
+
+
+# هیستوگرام مشترک درخواست‌های همگام و ناهمگام
+http_latency = LatencyHistogram()
+
+
+def _keepalive_socket_options() -> list:
+    """گزینه‌های TCP keep-alive (گزینه‌های زمان‌بندی فقط در سیستم‌هایی که پشتیبانی می‌کنند)"""
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    idle = settings.HTTP_KEEPALIVE
+    for name, value in (("TCP_KEEPIDLE", idle), ("TCP_KEEPINTVL", max(1, idle // 4)), ("TCP_KEEPCNT", 4)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter با TCP keep-alive برای اتصال‌های مستقیم و اتصال‌های پراکسی"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = _keepalive_socket_options()
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        # pool پراکسی (از جمله SOCKS) یک بار برای هر آدرس ساخته و بعد دوباره استفاده می‌شود
+        proxy_kwargs.setdefault("socket_options", _keepalive_socket_options())
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
+
+def proxy_url(proxy_config) -> str:
+    """آدرس پراکسی SOCKS5 از روی تنظیمات"""
+    if proxy_config.username and proxy_config.password:
+        return f"socks5://{proxy_config.username}:{proxy_config.password}@{proxy_config.url}"
+    return f"socks5://{proxy_config.url}"
+
+
+def create_http_session() -> requests.Session:
+    """ساخت Session مشترک با pool و keep-alive (و پراکسی در صورت تنظیم)"""
+    session = requests.Session()
+    adapter = KeepAliveAdapter(
+        pool_connections=2,
+        pool_maxsize=settings.HTTP_POOL_SIZE,
+        max_retries=0,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if settings.PROXY:
+        url = proxy_url(settings.PROXY)
+        session.proxies.update({"http": url, "https": url})
+    return session
+
+
+def _method_name(url) -> str:
+    """نام متد API از انتهای آدرس (بدون توکن)"""
+    return str(url).rsplit("/", 1)[-1].split("?", 1)[0]
+
+
+def install_http_session(session: requests.Session = None) -> requests.Session:
+    """
+    استفاده از Session مشترک و اندازه‌گیری‌شده برای تمام درخواست‌های apihelper (TeleBot)
+
+    Returns:
+        Session نصب‌شده
+    """
+    from telebot import apihelper
+
+    session = session or create_http_session()
+    apihelper.CONNECT_TIMEOUT = settings.HTTP_CONNECT_TIMEOUT
+    apihelper.READ_TIMEOUT = settings.HTTP_READ_TIMEOUT
+    apihelper.session = session
+
+    def send_request(method, url, **kwargs):
+        start = time.perf_counter()
+        ok = False
+        try:
+            response = session.request(method, url, **kwargs)
+            ok = response.status_code < 400
+            return response
+        finally:
+            http_latency.record(_method_name(url), time.perf_counter() - start, ok)
+
+    apihelper.CUSTOM_REQUEST_SENDER = send_request
+    return session
+
+
+def install_async_http_session():
+    """تنظیم pool و keep-alive و اندازه‌گیری زمان برای درخواست‌های asyncio_helper (AsyncTeleBot)"""
+    import aiohttp
+    from telebot import asyncio_helper
+
+    asyncio_helper.REQUEST_TIMEOUT = settings.HTTP_READ_TIMEOUT
+
+    async def on_request_start(session, context, params):
+        context.start = time.perf_counter()
+
+    async def on_request_end(session, context, params):
+        http_latency.record(_method_name(params.url.path), time.perf_counter() - context.start, params.response.status < 400)
+
+    async def on_request_exception(session, context, params):
+        http_latency.record(_method_name(params.url.path), time.perf_counter() - context.start, False)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+
+    class PooledSessionManager(asyncio_helper.SessionManager):
+        """SessionManager با اندازه pool، keep-alive و timeout اتصال از Settings"""
+
+        async def create_session(self):
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=settings.HTTP_POOL_SIZE,
+                    keepalive_timeout=settings.HTTP_KEEPALIVE,
+                    ttl_dns_cache=300,
+                    ssl=self.ssl_context,
+                ),
+                timeout=aiohttp.ClientTimeout(sock_connect=settings.HTTP_CONNECT_TIMEOUT),
+                trace_configs=[trace_config],
+            )
+            return self.session
+
+    asyncio_helper.session_manager = PooledSessionManager()
+
+
+def get_http_latency() -> dict:
+    """دریافت هیستوگرام زمان پاسخ متدهای API"""
+    return http_latency.snapshot()
@@ -22,7 +22,9 @@ from .inventory import (
 from .sales import (
     sales_menu_keyboard,
     edit_sale_keyboard,
-    sales_list_keyboard_with_pagination
+    sales_list_keyboard_with_pagination,
+    sales_analytics_keyboard,
+    analytics_page_keyboard
 )
 
 # Import from pagination keyboards
@@ -51,6 +53,8 @@ __all__ = [
     'sales_menu_keyboard',
     'edit_sale_keyboard',
     'sales_list_keyboard_with_pagination',
+    'sales_analytics_keyboard',
+    'analytics_page_keyboard',
 
     # Pagination
     "pagination_keyboard",
@@ -80,6 +80,10 @@ def share_keyboard():
     markup = types.InlineKeyboardMarkup()
     markup.add(types.InlineKeyboardButton("📤 اشتراک‌گذاری ربات", switch_inline_query="استفاده از ربات مدیریت فروش"))
     markup.add(types.InlineKeyboardButton("📊 اشتراک گزارش کامل", callback_data="share_full_report"))
+    markup.add(
+        types.InlineKeyboardButton("📄 فایل فروش‌ها (CSV)", callback_data="sales_report_csv"),
+        types.InlineKeyboardButton("📗 فایل فروش‌ها (XLSX)", callback_data="sales_report_xlsx")
+    )
     markup.add(types.InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_main"))
     return markup
 
@@ -7,6 +7,10 @@ def inventory_menu_keyboard():
     markup.add(types.InlineKeyboardButton("➕ اضافه کردن محصول", callback_data="add_product"))
     markup.add(types.InlineKeyboardButton("✏️ ویرایش محصولات", callback_data="edit_product_list"))
     markup.add(types.InlineKeyboardButton("📋 مشاهده لیست", callback_data="view_inventory"))
+    markup.row(
+        types.InlineKeyboardButton("📥 ورود از فایل", callback_data="import_products"),
+        types.InlineKeyboardButton("📤 خروجی CSV", callback_data="export_products"),
+    )
     markup.add(types.InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_main"))
     return markup
 
@@ -19,7 +23,7 @@ def edit_product_keyboard(product_id):
     markup.add(types.InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_inventory"))
     return markup
 
-def products_list_keyboard_with_pagination(products, page: int, total_pages: int, for_sale=False):
+def products_list_keyboard_with_pagination(products, page: int, total_pages: int, for_sale=False, prev_cursor=None, next_cursor=None):
     """صفحه‌کلید لیست محصولات با صفحه‌بندی"""
     markup = types.InlineKeyboardMarkup()
     
@@ -41,7 +45,13 @@ def products_list_keyboard_with_pagination(products, page: int, total_pages: int
         markup.add(btn)
     
     # دکمه‌های صفحه‌بندی
-    pagination_kb = pagination_keyboard("edit_products_page" if not for_sale else "sale_products_page", page, total_pages)
+    pagination_kb = pagination_keyboard(
+        "edit_products_page" if not for_sale else "sale_products_page",
+        page,
+        total_pages,
+        prev_cursor,
+        next_cursor
+    )
     for row in pagination_kb.keyboard:
         markup.row(*row)
     
@@ -1,11 +1,15 @@
 from telebot.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from ...utils.pagination import page_callback_data, CURSOR_NEXT, CURSOR_PREV
 
-def pagination_keyboard(action_prefix: str, page: int, total_pages: int):
+
+def pagination_keyboard(action_prefix: str, page: int, total_pages: int, prev_cursor: str = None, next_cursor: str = None):
     """
     ساخت کیبورد صفحه‌بندی
 
     action_prefix: مثل "products_page" یا "sales_page"
+    prev_cursor / next_cursor: کلید مرزی صفحه فعلی برای رفتن به صفحه قبل/بعد با keyset
+    (بدون آن‌ها فقط شماره صفحه در callback_data قرار می‌گیرد)
     """
     keyboard = InlineKeyboardMarkup()
 
@@ -13,12 +17,18 @@ def pagination_keyboard(action_prefix: str, page: int, total_pages: int):
 
     if page > 1:
         buttons.append(
-            InlineKeyboardButton("⬅️ قبلی", callback_data=f"{action_prefix}_{page - 1}")
+            InlineKeyboardButton(
+                "⬅️ قبلی",
+                callback_data=page_callback_data(action_prefix, page - 1, CURSOR_PREV, prev_cursor)
+            )
         )
 
     if page < total_pages:
         buttons.append(
-            InlineKeyboardButton("بعدی ➡️", callback_data=f"{action_prefix}_{page + 1}")
+            InlineKeyboardButton(
+                "بعدی ➡️",
+                callback_data=page_callback_data(action_prefix, page + 1, CURSOR_NEXT, next_cursor)
+            )
         )
 
     if buttons:
@@ -6,6 +6,8 @@ def sales_menu_keyboard():
     markup = types.InlineKeyboardMarkup()
     markup.add(types.InlineKeyboardButton("➕ ثبت فروش جدید", callback_data="add_sale"))
     markup.add(types.InlineKeyboardButton("📋 مشاهده فروش‌ها", callback_data="view_sales_list"))
+    markup.add(types.InlineKeyboardButton("📥 ورود فروش‌ها از فایل", callback_data="import_sales"))
+    markup.add(types.InlineKeyboardButton("📈 تحلیل فروش", callback_data="sales_analytics"))
     markup.add(types.InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_main"))
     return markup
 
@@ -17,7 +19,7 @@ def edit_sale_keyboard(sale_id):
     markup.add(types.InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_sales"))
     return markup
 
-def sales_list_keyboard_with_pagination(sales, page: int, total_pages: int):
+def sales_list_keyboard_with_pagination(sales, page: int, total_pages: int, prev_cursor=None, next_cursor=None):
     """صفحه‌کلید لیست فروش‌ها با صفحه‌بندی"""
     markup = types.InlineKeyboardMarkup()
     
@@ -29,7 +31,7 @@ def sales_list_keyboard_with_pagination(sales, page: int, total_pages: int):
         ))
     
     # دکمه‌های صفحه‌بندی
-    pagination_kb = pagination_keyboard("sales_page", page, total_pages)
+    pagination_kb = pagination_keyboard("sales_page", page, total_pages, prev_cursor, next_cursor)
     for row in pagination_kb.keyboard:
         markup.row(*row)
     
@@ -37,3 +39,38 @@ def sales_list_keyboard_with_pagination(sales, page: int, total_pages: int):
     markup.add(types.InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_sales"))
     
     return markup
+
+def sales_analytics_keyboard():
+    """صفحه‌کلید منوی تحلیل فروش"""
+    markup = types.InlineKeyboardMarkup()
+    markup.row(
+        types.InlineKeyboardButton("📅 روزانه", callback_data="trend_day_page_1"),
+        types.InlineKeyboardButton("📅 هفتگی", callback_data="trend_week_page_1")
+    )
+    markup.row(
+        types.InlineKeyboardButton("📅 ماهانه", callback_data="trend_month_page_1"),
+        types.InlineKeyboardButton("📅 سالانه", callback_data="trend_year_page_1")
+    )
+    markup.add(types.InlineKeyboardButton("🏆 پرسودترین محصولات این ماه", callback_data="top_month_page_1"))
+    markup.add(types.InlineKeyboardButton("🏆 پرسودترین محصولات امسال", callback_data="top_year_page_1"))
+    markup.add(types.InlineKeyboardButton("🏆 پرسودترین محصولات (کل)", callback_data="top_all_page_1"))
+    markup.add(types.InlineKeyboardButton("🔙 بازگشت", callback_data="back_to_sales"))
+    return markup
+
+def analytics_page_keyboard(action_prefix: str, page: int, total_pages: int, products=()):
+    """صفحه‌کلید یک صفحه از گزارش تحلیلی (محصولات برای گزارش جداگانه هر محصول)"""
+    markup = types.InlineKeyboardMarkup()
+    
+    for product in products:
+        markup.add(types.InlineKeyboardButton(
+            f"📈 {product['name']}",
+            callback_data=f"product_analytics_{product['id']}"
+        ))
+    
+    pagination_kb = pagination_keyboard(action_prefix, page, total_pages)
+    for row in pagination_kb.keyboard:
+        markup.row(*row)
+    
+    markup.add(types.InlineKeyboardButton("🔙 بازگشت", callback_data="sales_analytics"))
+    
+    return markup
@@ -0,0 +1,408 @@
+"""
+لایه ارسال درخواست‌های خروجی به API تلگرام
+- token bucket سراسری و به ازای هر چت برای متدهایی که پیام می‌فرستند یا ویرایش می‌کنند
+- پاسخ 429: صبر به اندازه retry_after (و متوقف کردن bucket همان چت) و تکرار درخواست
+- ادغام ویرایش‌های پشت‌سرهم یک پیام: ویرایشی که هنوز پشت limiter منتظر است
+  اگر ویرایش جدیدتری برای همان پیام برسد ارسال نمی‌شود
+- آمار صف: تعداد منتظرها، زمان انتظار، 429 ها و ویرایش‌های ادغام‌شده
+
+روی apihelper (ربات همگام) و asyncio_helper (runtime ناهمگام) نصب می‌شود،
+پس تمام هندلرها بدون تغییر از آن عبور می‌کنند
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from telebot.apihelper import ApiTelegramException
+
+try:
+    # asyncio_helper کلاس خطای جدای خودش را دارد
+    from telebot.asyncio_helper import ApiTelegramException as AsyncApiTelegramException
+except ImportError:
+    # aiohttp فقط در runtime ناهمگام لازم است
+    AsyncApiTelegramException = ApiTelegramException
+
+from ..core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# متدهایی که در محدودیت پیام تلگرام حساب می‌شوند
+LIMITED_METHODS = frozenset({
+    "sendMessage",
+    "sendDocument",
+    "sendPhoto",
+    "forwardMessage",
+    "copyMessage",
+    "editMessageText",
+    "editMessageReplyMarkup",
+    "editMessageCaption",
+})
+
+# متدهای ویرایش که ویرایش‌های پشت‌سرهم یک پیام در آن‌ها ادغام می‌شوند
+EDIT_METHODS = frozenset({
+    "editMessageText",
+    "editMessageReplyMarkup",
+    "editMessageCaption",
+})
+
+
+class TokenBucket:
+    """
+    token bucket با رزرو: هر درخواست یک توکن برمی‌دارد و اگر توکن منفی شود
+    به اندازه کسری تا پر شدن دوباره صبر می‌کند (صف FIFO بدون thread جدا)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: تعداد توکن در ثانیه
+            capacity: بیشترین توکن ذخیره (اندازه burst)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def reserve(self, now: float) -> float:
+        """
+        رزرو یک توکن
+
+        Returns:
+            ثانیه‌هایی که درخواست باید قبل از ارسال صبر کند
+        """
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        return max(wait, self._paused_until - now)
+
+    def pause(self, until: float):
+        """توقف bucket تا زمان until (بعد از 429)"""
+        self._paused_until = max(self._paused_until, until)
+
+
+class OutboundMetrics:
+    """شمارنده‌های thread-safe صف ارسال"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """صفر کردن شمارنده‌ها"""
+        with self._lock:
+            self.requests = 0
+            self.delayed = 0
+            self.delay_total = 0.0
+            self.delay_max = 0.0
+            self.waiting = 0
+            self.waiting_max = 0
+            self.retries = 0
+            self.coalesced = 0
+            self.failed = 0
+
+    def increment(self, name: str):
+        """افزایش یک شمارنده"""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def start_wait(self, seconds: float):
+        """ثبت شروع انتظار یک درخواست در صف"""
+        with self._lock:
+            self.delayed += 1
+            self.delay_total += seconds
+            self.delay_max = max(self.delay_max, seconds)
+            self.waiting += 1
+            self.waiting_max = max(self.waiting_max, self.waiting)
+
+    def end_wait(self):
+        """ثبت پایان انتظار"""
+        with self._lock:
+            self.waiting -= 1
+
+    def snapshot(self) -> dict:
+        """دریافت آمار فعلی"""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "delayed": self.delayed,
+                "delay_avg_ms": (self.delay_total / self.delayed * 1000) if self.delayed else 0.0,
+                "delay_max_ms": self.delay_max * 1000,
+                "waiting": self.waiting,
+                "waiting_max": self.waiting_max,
+                "retries_429": self.retries,
+                "coalesced_edits": self.coalesced,
+                "failed": self.failed,
+            }
+
+
+class OutboundDispatcher:
+    """محدودکننده نرخ و مدیریت 429 برای درخواست‌های خروجی (امن برای چند thread و event loop)"""
+
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        chat_burst: float,
+        group_rate: float,
+        max_retries: int = 3,
+        max_chats: int = 10000,
+    ):
+        """
+        Args:
+            global_rate: پیام در ثانیه برای کل ربات
+            chat_rate: پیام در ثانیه برای هر چت خصوصی
+            chat_burst: تعداد پیامی که یک چت می‌تواند پشت‌سرهم بدون انتظار بگیرد
+            group_rate: پیام در ثانیه برای هر گروه/کانال (شناسه منفی)
+            max_retries: بیشترین تعداد تکرار بعد از 429
+            max_chats: بیشترین تعداد bucket چت‌های نگه‌داری‌شده
+        """
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.group_rate = group_rate
+        self.max_retries = max_retries
+        self.max_chats = max_chats
+        self.metrics = OutboundMetrics()
+        self._lock = threading.Lock()
+        # بدون burst سراسری: ارسال‌ها با فاصله یکنواخت 1/global_rate پخش می‌شوند
+        self._global = TokenBucket(global_rate, 1)
+        self._chats = OrderedDict()
+        # (چت، پیام) -> [شماره آخرین ویرایش درخواست‌شده، زمان نوبت ارسال رزروشده]
+        self._edits = {}
+
+    def call(self, method_name: str, params, send, retryable: bool = True):
+        """
+        ارسال یک درخواست همگام از مسیر limiter
+
+        Args:
+            method_name: نام متد API (مثل sendMessage)
+            params: پارامترهای درخواست
+            send: تابع بدون آرگومان که درخواست را واقعاً ارسال می‌کند
+            retryable: آیا بعد از 429 تکرار شود (درخواست‌های فایل‌دار قابل ارسال دوباره نیستند)
+
+        Returns:
+            نتیجه send، یا True برای ویرایشی که با ویرایش جدیدتر ادغام شد
+        """
+        chat_id, edit_key, generation = self._begin(method_name, params)
+        try:
+            for attempt in range(self.max_retries + 1):
+                delay = self._slot(method_name, chat_id, edit_key, generation, attempt)
+                if delay > 0:
+                    self.metrics.start_wait(delay)
+                    try:
+                        time.sleep(delay)
+                    finally:
+                        self.metrics.end_wait()
+                if self._superseded(edit_key, generation):
+                    self.metrics.increment("coalesced")
+                    return True
+                try:
+                    self.metrics.increment("requests")
+                    return send()
+                except ApiTelegramException as e:
+                    retry_after = self._retry_after(e, chat_id, attempt if retryable else self.max_retries)
+                    if retry_after is None:
+                        raise
+                time.sleep(retry_after)
+        finally:
+            self._end(edit_key, generation)
+
+    async def async_call(self, method_name: str, params, send, retryable: bool = True):
+        """
+        معادل call برای runtime ناهمگام
+
+        Args:
+            send: coroutine function بدون آرگومان که درخواست را ارسال می‌کند
+        """
+        chat_id, edit_key, generation = self._begin(method_name, params)
+        try:
+            for attempt in range(self.max_retries + 1):
+                delay = self._slot(method_name, chat_id, edit_key, generation, attempt)
+                if delay > 0:
+                    self.metrics.start_wait(delay)
+                    try:
+                        await asyncio.sleep(delay)
+                    finally:
+                        self.metrics.end_wait()
+                if self._superseded(edit_key, generation):
+                    self.metrics.increment("coalesced")
+                    return True
+                try:
+                    self.metrics.increment("requests")
+                    return await send()
+                except AsyncApiTelegramException as e:
+                    retry_after = self._retry_after(e, chat_id, attempt if retryable else self.max_retries)
+                    if retry_after is None:
+                        raise
+                await asyncio.sleep(retry_after)
+        finally:
+            self._end(edit_key, generation)
+
+    def _begin(self, method_name: str, params):
+        """استخراج چت و ثبت ویرایش (برای ادغام)"""
+        params = params or {}
+        chat_id = params.get("chat_id")
+        if method_name not in EDIT_METHODS or chat_id is None or params.get("message_id") is None:
+            return chat_id, None, None
+
+        edit_key = (str(chat_id), str(params["message_id"]))
+        with self._lock:
+            entry = self._edits.setdefault(edit_key, [0, 0.0])
+            entry[0] += 1
+            return chat_id, edit_key, entry[0]
+
+    def _superseded(self, edit_key, generation) -> bool:
+        """آیا ویرایش جدیدتری برای همین پیام رسیده"""
+        if edit_key is None:
+            return False
+        with self._lock:
+            return self._edits[edit_key][0] != generation
+
+    def _end(self, edit_key, generation):
+        """حذف رکورد ویرایش اگر آخرین ویرایش همین پیام بود"""
+        if edit_key is None:
+            return
+        with self._lock:
+            if self._edits[edit_key][0] == generation:
+                del self._edits[edit_key]
+
+    def _slot(self, method_name: str, chat_id, edit_key, generation, attempt: int) -> float:
+        """
+        رزرو نوبت ارسال در bucket سراسری و bucket چت
+
+        ویرایشی که جای ویرایش منتظر قبلی همان پیام را می‌گیرد نوبت رزروشده آن را به ارث می‌برد
+        تا ویرایش‌های ادغام‌شده توکن مصرف نکنند
+
+        Returns:
+            ثانیه‌های انتظار تا نوبت ارسال
+        """
+        if method_name not in LIMITED_METHODS or chat_id is None:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            entry = self._edits.get(edit_key) if edit_key is not None else None
+            if entry is not None and attempt == 0 and entry[1] > now:
+                return entry[1] - now
+            delay = max(self._global.reserve(now), self._chat_bucket(chat_id, now).reserve(now))
+            if entry is not None and entry[0] == generation:
+                entry[1] = now + delay
+            return delay
+
+    def _chat_bucket(self, chat_id, now: float) -> TokenBucket:
+        """bucket یک چت (داخل lock)؛ bucket چت‌هایی که مدتی پیامی نداشته‌اند (LRU) حذف می‌شوند"""
+        key = str(chat_id)
+        bucket = self._chats.get(key)
+        if bucket is None:
+            group = key.startswith("-") or key.startswith("@")
+            rate = self.group_rate if group else self.chat_rate
+            bucket = self._chats[key] = TokenBucket(rate, self.chat_burst)
+            while len(self._chats) > self.max_chats:
+                self._chats.popitem(last=False)
+        self._chats.move_to_end(key)
+        return bucket
+
+    def _retry_after(self, error: ApiTelegramException, chat_id, attempt: int):
+        """
+        بررسی خطای 429 و متوقف کردن bucket مربوط (تا درخواست‌های بعدی همان چت هم صبر کنند)
+
+        Returns:
+            ثانیه‌های انتظار قبل از تکرار، یا None اگر خطا قابل تکرار نیست
+        """
+        if error.error_code != 429:
+            return None
+
+        parameters = (error.result_json or {}).get("parameters") or {}
+        retry_after = float(parameters.get("retry_after", 1))
+        if chat_id is not None:
+            now = time.monotonic()
+            with self._lock:
+                self._chat_bucket(chat_id, now).pause(now + retry_after)
+
+        if attempt >= self.max_retries:
+            self.metrics.increment("failed")
+            return None
+        self.metrics.increment("retries")
+        logger.warning("Telegram flood limit on chat %s, retrying after %ss", chat_id, retry_after)
+        return retry_after
+
+
+def create_outbound_dispatcher() -> OutboundDispatcher:
+    """ساخت OutboundDispatcher از روی Settings"""
+    return OutboundDispatcher(
+        global_rate=settings.OUTBOUND_GLOBAL_RATE,
+        chat_rate=settings.OUTBOUND_CHAT_RATE,
+        chat_burst=settings.OUTBOUND_CHAT_BURST,
+        group_rate=settings.OUTBOUND_GROUP_PER_MINUTE / 60,
+        max_retries=settings.OUTBOUND_MAX_RETRIES,
+    )
+
+
+# لایه ارسال مشترک ربات همگام و runtime ناهمگام
+outbound = create_outbound_dispatcher()
+
+
+def install_outbound(dispatcher: OutboundDispatcher = outbound):
+    """
+    عبور دادن تمام درخواست‌های خروجی telebot از dispatcher
+    (apihelper برای TeleBot و asyncio_helper برای AsyncTeleBot؛ فراخوانی دوباره اثری ندارد)
+    """
+    from telebot import apihelper
+
+    if settings.TELEGRAM_API_URL:
+        # مثلاً Bot API سرور محلی یا سرور ساختگی برای تست
+        apihelper.API_URL = settings.TELEGRAM_API_URL
+
+    if not getattr(apihelper._make_request, "_outbound", False):
+        make_request = apihelper._make_request
+
+        def _make_request(token, method_name, method="get", params=None, files=None):
+            if method_name == "getUpdates":
+                # long polling نباید پشت limiter بماند
+                return make_request(token, method_name, method=method, params=params, files=files)
+            return dispatcher.call(
+                method_name,
+                params,
+                lambda: make_request(token, method_name, method=method, params=dict(params or {}) or None, files=files),
+                # فایل‌ها بعد از یک بار خوانده شدن قابل ارسال دوباره نیستند
+                retryable=not files,
+            )
+
+        _make_request._outbound = True
+        apihelper._make_request = _make_request
+
+    try:
+        from telebot import asyncio_helper
+    except ImportError:
+        # aiohttp فقط در runtime ناهمگام لازم است
+        return
+
+    if settings.TELEGRAM_API_URL:
+        asyncio_helper.API_URL = settings.TELEGRAM_API_URL
+
+    if not getattr(asyncio_helper._process_request, "_outbound", False):
+        process_request = asyncio_helper._process_request
+
+        async def _process_request(token, url, method="get", params=None, files=None, **kwargs):
+            if url == "getUpdates":
+                return await process_request(token, url, method=method, params=params, files=files, **kwargs)
+            return await dispatcher.async_call(
+                url,
+                params,
+                lambda: process_request(
+                    token, url, method=method, params=dict(params or {}) or None, files=files, **kwargs
+                ),
+                retryable=not files,
+            )
+
+        _process_request._outbound = True
+        asyncio_helper._process_request = _process_request
+
+
+def get_outbound_metrics() -> dict:
+    """دریافت آمار صف ارسال"""
+    return outbound.metrics.snapshot()
@@ -0,0 +1,127 @@
+"""
+کش صفحه‌های رندرشده (متن و JSON کیبورد) برای لیست‌ها و گزارش‌های صفحه‌بندی‌شده
+- کلید: (نمایش، صفحه یا PageRef شامل cursor، تعداد در صفحه)
+- هر ورودی با شماره نسخه داده‌ها برچسب می‌خورد؛ با هر تغییر داده کل کش بی‌اعتبار می‌شود
+- TTL تأخیر دیدن تغییرات نمونه‌های دیگر ربات را محدود می‌کند (نسخه داده‌ها در هر نمونه جداست)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from ..core.config import settings
+from ..repository.data_version import data_version
+
+
+class RenderedPageCache:
+    """کش LRU صفحه‌های رندرشده، وابسته به نسخه داده‌ها"""
+
+    def __init__(self, ttl: int, max_entries: int = 256, version=data_version):
+        """
+        Args:
+            ttl: عمر هر صفحه به ثانیه (0 = کش غیرفعال)
+            max_entries: بیشترین تعداد صفحه‌های نگه‌داری‌شده
+            version: منبع شماره نسخه داده‌ها
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version = version
+        self._lock = threading.Lock()
+        self._version = None
+        # (view, page, per_page) -> (زمان انقضا، متن، JSON کیبورد)
+        self._entries = OrderedDict()
+
+    def get(self, view: str, page, per_page: int):
+        """
+        دریافت صفحه رندرشده
+
+        Returns:
+            (text, keyboard_json) یا None اگر در کش نبود، منقضی شده بود یا داده‌ها تغییر کرده بودند
+        """
+        if self.ttl <= 0:
+            return None
+
+        key = (view, page, per_page)
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, text, keyboard = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return text, keyboard
+
+    def set(self, view: str, page, per_page: int, text: str, keyboard, version: int):
+        """
+        ذخیره صفحه رندرشده
+
+        Args:
+            keyboard: کیبورد (InlineKeyboardMarkup) که به JSON تبدیل و ذخیره می‌شود
+            version: نسخه داده‌ها قبل از خواندن داده‌های صفحه؛ اگر در این فاصله تغییر کرده باشد ذخیره نمی‌شود
+        """
+        if self.ttl <= 0:
+            return
+
+        keyboard_json = keyboard.to_json()
+        with self._lock:
+            self._check_version()
+            if version != self._version:
+                return
+            self._entries[(view, page, per_page)] = (time.monotonic() + self.ttl, text, keyboard_json)
+            self._entries.move_to_end((view, page, per_page))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_render(self, view: str, page, per_page: int, render):
+        """
+        دریافت صفحه از کش یا رندر و ذخیره آن
+
+        Args:
+            render: تابع بدون آرگومان که (text, keyboard) برمی‌گرداند
+
+        Returns:
+            (text, keyboard_json)؛ keyboard_json مستقیماً به عنوان reply_markup قابل ارسال است
+        """
+        cached = self.get(view, page, per_page)
+        if cached is not None:
+            return cached
+
+        version = self.version.current()
+        text, keyboard = render()
+        self.set(view, page, per_page, text, keyboard, version)
+        return text, keyboard.to_json()
+
+    async def async_get_or_render(self, view: str, page, per_page: int, render):
+        """
+        معادل get_or_render برای هندلرهای ناهمگام
+
+        Args:
+            render: coroutine function بدون آرگومان که (text, keyboard) برمی‌گرداند
+        """
+        cached = self.get(view, page, per_page)
+        if cached is not None:
+            return cached
+
+        version = self.version.current()
+        text, keyboard = await render()
+        self.set(view, page, per_page, text, keyboard, version)
+        return text, keyboard.to_json()
+
+    def clear(self):
+        """خالی کردن کش"""
+        with self._lock:
+            self._entries.clear()
+
+    def _check_version(self):
+        """خالی کردن کش اگر نسخه داده‌ها عوض شده باشد (داخل lock)"""
+        current = self.version.current()
+        if current != self._version:
+            self._entries.clear()
+            self._version = current
+
+
+# کش مشترک صفحه‌ها برای تمام هندلرها
+page_cache = RenderedPageCache(settings.PAGE_CACHE_TTL)
@@ -0,0 +1,45 @@
+"""
+پیام پیشرفت عملیات طولانی (ورود/خروج گروهی و ...)
+یک پیام ارسال و در طول کار ویرایش می‌شود؛ ویرایش‌ها حداکثر یک بار در هر interval ثانیه انجام می‌شوند
+"""
+
+import time
+
+from telebot.apihelper import ApiTelegramException
+
+
+class ProgressMessage:
+    """پیام وضعیتی که با پیشرفت کار ویرایش می‌شود"""
+
+    def __init__(self, bot, chat_id, text: str, interval: float = 2.0):
+        """
+        Args:
+            bot: نمونه ربات
+            chat_id: چت مقصد
+            text: متن اولیه
+            interval: حداقل فاصله (ثانیه) بین دو ویرایش میانی
+        """
+        self.bot = bot
+        self.chat_id = chat_id
+        self.interval = interval
+        self.message_id = bot.send_message(chat_id, text).message_id
+        self._text = text
+        self._edited_at = time.monotonic()
+
+    def update(self, text: str):
+        """ویرایش میانی (در صورت گذشتن interval از ویرایش قبلی)؛ خطای ویرایش کار اصلی را متوقف نمی‌کند"""
+        if text == self._text or time.monotonic() - self._edited_at < self.interval:
+            return
+        try:
+            self._edit(text)
+        except ApiTelegramException:
+            pass
+
+    def finish(self, text: str, reply_markup=None):
+        """ویرایش نهایی (بدون توجه به interval)"""
+        self._edit(text, reply_markup)
+
+    def _edit(self, text: str, reply_markup=None):
+        self._text = text
+        self._edited_at = time.monotonic()
+        self.bot.edit_message_text(text, self.chat_id, self.message_id, reply_markup=reply_markup)
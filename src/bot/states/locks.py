@@ -0,0 +1,39 @@
+"""
+قفل‌های به ازای هر چت با try-acquire
+هندلری که قفل چت را نگیرد به جای منتظر ماندن، پیام «لطفاً صبر کنید» برمی‌گرداند
+"""
+
+import threading
+
+
+class ChatLockManager:
+    """
+    قفل غیرمسدودکننده برای هر چت (امن برای چند thread)
+    فقط چت‌هایی که قفلشان گرفته شده نگه‌داری می‌شوند، پس حافظه با تعداد چت‌ها رشد نمی‌کند
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._held = set()
+
+    def try_acquire(self, chat_id) -> bool:
+        """
+        گرفتن قفل چت در صورت آزاد بودن (بررسی و گرفتن به صورت اتمی)
+
+        Returns:
+            True اگر قفل گرفته شد، False اگر چت در حال پردازش است
+        """
+        with self._lock:
+            if chat_id in self._held:
+                return False
+            self._held.add(chat_id)
+            return True
+
+    def release(self, chat_id):
+        """آزاد کردن قفل چت"""
+        with self._lock:
+            self._held.discard(chat_id)
+
+    def locked(self, chat_id) -> bool:
+        """آیا چت در حال پردازش است"""
+        return chat_id in self._held
@@ -1,7 +1,16 @@
 # مدیریت وضعیت کاربران و instance های مشترک
+import asyncio
+import json
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
 from ...repository import DataManagerAdapter
+from .locks import ChatLockManager
+from .store import create_state_store
 
 # ایجاد یک instance مشترک از DataManagerAdapter (بجای DataManager قدیمی)
+# Session آن از ScopedSession گرفته می‌شود و برای هر آپدیت در session_scope تازه است
 data_manager = DataManagerAdapter()
 
 # داده‌های تستی - این بخش بعداً حذف خواهد شد
@@ -11,44 +20,205 @@ data_manager = DataManagerAdapter()
 #    quantity = random.randint(1, 50)
 #    data_manager.add_product(name, quantity)
 
-# ذخیره وضعیت کاربران
-user_states = {}
-user_data = {}
-user_locks = {}  # قفل برای جلوگیری از کلیک‌های چندگانه
-processing_users = set()  # کاربرانی که در حال پردازش هستند
+DEFAULT_STATE = "main_menu"
+
+# ذخیره‌گاه وضعیت و داده‌های موقت کاربران (حافظه، دیتابیس یا Redis بر اساس STATE_STORE)
+state_store = create_state_store()
+
+# قفل چت‌هایی که در حال پردازش هستند (جلوگیری از کلیک‌های چندگانه؛ فقط در همین نمونه)
+chat_locks = ChatLockManager()
+
+# وضعیت -> تابع مرحله بعد؛ برای ادامه گفتگو وقتی next step handler در حافظه نیست
+# (بعد از restart یا وقتی آپدیت به نمونه دیگری از ربات رسیده)
+_state_steps = {}
+
+# کلیدهای خوانده/نوشته‌شده در آپدیت جاری: کلید -> [مقدار، مقدار خام خوانده‌شده از store]
+_pending = ContextVar("conversation_pending", default=None)
+
+# مقدار خام نامعلوم (کلیدی که بدون خواندن بازنویسی شده)
+_UNKNOWN = object()
+
+
+def _state_key(user_id) -> str:
+    return f"state:{user_id}"
+
+
+def _data_key(user_id) -> str:
+    return f"data:{user_id}"
+
+
+def _encode(value):
+    """تبدیل datetime به JSON"""
+    if isinstance(value, datetime):
+        return {"__dt__": value.isoformat()}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(obj):
+    """بازگرداندن datetime از JSON"""
+    if "__dt__" in obj:
+        return datetime.fromisoformat(obj["__dt__"])
+    return obj
+
+
+def _serialize(key: str, value):
+    """
+    تبدیل مقدار به رشته ذخیره‌شده در store
+
+    Returns:
+        رشته، یا None برای مقدار پیش‌فرض (کلید حذف می‌شود)
+    """
+    if key.startswith("state:"):
+        return None if value == DEFAULT_STATE else value
+    if not value:
+        return None
+    return json.dumps(value, default=_encode, ensure_ascii=False, separators=(",", ":"))
+
+
+def _deserialize(key: str, raw):
+    """بازگرداندن مقدار از رشته store (یا مقدار پیش‌فرض)"""
+    if key.startswith("state:"):
+        return raw or DEFAULT_STATE
+    return json.loads(raw, object_hook=_decode) if raw else {}
+
+
+def _load(key: str):
+    """خواندن یک کلید؛ داخل conversation_scope هر کلید فقط یک بار از store خوانده می‌شود"""
+    pending = _pending.get()
+    if pending is not None and key in pending:
+        return pending[key][0]
+
+    raw = state_store.get(key)
+    value = _deserialize(key, raw)
+    if pending is not None:
+        pending[key] = [value, raw]
+    return value
+
+
+def _store(key: str, value):
+    """نوشتن یک کلید؛ داخل conversation_scope تا پایان آپدیت به تعویق می‌افتد"""
+    pending = _pending.get()
+    if pending is None:
+        _flush({key: [value, _UNKNOWN]})
+    elif key in pending:
+        pending[key][0] = value
+    else:
+        pending[key] = [value, _UNKNOWN]
+
+
+def _flush(pending: dict):
+    """نوشتن کلیدهای تغییرکرده در store (یک set_many و یک delete)"""
+    values = {}
+    removed = []
+    for key, (value, raw) in pending.items():
+        serialized = _serialize(key, value)
+        if serialized == raw:
+            continue
+        if serialized is None:
+            removed.append(key)
+        else:
+            values[key] = serialized
+
+    state_store.set_many(values)
+    state_store.delete(*removed)
+
+
+@contextmanager
+def conversation_scope():
+    """
+    Unit of work وضعیت گفتگو برای پردازش یک آپدیت
+
+    داده‌های موقت (get_user_data) درجا تغییر داده می‌شوند، پس فقط در پایان آپدیت
+    کلیدهایی که واقعاً تغییر کرده‌اند در store نوشته می‌شوند (حتی اگر هندلر خطا بدهد،
+    مثل قبل که dict ها در حافظه باقی می‌ماندند). scope های تو در تو همان scope بیرونی هستند.
+    """
+    if _pending.get() is not None:
+        yield
+        return
+
+    pending = {}
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+        _flush(pending)
+
+
+@asynccontextmanager
+async def async_conversation_scope():
+    """
+    معادل conversation_scope برای هندلرهای ناهمگام؛ نوشتن در store روی thread pool انجام می‌شود
+    هندلرهای ناهمگام فقط set_user_state را صدا می‌زنند که به خواندن از store نیاز ندارد
+    """
+    if _pending.get() is not None:
+        yield
+        return
+
+    pending = {}
+    token = _pending.set(pending)
+    try:
+        yield
+    finally:
+        _pending.reset(token)
+        if pending:
+            await asyncio.to_thread(_flush, pending)
 
 
 def get_user_state(user_id):
     """دریافت وضعیت کاربر"""
-    return user_states.get(user_id, "main_menu")
+    return _load(_state_key(user_id))
 
 
 def set_user_state(user_id, state):
     """تعیین وضعیت کاربر"""
-    user_states[user_id] = state
+    _store(_state_key(user_id), state)
 
 
 def get_user_data(user_id):
-    """دریافت داده‌های موقت کاربر"""
-    if user_id not in user_data:
-        user_data[user_id] = {}
-    return user_data[user_id]
+    """
+    دریافت داده‌های موقت کاربر
+    تغییرات درجا روی dict برگشتی فقط داخل conversation_scope ذخیره می‌شوند
+    """
+    return _load(_data_key(user_id))
 
 
 def clear_user_data(user_id):
     """پاک کردن داده‌های موقت کاربر"""
-    if user_id in user_data:
-        user_data[user_id] = {}
+    _store(_data_key(user_id), {})
+
+
+def register_state_step(state, handler):
+    """
+    ثبت تابع مرحله بعدِ یک وضعیت (همان تابعی که با register_next_step_handler ثبت می‌شود)
+
+    Args:
+        state: نام وضعیت (مثل add_sale_quantity)
+        handler: تابعی که پیام کاربر را می‌گیرد
+    """
+    _state_steps[state] = handler
+
+
+def get_state_step(user_id):
+    """تابع مرحله بعد بر اساس وضعیت ذخیره‌شده کاربر، یا None"""
+    return _state_steps.get(get_user_state(user_id))
 
 
 def is_user_processing(user_id):
     """بررسی اینکه آیا کاربر در حال پردازش است"""
-    return user_id in processing_users
+    return chat_locks.locked(user_id)
 
 
-def set_user_processing(user_id, processing=True):
-    """تعیین وضعیت پردازش کاربر"""
-    if processing:
-        processing_users.add(user_id)
-    else:
-        processing_users.discard(user_id)
+def try_lock_user(user_id):
+    """
+    شروع پردازش کاربر (گرفتن قفل چت)
+
+    Returns:
+        True اگر قفل گرفته شد؛ False اگر پردازش دیگری برای این کاربر در جریان است
+    """
+    return chat_locks.try_acquire(user_id)
+
+
+def unlock_user(user_id):
+    """پایان پردازش کاربر (آزاد کردن قفل چت)"""
+    chat_locks.release(user_id)
@@ -0,0 +1,215 @@
+"""
+ذخیره‌گاه (StateStore) وضعیت گفتگوی کاربران
+- رابط ساده کلید/مقدار: مقدارها رشته JSON فشرده هستند (serialize در state.py)
+- backend حافظه: LRU با سقف تعداد و TTL، فقط برای یک نمونه ربات
+- backend دیتابیس (جدول conversation_states) یا Redis: ماندگار بعد از restart و مشترک بین چند نمونه
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, select, update
+
+from ...core.config import settings
+from ...models import ConversationState
+
+
+class MemoryStateStore:
+    """backend حافظه با LRU و TTL (امن برای چند thread)"""
+
+    def __init__(self, ttl: int, max_entries: int):
+        """
+        Args:
+            ttl: عمر هر کلید بعد از آخرین ذخیره (ثانیه)
+            max_entries: بیشترین تعداد کلیدها؛ کلیدهای کم‌استفاده‌تر حذف می‌شوند
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # کلید -> (زمان انقضا، مقدار)
+        self._entries = OrderedDict()
+
+    def get(self, key: str):
+        """دریافت مقدار یا None در صورت نبود/انقضا"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set_many(self, values: dict):
+        """ذخیره چند کلید"""
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, value in values.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        """حذف کلیدها"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+class DatabaseStateStore:
+    """
+    backend ماندگار روی جدول conversation_states
+    از اتصال جدای Engine استفاده می‌کند تا به تراکنش آپدیت (session_scope) وابسته نباشد
+    """
+
+    # بعد از این تعداد ذخیره، ردیف‌های منقضی پاک می‌شوند
+    PURGE_EVERY = 500
+
+    def __init__(self, engine, ttl: int):
+        """
+        Args:
+            engine: Engine همگام SQLAlchemy
+            ttl: عمر هر کلید بعد از آخرین ذخیره (ثانیه)
+        """
+        self.engine = engine
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def get(self, key: str):
+        """دریافت مقدار یا None در صورت نبود/انقضا"""
+        stmt = select(ConversationState.value).where(
+            ConversationState.key == key,
+            ConversationState.expires_at > datetime.utcnow(),
+        )
+        with self.engine.connect() as conn:
+            return conn.execute(stmt).scalar()
+
+    def set_many(self, values: dict):
+        """ذخیره (upsert) چند کلید در یک تراکنش"""
+        if not values:
+            return
+        expires_at = datetime.utcnow() + timedelta(seconds=self.ttl)
+        with self.engine.begin() as conn:
+            for key, value in values.items():
+                self._upsert(conn, key, value, expires_at)
+        self._maybe_purge(len(values))
+
+    def delete(self, *keys):
+        """حذف کلیدها"""
+        if not keys:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(delete(ConversationState).where(ConversationState.key.in_(keys)))
+
+    def purge_expired(self) -> int:
+        """
+        حذف ردیف‌های منقضی
+
+        Returns:
+            تعداد ردیف‌های حذف‌شده
+        """
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                delete(ConversationState).where(ConversationState.expires_at <= datetime.utcnow())
+            )
+        return result.rowcount
+
+    @staticmethod
+    def _upsert(conn, key, value, expires_at):
+        """INSERT ... ON CONFLICT DO UPDATE در PostgreSQL و SQLite، و UPDATE/INSERT در بقیه"""
+        dialect = conn.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+
+            stmt = insert(ConversationState).values(key=key, value=value, expires_at=expires_at)
+            conn.execute(stmt.on_conflict_do_update(
+                index_elements=[ConversationState.key],
+                set_={"value": stmt.excluded.value, "expires_at": stmt.excluded.expires_at},
+            ))
+            return
+
+        result = conn.execute(
+            update(ConversationState)
+            .where(ConversationState.key == key)
+            .values(value=value, expires_at=expires_at)
+        )
+        if not result.rowcount:
+            conn.execute(
+                ConversationState.__table__.insert().values(key=key, value=value, expires_at=expires_at)
+            )
+
+    def _maybe_purge(self, writes: int):
+        """پاک کردن دوره‌ای ردیف‌های منقضی"""
+        with self._lock:
+            self._writes += writes
+            if self._writes < self.PURGE_EVERY:
+                return
+            self._writes = 0
+        self.purge_expired()
+
+
+class RedisStateStore:
+    """backend ماندگار و مشترک روی Redis (یا هر سرور سازگار)"""
+
+    def __init__(self, client, ttl: int, prefix: str = "bot:conv:"):
+        """
+        Args:
+            client: کلاینت سازگار با redis-py (get / pipeline / delete)
+            ttl: عمر هر کلید بعد از آخرین ذخیره (ثانیه)
+            prefix: پیشوند کلیدها
+        """
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str):
+        """دریافت مقدار یا None"""
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        return raw.decode() if isinstance(raw, bytes) else raw
+
+    def set_many(self, values: dict):
+        """ذخیره چند کلید در یک رفت‌وبرگشت"""
+        if not values:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipe.set(self.prefix + key, value, ex=self.ttl)
+        pipe.execute()
+
+    def delete(self, *keys):
+        """حذف کلیدها"""
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+
+def create_state_store():
+    """
+    ساخت ذخیره‌گاه وضعیت بر اساس تنظیمات (STATE_STORE)
+
+    Returns:
+        MemoryStateStore | DatabaseStateStore | RedisStateStore
+    """
+    backend = settings.STATE_STORE
+    if backend == "database":
+        from ...db.database import engine
+
+        return DatabaseStateStore(engine, settings.STATE_TTL)
+    if backend == "redis":
+        # import دیرهنگام: redis فقط در صورت استفاده از این backend لازم است
+        import redis
+
+        return RedisStateStore(redis.Redis.from_url(settings.STATE_REDIS_URL), settings.STATE_TTL)
+    if backend != "memory":
+        raise ValueError(f"Unknown STATE_STORE backend: {backend}")
+    return MemoryStateStore(settings.STATE_TTL, settings.STATE_MAX_USERS * 2)
@@ -0,0 +1,177 @@
+"""
+دریافت آپدیت‌ها با webhook به جای long polling
+یک سرور HTTP سبک (کتابخانه استاندارد) که JSON آپدیت تلگرام را می‌گیرد،
+secret token را بررسی می‌کند و آپدیت را در صف worker ها می‌گذارد؛
+پاسخ 200 بلافاصله و قبل از اجرای هندلر فرستاده می‌شود
+"""
+
+import hmac
+import json
+import logging
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from telebot import types
+
+from .dispatcher import ChatOrderedExecutor, ConcurrentTeleBot, get_update_chat_id
+
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+HEALTH_PATH = "/healthz"
+
+# بزرگ‌ترین بدنه قابل قبول؛ آپدیت‌های تلگرام خیلی کوچک‌تر از این هستند
+MAX_BODY_SIZE = 1024 * 1024
+
+# تعداد update_id های اخیر که برای کنار گذاشتن ارسال دوباره تلگرام نگه داشته می‌شوند
+SEEN_UPDATES = 10000
+
+
+class WebhookRequestHandler(BaseHTTPRequestHandler):
+    """هندلر درخواست‌های webhook؛ bot، path و secret از روی server خوانده می‌شوند"""
+
+    # بستن اتصال کلاینت کند تا سرور تک‌thread قفل نشود (ثانیه)
+    timeout = 10
+
+    def do_POST(self):
+        """دریافت یک آپدیت"""
+        if self.path != self.server.webhook_path:
+            self._respond(HTTPStatus.NOT_FOUND)
+            return
+
+        secret = self.headers.get(SECRET_HEADER, "")
+        if not hmac.compare_digest(secret.encode(), self.server.secret_token.encode()):
+            self._respond(HTTPStatus.FORBIDDEN)
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            self._respond(HTTPStatus.BAD_REQUEST)
+            return
+        if length <= 0 or length > MAX_BODY_SIZE:
+            self._respond(HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length > 0 else HTTPStatus.BAD_REQUEST)
+            return
+
+        try:
+            update = types.Update.de_json(json.loads(self.rfile.read(length)))
+        except (ValueError, TypeError, KeyError):
+            # پاسخ 400 تا تلگرام آپدیت خراب را دوباره نفرستد
+            self._respond(HTTPStatus.BAD_REQUEST)
+            return
+
+        try:
+            self.server.dispatch(update)
+        except Exception:
+            # خطای dispatch نباید باعث ارسال دوباره آپدیت توسط تلگرام شود
+            logger.exception("Error while dispatching update %s", update.update_id)
+
+        self._respond(HTTPStatus.OK)
+
+    def do_GET(self):
+        """health check برای load balancer"""
+        if self.path == HEALTH_PATH:
+            self._respond(HTTPStatus.OK)
+        else:
+            self._respond(HTTPStatus.NOT_FOUND)
+
+    def _respond(self, status: HTTPStatus):
+        """ارسال پاسخ بدون بدنه"""
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        """لاگ درخواست‌ها در سطح debug به جای stderr"""
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class WebhookServer(HTTPServer):
+    """
+    سرور webhook تک‌thread که هندلرها را اجرا نمی‌کند
+    ConcurrentTeleBot آپدیت را در صف worker های خودش می‌گذارد؛ برای ScopedTeleBot سرور یک
+    ChatOrderedExecutor تک‌worker می‌سازد تا هندلر کند (تراکنش، دانلود فایل، ورود گروهی)
+    جلوی دریافت آپدیت‌های بعدی را نگیرد و از timeout webhook تلگرام نگذرد
+    """
+
+    def __init__(self, bot, host: str, port: int, webhook_path: str, secret_token: str):
+        """
+        Args:
+            bot: نمونه ربات
+            host: آدرس listen
+            port: پورت listen
+            webhook_path: مسیر دریافت آپدیت‌ها
+            secret_token: توکن مخفی که تلگرام در هدر می‌فرستد
+        """
+        super().__init__((host, port), WebhookRequestHandler)
+        self.bot = bot
+        self.webhook_path = webhook_path
+        self.secret_token = secret_token
+        self.executor = None if isinstance(bot, ConcurrentTeleBot) else ChatOrderedExecutor(1)
+        self._seen_lock = threading.Lock()
+        self._seen_updates = OrderedDict()
+
+    def dispatch(self, update):
+        """
+        سپردن آپدیت به worker ها بدون منتظر ماندن برای هندلر
+        آپدیتی که update_id آن قبلاً رسیده (ارسال دوباره تلگرام) کنار گذاشته می‌شود
+        """
+        if not self._remember(update.update_id):
+            logger.info("Skipping redelivered update %s", update.update_id)
+            return
+
+        if self.executor is None:
+            self.bot.process_new_updates([update])
+        else:
+            self.executor.submit(get_update_chat_id(update), self.bot.process_new_updates, [update])
+
+    def _remember(self, update_id) -> bool:
+        """
+        ثبت update_id
+
+        Returns:
+            False اگر این آپدیت قبلاً رسیده بود
+        """
+        with self._seen_lock:
+            if update_id in self._seen_updates:
+                return False
+            self._seen_updates[update_id] = None
+            while len(self._seen_updates) > SEEN_UPDATES:
+                self._seen_updates.popitem(last=False)
+        return True
+
+    def server_close(self):
+        """بستن سوکت و توقف worker سرور (بعد از تمام شدن آپدیت‌های در صف)"""
+        super().server_close()
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+
+def run_webhook(bot, settings):
+    """
+    ثبت webhook در تلگرام (در صورت تنظیم WEBHOOK_URL) و اجرای سرور تا توقف
+
+    Args:
+        bot: نمونه ربات
+        settings: تنظیمات برنامه
+    """
+    if settings.WEBHOOK_URL:
+        bot.set_webhook(
+            url=settings.WEBHOOK_URL.rstrip("/") + settings.WEBHOOK_PATH,
+            secret_token=settings.WEBHOOK_SECRET,
+        )
+
+    server = WebhookServer(
+        bot,
+        settings.WEBHOOK_HOST,
+        settings.WEBHOOK_PORT,
+        settings.WEBHOOK_PATH,
+        settings.WEBHOOK_SECRET,
+    )
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,118 @@
+# مقایسه زمان تبدیل و حافظه هر ردیف: dict (روش قبلی converters) در برابر ProductView / SaleView
+# اجرا: python -m src.commands.benchmark_converters [--rows N] [--repeat N]
+#
+# روی object های ORM ساخته‌شده در حافظه اجرا می‌شود و به دیتابیس نیازی ندارد.
+
+import argparse
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+
+from ..models import Product, Sale
+from ..repository.converters import products_to_views, sales_to_views
+
+
+def _legacy_product_dict(product):
+    """تبدیل قبلی Product به dict (مبنای مقایسه)"""
+    return {
+        "id": product.id,
+        "name": product.name,
+        "quantity": product.stock,
+        "stock": product.stock,
+        "created_at": product.created_at,
+    }
+
+
+def _legacy_sale_dict(sale):
+    """تبدیل قبلی Sale به dict (مبنای مقایسه)"""
+    product_name = "نامشخص"
+    if sale.product:
+        product_name = sale.product.name
+    net_profit = sale.total_sale - sale.total_cost - (sale.extra_cost or 0)
+    sale_price = sale.total_sale / sale.quantity if sale.quantity > 0 else 0
+    return {
+        "id": sale.id,
+        "product_id": sale.product_id,
+        "product_name": product_name,
+        "quantity": sale.quantity,
+        "sale_price": sale_price,
+        "total_sale_price": sale.total_sale,
+        "total_cost": sale.total_cost,
+        "extra_cost": sale.extra_cost or 0,
+        "net_profit": net_profit,
+        "date": sale.sale_date.strftime("%Y/%m/%d") if sale.sale_date else "",
+        "sale_date": sale.sale_date,
+    }
+
+
+def build_models(rows: int):
+    """ساخت محصولات و فروش‌های ساختگی (بدون Session)"""
+    now = datetime(2025, 1, 1)
+    products = [Product(id=i, name=f"product-{i}", stock=i % 50, created_at=now) for i in range(1, 101)]
+    sales = [
+        Sale(
+            id=i,
+            product_id=products[i % 100].id,
+            product=products[i % 100],
+            quantity=1 + i % 5,
+            total_sale=100.0 * (1 + i % 5),
+            total_cost=60.0 * (1 + i % 5),
+            extra_cost=float(i % 3),
+            sale_date=now - timedelta(minutes=i),
+        )
+        for i in range(1, rows + 1)
+    ]
+    return products, sales
+
+
+def measure_memory(convert, items) -> float:
+    """میانگین حافظه تخصیص‌یافته به ازای هر ردیف (بایت)"""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = convert(items)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del result
+    return size / len(items)
+
+
+def measure_time(convert, items, repeat: int) -> float:
+    """بهترین زمان تبدیل کل لیست (میلی‌ثانیه)"""
+    return min(timeit.repeat(lambda: convert(items), number=1, repeat=repeat)) * 1000
+
+
+def main():
+    """اجرای benchmark"""
+    parser = argparse.ArgumentParser(description="compare dict rows with the __slots__ DTOs")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    products, sales = build_models(args.rows)
+    cases = {
+        "sales": (
+            sales,
+            lambda items: [_legacy_sale_dict(s) for s in items],
+            sales_to_views,
+        ),
+        "products": (
+            products * (args.rows // len(products)),
+            lambda items: [_legacy_product_dict(p) for p in items],
+            products_to_views,
+        ),
+    }
+
+    print(f"📊 {args.rows} rows, best of {args.repeat}\n")
+    for name, (items, legacy, views) in cases.items():
+        print(f"🔹 {name}")
+        for label, convert in (("dict", legacy), ("view", views)):
+            print(
+                f"   {label}: {measure_time(convert, items, args.repeat):8.1f} ms"
+                f"  {measure_memory(convert, items):6.0f} B/row"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
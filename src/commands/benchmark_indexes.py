@@ -0,0 +1,133 @@
+# مقایسه plan کوئری‌های پرتکرار فروش/موجودی قبل و بعد از index ها روی داده ساختگی
+# اجرا: python -m src.commands.benchmark_indexes [--products N] [--sales N]
+#
+# همه چیز داخل یک schema موقت و یک تراکنش انجام می‌شود و در پایان rollback می‌شود؛
+# جداول اصلی دست نمی‌خورند. فقط PostgreSQL.
+
+import argparse
+import json
+
+from sqlalchemy import text
+
+from ..db.database import engine, Base
+from ..models import Product, Sale
+from ..utils.constants import LOW_STOCK_THRESHOLD
+
+
+BENCH_SCHEMA = "bench_indexes"
+
+# index هایی که اثرشان سنجیده می‌شود
+BENCH_INDEXES = (
+    "ix_sales_sale_date_id",
+    "ix_sales_product_id_sale_date",
+    "ix_products_low_stock",
+)
+
+# کوئری‌های پرتکرار (همان شکلی که Repository ها می‌سازند)
+QUERIES = {
+    "sales page (ORDER BY sale_date DESC, id DESC)": (
+        "SELECT * FROM sales ORDER BY sale_date DESC, id DESC LIMIT 20 OFFSET 0"
+    ),
+    "sales of one product": (
+        "SELECT * FROM sales WHERE product_id = 42 ORDER BY sale_date DESC"
+    ),
+    "low stock products": (
+        f"SELECT * FROM products WHERE stock > 0 AND stock <= {LOW_STOCK_THRESHOLD} ORDER BY id"
+    ),
+}
+
+
+def seed(conn, products: int, sales: int):
+    """ساخت جداول در schema موقت و پر کردن آن‌ها"""
+    conn.execute(text(f"CREATE SCHEMA {BENCH_SCHEMA}"))
+    conn.execute(text(f"SET LOCAL search_path TO {BENCH_SCHEMA}"))
+    Base.metadata.create_all(conn, tables=[Product.__table__, Sale.__table__], checkfirst=False)
+
+    # حدود 2٪ محصولات کم‌موجود، بقیه با موجودی بالا
+    conn.execute(
+        text(
+            "INSERT INTO products (name, stock, created_at) "
+            "SELECT 'product-' || g, CASE WHEN g % 50 = 0 THEN 1 ELSE 10 + g % 90 END, now() "
+            "FROM generate_series(1, :products) g"
+        ),
+        {"products": products},
+    )
+    conn.execute(
+        text(
+            "INSERT INTO sales (product_id, quantity, total_sale, total_cost, extra_cost, sale_date) "
+            "SELECT 1 + g % :products, 1 + g % 5, 100 * (1 + g % 5), 60 * (1 + g % 5), 0, "
+            "now() - g * interval '1 minute' "
+            "FROM generate_series(1, :sales) g"
+        ),
+        {"products": products, "sales": sales},
+    )
+
+
+def explain(conn, sql: str) -> dict:
+    """اجرای EXPLAIN ANALYZE و برگرداندن نوع node ها و زمان اجرا"""
+    plan = conn.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    plan = plan[0]
+
+    nodes = []
+    stack = [plan["Plan"]]
+    while stack:
+        node = stack.pop()
+        name = node["Node Type"]
+        if "Index Name" in node:
+            name += f" ({node['Index Name']})"
+        nodes.append(name)
+        stack.extend(reversed(node.get("Plans", [])))
+
+    return {"nodes": nodes, "time": plan["Execution Time"]}
+
+
+def run_queries(conn) -> dict:
+    """EXPLAIN تمام کوئری‌ها بعد از به‌روز کردن آمار جداول"""
+    conn.execute(text("ANALYZE products"))
+    conn.execute(text("ANALYZE sales"))
+    return {name: explain(conn, sql) for name, sql in QUERIES.items()}
+
+
+def main():
+    """اجرای benchmark"""
+    parser = argparse.ArgumentParser(description="compare query plans with and without the hot path indexes")
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--sales", type=int, default=500_000)
+    args = parser.parse_args()
+
+    indexes = [
+        index
+        for table in (Product.__table__, Sale.__table__)
+        for index in table.indexes
+        if index.name in BENCH_INDEXES
+    ]
+
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            seed(conn, args.products, args.sales)
+
+            # بدون index ها
+            for index in indexes:
+                conn.execute(text(f"DROP INDEX {index.name}"))
+            before = run_queries(conn)
+
+            # با index ها
+            for index in indexes:
+                index.create(conn)
+            after = run_queries(conn)
+        finally:
+            transaction.rollback()
+
+    print(f"📊 {args.products} products, {args.sales} sales\n")
+    for name in QUERIES:
+        print(f"🔹 {name}")
+        print(f"   before: {before[name]['time']:.2f} ms  {' -> '.join(before[name]['nodes'])}")
+        print(f"   after:  {after[name]['time']:.2f} ms  {' -> '.join(after[name]['nodes'])}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# اجرای بار ارسال روی سرور ساختگی تلگرام: با و بدون لایه ارسال (محدودیت نرخ، 429، ادغام ویرایش‌ها)
+# اجرا: python -m src.commands.benchmark_outbound [--chats 5] [--messages 8] [--edits 10] [--no-limit] [--no-pool]
+
+import argparse
+import threading
+import time
+
+import telebot
+from telebot import apihelper
+
+from ..bot.outbound import install_outbound, create_outbound_dispatcher
+from ..bot.http_session import install_http_session, http_latency
+from .fake_telegram import start_fake_telegram
+
+
+def run_threads(target, count: int):
+    """اجرای هم‌زمان target(i) روی count thread"""
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def main():
+    """اجرای benchmark"""
+    parser = argparse.ArgumentParser(description="load the outbound dispatch layer against a fake Telegram API")
+    parser.add_argument("--chats", type=int, default=5)
+    parser.add_argument("--messages", type=int, default=8, help="messages per chat, sent from two threads")
+    parser.add_argument("--edits", type=int, default=10, help="concurrent edits of one message")
+    parser.add_argument("--no-limit", action="store_true", help="send directly, without the dispatch layer")
+    parser.add_argument("--no-pool", action="store_true", help="use telebot's per-thread sessions instead of the shared pool")
+    args = parser.parse_args()
+
+    server, api_url = start_fake_telegram()
+    if not args.no_pool:
+        install_http_session()
+    dispatcher = None
+    if not args.no_limit:
+        dispatcher = create_outbound_dispatcher()
+        install_outbound(dispatcher)
+    apihelper.API_URL = api_url
+
+    bot = telebot.TeleBot("1:benchmark", threaded=False)
+    errors = []
+
+    def send(i):
+        chat_id = 1000 + i % args.chats
+        for n in range(args.messages // 2):
+            try:
+                bot.send_message(chat_id, f"message {n}")
+            except apihelper.ApiTelegramException as e:
+                errors.append(e.error_code)
+
+    def edit(i):
+        try:
+            bot.edit_message_text(f"page {i}", 999, 1)
+        except apihelper.ApiTelegramException as e:
+            errors.append(e.error_code)
+
+    start = time.perf_counter()
+    run_threads(send, args.chats * 2)
+    sends_elapsed = time.perf_counter() - start
+
+    # پر کردن bucket چت 999 تا ویرایش‌ها پشت limiter صف بکشند
+    for _ in range(4):
+        try:
+            bot.send_message(999, "fill")
+        except apihelper.ApiTelegramException as e:
+            errors.append(e.error_code)
+    start = time.perf_counter()
+    run_threads(edit, args.edits)
+    edits_elapsed = time.perf_counter() - start
+
+    state = server.state
+    print(f"📊 {'direct' if args.no_limit else 'dispatch layer'}: {args.chats} chats x {args.messages} messages, "
+          f"{args.edits} edits of one message\n")
+    print(f"   sends: {sends_elapsed:6.2f} s   edits: {edits_elapsed:6.2f} s")
+    print(f"   server calls: {dict(state.calls)}")
+    print(f"   server 429s:  {dict(state.rejected)}")
+    print(f"   failed calls: {len(errors)}")
+    if dispatcher is not None:
+        print(f"   metrics: {dispatcher.metrics.snapshot()}")
+    for method, stats in http_latency.snapshot().items():
+        print(f"   {method:<16} n={stats['count']:<4} avg={stats['avg_ms']:6.1f} ms  "
+              f"p50<={stats['p50_ms']:g} ms  p95<={stats['p95_ms']:g} ms  max={stats['max_ms']:6.1f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
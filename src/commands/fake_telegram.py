@@ -0,0 +1,165 @@
+# سرور ساختگی API تلگرام برای تست لایه ارسال (محدودیت نرخ، 429 و ادغام ویرایش‌ها)
+# اجرا: python -m src.commands.fake_telegram [--port 8081] [--chat-rate 1] [--global-rate 30]
+#
+# سپس ربات یا benchmark با TELEGRAM_API_URL=http://127.0.0.1:8081/bot{0}/{1} به آن وصل می‌شود.
+# مثل تلگرام، اگر یک چت یا کل ربات از محدودیت بیشتر بفرستد پاسخ 429 با retry_after می‌گیرد.
+
+import argparse
+import json
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from ..bot.outbound import LIMITED_METHODS
+
+
+class FakeTelegramState:
+    """وضعیت سرور: پنجره ارسال‌های هر چت و شمارنده متدها"""
+
+    def __init__(self, chat_rate: float, chat_burst: int, global_rate: float):
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.global_rate = global_rate
+        self._lock = threading.Lock()
+        self._chat_sends = defaultdict(deque)
+        self._global_sends = deque()
+        self._message_id = 0
+        self.calls = Counter()
+        self.rejected = Counter()
+
+    def check_limit(self, chat_id) -> int:
+        """
+        ثبت یک ارسال؛ در هر پنجره یک‌ثانیه‌ای هر چت حداکثر chat_burst + chat_rate
+        و کل ربات حداکثر global_rate + 1 ارسال دارد (همان سقف token bucket)
+
+        Returns:
+            retry_after (ثانیه) اگر از محدودیت گذشته باشد، وگرنه 0
+        """
+        now = time.monotonic()
+        with self._lock:
+            sends = self._chat_sends[chat_id]
+            for window in (sends, self._global_sends):
+                while window and window[0] <= now - 1:
+                    window.popleft()
+
+            if len(sends) >= self.chat_burst + self.chat_rate or len(self._global_sends) >= self.global_rate + 1:
+                return 1
+            sends.append(now)
+            self._global_sends.append(now)
+            return 0
+
+    def next_message_id(self) -> int:
+        with self._lock:
+            self._message_id += 1
+            return self._message_id
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    """پاسخ به /bot{token}/{method} با نتیجه‌های حداقلی مثل Bot API"""
+
+    # اتصال‌های keep-alive مثل سرور واقعی (برای سنجش استفاده دوباره از pool)
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self):
+        url = urlsplit(self.path)
+        method = url.path.rsplit("/", 1)[-1]
+        params = dict(parse_qsl(url.query))
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if body and self.headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded"):
+            params.update(parse_qsl(body.decode()))
+
+        state = self.server.state
+        if method == "stats":
+            self._send(HTTPStatus.OK, {"calls": state.calls, "rejected": state.rejected})
+            return
+
+        state.calls[method] += 1
+        chat_id = params.get("chat_id")
+        if method in LIMITED_METHODS and chat_id is not None:
+            retry_after = state.check_limit(chat_id)
+            if retry_after:
+                state.rejected[method] += 1
+                self._send(HTTPStatus.TOO_MANY_REQUESTS, {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {retry_after}",
+                    "parameters": {"retry_after": retry_after},
+                })
+                return
+
+        self._send(HTTPStatus.OK, {"ok": True, "result": self._result(method, params)})
+
+    def _result(self, method, params):
+        """نتیجه ساختگی متد"""
+        if method == "getMe":
+            return {"id": 1, "is_bot": True, "first_name": "fake", "username": "fake_bot"}
+        if method == "getUpdates":
+            return []
+        if method.startswith("send") or method.startswith("edit"):
+            message_id = params.get("message_id") or self.server.state.next_message_id()
+            return {
+                "message_id": int(message_id),
+                "date": int(time.time()),
+                "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+                "text": params.get("text", ""),
+            }
+        return True
+
+    def _send(self, status: HTTPStatus, payload: dict):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        """بدون لاگ هر درخواست"""
+
+
+def start_fake_telegram(host: str = "127.0.0.1", port: int = 0, chat_rate: float = 1,
+                        chat_burst: int = 3, global_rate: float = 30):
+    """
+    اجرای سرور ساختگی روی یک thread پس‌زمینه
+
+    Returns:
+        (server, api_url): api_url برای TELEGRAM_API_URL / apihelper.API_URL
+    """
+    server = ThreadingHTTPServer((host, port), FakeTelegramHandler)
+    server.daemon_threads = True
+    server.state = FakeTelegramState(chat_rate, chat_burst, global_rate)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/bot{{0}}/{{1}}"
+
+
+def main():
+    """اجرای سرور ساختگی تا Ctrl+C"""
+    parser = argparse.ArgumentParser(description="fake Telegram Bot API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--chat-rate", type=float, default=1)
+    parser.add_argument("--chat-burst", type=int, default=3)
+    parser.add_argument("--global-rate", type=float, default=30)
+    args = parser.parse_args()
+
+    server, api_url = start_fake_telegram(args.host, args.port, args.chat_rate, args.chat_burst, args.global_rate)
+    print(f"🧪 fake Telegram API: TELEGRAM_API_URL={api_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# بازسازی rollup های گزارش (sales_rollups و inventory_rollup) از روی داده‌های اصلی
+# اجرا: python -m src.commands.rebuild_rollups
+
+from ..repository import RepositoryManager
+
+
+def main():
+    """محاسبه دوباره تمام rollup ها"""
+    with RepositoryManager() as repo_manager:
+        repo_manager.rollup_repo.rebuild()
+        totals = repo_manager.rollup_repo.get_sales_totals()
+        inventory = repo_manager.rollup_repo.get_inventory_totals()
+
+    print("✅ rollups rebuilt.")
+    print(f"sales: {totals['total_sales']} | products: {inventory['total_products']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,25 @@ class Settings:
             self._get_proxy_config() if self.USE_PROXY else None
         )
 
+        # UPDATE DISPATCH
+        # تعداد worker ها برای پردازش هم‌زمان آپدیت‌ها (0 = پردازش ترتیبی در یک thread)
+        self.UPDATE_WORKERS = int(self._get_env("UPDATE_WORKERS", "0"))
+        # runtime ناهمگام (AsyncTeleBot + AsyncSession)؛ نیازمند aiohttp و asyncpg
+        self.ASYNC_RUNTIME = self._get_env("ASYNC_RUNTIME", "false").lower() == "true"
+
+        # WEBHOOK
+        # دریافت آپدیت‌ها با webhook به جای long polling
+        self.USE_WEBHOOK = self._get_env("USE_WEBHOOK", "false").lower() == "true"
+        # آدرس عمومی (مثلاً https://bot.example.com)؛ اگر خالی باشد webhook بیرون از برنامه ثبت می‌شود
+        self.WEBHOOK_URL = self._get_env("WEBHOOK_URL", "")
+        self.WEBHOOK_PATH = self._get_env("WEBHOOK_PATH", "/webhook")
+        self.WEBHOOK_HOST = self._get_env("WEBHOOK_HOST", "0.0.0.0")
+        self.WEBHOOK_PORT = int(self._get_env("WEBHOOK_PORT", "8080"))
+        self.WEBHOOK_SECRET = self._get_env("WEBHOOK_SECRET", required=self.USE_WEBHOOK)
+        # runtime ناهمگام فقط long polling دارد؛ به جای نادیده گرفتن webhook، شروع برنامه متوقف می‌شود
+        if self.USE_WEBHOOK and self.ASYNC_RUNTIME:
+            raise ValueError("USE_WEBHOOK and ASYNC_RUNTIME cannot both be enabled")
+
         # DATABASE
         self.DB_USER = self._get_env(
             "POSTGRES_USER", "postgres"
@@ -30,6 +49,55 @@ class Settings:
         self.DB_PORT = self._get_env("POSTGRES_PORT", "5432")
         self.DB_NAME = self._get_env("POSTGRES_DB", "postgres")
 
+        # DATABASE POOL
+        # پیش‌فرض: حداقل یک اتصال برای هر worker تا worker ها پشت pool صف نکشند
+        self.DB_POOL_SIZE = int(self._get_env("DB_POOL_SIZE", str(max(5, self.UPDATE_WORKERS))))
+        self.DB_MAX_OVERFLOW = int(self._get_env("DB_MAX_OVERFLOW", "10"))
+        self.DB_POOL_TIMEOUT = int(self._get_env("DB_POOL_TIMEOUT", "30"))  # ثانیه
+        self.DB_POOL_RECYCLE = int(self._get_env("DB_POOL_RECYCLE", "1800"))  # ثانیه
+        self.DB_POOL_PRE_PING = self._get_env("DB_POOL_PRE_PING", "true").lower() == "true"
+        self.DB_STATEMENT_TIMEOUT = int(self._get_env("DB_STATEMENT_TIMEOUT", "0"))  # میلی‌ثانیه، 0 = غیرفعال
+        # در حالت PgBouncer (transaction pooling) pool سمت برنامه غیرفعال می‌شود
+        self.DB_PGBOUNCER = self._get_env("DB_PGBOUNCER", "false").lower() == "true"
+
+        # PRODUCT CACHE
+        self.PRODUCT_CACHE_TTL = int(self._get_env("PRODUCT_CACHE_TTL", "30"))  # ثانیه، 0 = غیرفعال
+        # اگر تنظیم شود کش بین تمام نمونه‌های ربات روی Redis مشترک است (نیازمند پکیج redis)
+        self.PRODUCT_CACHE_REDIS_URL = self._get_env("PRODUCT_CACHE_REDIS_URL", "")
+
+        # PAGE CACHE (صفحه‌های رندرشده لیست‌ها و گزارش‌ها)
+        self.PAGE_CACHE_TTL = int(self._get_env("PAGE_CACHE_TTL", "60"))  # ثانیه، 0 = غیرفعال
+
+        # CALLBACK DEBOUNCE: کلیک دوباره روی همان دکمه یک پیام در این بازه نادیده گرفته می‌شود
+        self.CALLBACK_DEBOUNCE_MS = int(self._get_env("CALLBACK_DEBOUNCE_MS", "700"))  # 0 = غیرفعال
+
+        # OUTBOUND (محدودیت نرخ درخواست‌های خروجی به تلگرام)
+        self.OUTBOUND_GLOBAL_RATE = float(self._get_env("OUTBOUND_GLOBAL_RATE", "30"))  # پیام در ثانیه برای کل ربات
+        self.OUTBOUND_CHAT_RATE = float(self._get_env("OUTBOUND_CHAT_RATE", "1"))  # پیام در ثانیه برای هر چت
+        self.OUTBOUND_CHAT_BURST = float(self._get_env("OUTBOUND_CHAT_BURST", "3"))  # پیام پشت‌سرهم بدون انتظار
+        self.OUTBOUND_GROUP_PER_MINUTE = float(self._get_env("OUTBOUND_GROUP_PER_MINUTE", "20"))
+        self.OUTBOUND_MAX_RETRIES = int(self._get_env("OUTBOUND_MAX_RETRIES", "3"))  # تکرار بعد از 429
+        # آدرس API به شکل https://host/bot{0}/{1} (Bot API سرور محلی یا سرور ساختگی تست)؛ خالی = api.telegram.org
+        self.TELEGRAM_API_URL = self._get_env("TELEGRAM_API_URL", "")
+
+        # HTTP (اتصال مشترک به API تلگرام)
+        # اندازه pool اتصال‌ها؛ حداقل به تعداد thread هایی که هم‌زمان درخواست می‌فرستند
+        self.HTTP_POOL_SIZE = int(self._get_env("HTTP_POOL_SIZE", str(max(10, self.UPDATE_WORKERS * 2))))
+        self.HTTP_CONNECT_TIMEOUT = float(self._get_env("HTTP_CONNECT_TIMEOUT", "10"))  # ثانیه
+        self.HTTP_READ_TIMEOUT = float(self._get_env("HTTP_READ_TIMEOUT", "30"))  # ثانیه (getUpdates جدا تنظیم می‌شود)
+        self.HTTP_KEEPALIVE = int(self._get_env("HTTP_KEEPALIVE", "60"))  # ثانیه بیکاری قبل از probe keep-alive
+
+        # BULK IMPORT / EXPORT (ورود و خروج گروهی با فایل)
+        self.BULK_BATCH_SIZE = int(self._get_env("BULK_BATCH_SIZE", "1000"))  # ردیف در هر تراکنش / کوئری
+        self.BULK_MAX_FILE_MB = int(self._get_env("BULK_MAX_FILE_MB", "20"))  # سقف دانلود فایل در Bot API
+
+        # CONVERSATION STATE (وضعیت و داده‌های موقت گفتگوی کاربران)
+        # memory: فقط همین نمونه | database: جدول conversation_states | redis: نیازمند پکیج redis
+        self.STATE_STORE = self._get_env("STATE_STORE", "memory").lower()
+        self.STATE_REDIS_URL = self._get_env("STATE_REDIS_URL", "")
+        self.STATE_TTL = int(self._get_env("STATE_TTL", "86400"))  # ثانیه بعد از آخرین تغییر
+        self.STATE_MAX_USERS = int(self._get_env("STATE_MAX_USERS", "10000"))  # فقط backend حافظه
+
     def _get_env(
         self, key: str, default: Optional[str] = None, required: bool = False
     ) -> str:
@@ -49,5 +117,9 @@ class Settings:
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
 
 settings = Settings()
@@ -0,0 +1,50 @@
+# تنظیمات اتصال ناهمگام دیتابیس (asyncpg) برای runtime ناهمگام
+# این ماژول فقط در حالت ASYNC_RUNTIME import می‌شود چون asyncpg وابستگی اختیاری است
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, async_scoped_session
+from sqlalchemy.pool import NullPool
+from ..core.config import settings
+
+# آدرس دیتابیس (درایور asyncpg)
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL
+
+
+def _async_engine_options() -> dict:
+    """ساخت تنظیمات Engine ناهمگام از روی همان Settings های pool"""
+    options = {"echo": False, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    if settings.DB_PGBOUNCER:
+        # در transaction pooling، prepared statement های asyncpg بین اتصال‌ها جابه‌جا می‌شوند
+        options["poolclass"] = NullPool
+        options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if settings.DB_STATEMENT_TIMEOUT > 0:
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT)}}
+    return options
+
+
+# ساخت Engine ناهمگام
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **_async_engine_options())
+
+if settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT > 0:
+    @event.listens_for(async_engine.sync_engine, "begin")
+    def _set_statement_timeout(conn):
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {settings.DB_STATEMENT_TIMEOUT}")
+
+
+# کارخانه ساخت AsyncSession؛ object ها بعد از commit منقضی نمی‌شوند تا lazy load ناهمگام لازم نشود
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+# کلید Session آپدیت جاری؛ task هایی که هندلرها در آن اجرا می‌شوند context را از task آپدیت کپی می‌کنند
+current_update_scope = ContextVar("current_update_scope", default=None)
+
+# رجیستری AsyncSession به ازای هر آپدیت (معادل ScopedSession در حالت همگام)
+AsyncScopedSession = async_scoped_session(AsyncSessionLocal, scopefunc=current_update_scope.get)
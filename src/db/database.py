@@ -1,16 +1,57 @@
 # تنظیمات اتصال دیتابیس
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
+from sqlalchemy.pool import NullPool
 from ..core.config import settings
+from .pool_metrics import MeasuredQueuePool, install_pool_listeners, pool_metrics
 
 # آدرس دیتابیس
 DATABASE_URL = settings.DATABASE_URL
 
+
+def _engine_options() -> dict:
+    """ساخت تنظیمات Engine از روی Settings"""
+    options = {"echo": False, "future": True, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+
+    if settings.DB_PGBOUNCER:
+        # PgBouncer خودش pool می‌کند؛ نگه داشتن اتصال در برنامه فقط اتصال سرور را اشغال می‌کند
+        options["poolclass"] = NullPool
+        return options
+
+    options.update(
+        poolclass=MeasuredQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        # بستن اتصال‌های قدیمی تا بعد از failover/قطع شدن idle اتصال مرده برنگردد
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if settings.DB_STATEMENT_TIMEOUT > 0:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT}"}
+    return options
+
+
 # ساخت Engine: مسئول اتصال به دیتابیس و مدیریت اتصال‌ها
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+engine = create_engine(DATABASE_URL, **_engine_options())
+install_pool_listeners(engine)
+
+if settings.DB_PGBOUNCER and settings.DB_STATEMENT_TIMEOUT > 0:
+    # PgBouncer پارامترهای startup را قبول نمی‌کند؛ timeout برای هر تراکنش تنظیم می‌شود
+    @event.listens_for(engine, "begin")
+    def _set_statement_timeout(conn):
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {settings.DB_STATEMENT_TIMEOUT}")
+
+
+def get_pool_metrics() -> dict:
+    """دریافت آمار pool اتصال‌ها"""
+    return pool_metrics.snapshot(engine.pool)
+
 
 # کارخانه ساخت Session: هر بار یک اتصال تراکنشی جدید به دیتابیس
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# رجیستری Session به ازای هر thread: هر worker که آپدیت پردازش می‌کند Session جدای خودش را دارد
+ScopedSession = scoped_session(SessionLocal)
+
 # پایه مدل‌ها: همه کلاس‌های مدل از این Base ارث می‌برند
 Base = declarative_base()
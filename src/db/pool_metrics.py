@@ -0,0 +1,100 @@
+"""
+آمار pool اتصال‌های دیتابیس: تعداد checkout/checkin و زمان انتظار برای گرفتن اتصال
+"""
+
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """شمارنده‌های thread-safe برای pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """صفر کردن شمارنده‌ها"""
+        with self._lock:
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.wait_count = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+
+    def record_wait(self, seconds: float):
+        """ثبت مدت انتظار یک checkout"""
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            if seconds > self.wait_max:
+                self.wait_max = seconds
+
+    def increment(self, name: str):
+        """افزایش یک شمارنده"""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self, pool=None) -> dict:
+        """
+        دریافت آمار فعلی
+
+        Args:
+            pool: pool موتور (اختیاری) برای افزودن وضعیت لحظه‌ای
+
+        Returns:
+            دیکشنری آمار
+        """
+        with self._lock:
+            data = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "wait_avg_ms": (self.wait_total / self.wait_count * 1000) if self.wait_count else 0.0,
+                "wait_max_ms": self.wait_max * 1000,
+            }
+        if isinstance(pool, QueuePool):
+            data["checked_out"] = pool.checkedout()
+            data["overflow"] = pool.overflow()
+            data["pool_size"] = pool.size()
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeasuredQueuePool(QueuePool):
+    """QueuePool که زمان انتظار برای گرفتن اتصال را ثبت می‌کند"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_metrics.record_wait(time.perf_counter() - start)
+
+
+def install_pool_listeners(engine):
+    """ثبت listener های شمارش رویدادهای pool روی engine"""
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_metrics.increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_metrics.increment("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        pool_metrics.increment("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_metrics.increment("invalidations")
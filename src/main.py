@@ -1,30 +1,30 @@
 # فایل اصلی ربات
 
-import telebot
+import asyncio
 from .core.config import settings
 from .bot.handlers import register_handlers
+from .bot.dispatcher import ScopedTeleBot, ConcurrentTeleBot
+from .bot.outbound import install_outbound
+from .bot.http_session import install_http_session
+from .bot.webhook import run_webhook
 
 
-# اگر پراکسی وجود داشت
-if settings.PROXY:
-    proxy_config = settings.PROXY
-    proxy_url = proxy_config.url
+# Session مشترک با pool اتصال، keep-alive، timeout ها و پراکسی SOCKS از تنظیمات
+install_http_session()
 
-    # اگر پراکسی user/pass میخواست و داشت
-    if proxy_config.username and proxy_config.password:
-        telebot.apihelper.proxy = {
-            "http": f"socks5://{proxy_config.username}:{proxy_config.password}@{proxy_url}",
-            "https": f"socks5://{proxy_config.username}:{proxy_config.password}@{proxy_url}",
-        }
-    else:
-        # پراکسی بدون user/pass
-        telebot.apihelper.proxy = {
-            "http": f"socks5://{proxy_url}",
-            "https": f"socks5://{proxy_url}",
-        }
+# عبور تمام درخواست‌های خروجی از محدودکننده نرخ (همگام و ناهمگام)
+install_outbound()
 
 # ایجاد نمونه ربات
-bot = telebot.TeleBot(settings.BOT_TOKEN)
+if settings.ASYNC_RUNTIME:
+    # در حالت ناهمگام این ربات polling نمی‌کند؛ فقط هندلرهای همگام (گفتگوهای چندمرحله‌ای) را اجرا می‌کند
+    bot = ScopedTeleBot(settings.BOT_TOKEN)
+elif settings.UPDATE_WORKERS > 0:
+    # پردازش هم‌زمان آپدیت‌ها با حفظ ترتیب هر چت
+    bot = ConcurrentTeleBot(settings.BOT_TOKEN, workers=settings.UPDATE_WORKERS)
+else:
+    # پردازش ترتیبی، هر آپدیت با Session مخصوص خودش
+    bot = ScopedTeleBot(settings.BOT_TOKEN)
 
 # ثبت تمام هندلرها
 register_handlers(bot)
@@ -33,6 +33,15 @@ if __name__ == "__main__":
     print("🤖 bot is runnig ...")
     print("for terminate click Ctrl+C")
     try:
-        bot.infinity_polling()
+        if settings.ASYNC_RUNTIME:
+            # import دیرهنگام: aiohttp و asyncpg فقط در حالت ناهمگام لازم هستند
+            from .bot.async_runtime import run_async_bot
+            asyncio.run(run_async_bot(bot))
+        elif settings.USE_WEBHOOK:
+            run_webhook(bot, settings)
+        else:
+            bot.infinity_polling()
     except KeyboardInterrupt:
         print("\n🛑bot stoped.")
+    finally:
+        bot.shutdown()
@@ -1,8 +1,13 @@
 from .product_model import Product
 from .sale_model import Sale
+from .rollup_model import SalesRollup, InventoryRollup
+from .conversation_state_model import ConversationState
 
 
 __all__ = [
     "Product",
     "Sale",
+    "SalesRollup",
+    "InventoryRollup",
+    "ConversationState",
 ]
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Text, DateTime
+from ..db.database import Base
+
+
+class ConversationState(Base):
+    """
+    وضعیت گفتگوی کاربران (backend دیتابیسی StateStore)
+    کلیدها به شکل state:{user_id} و data:{user_id} و مقدار JSON فشرده است
+    """
+
+    __tablename__ = "conversation_states"
+
+    key = Column(String(64), primary_key=True)
+    value = Column(Text, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..db.database import Base
+from ..utils.constants import LOW_STOCK_THRESHOLD
 
 
 class Product(Base):
@@ -14,3 +15,13 @@ class Product(Base):
 
     # relationship to sales
     sales = relationship("Sale", back_populates="product")
+
+    __table_args__ = (
+        # index جزئی برای محصولات کم‌موجود (فقط ردیف‌های زیر آستانه)
+        Index(
+            "ix_products_low_stock",
+            stock,
+            postgresql_where=stock <= LOW_STOCK_THRESHOLD,
+            sqlite_where=stock <= LOW_STOCK_THRESHOLD,
+        ),
+    )
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, Float, UniqueConstraint
+from ..db.database import Base
+
+
+class SalesRollup(Base):
+    """
+    جمع‌های از پیش محاسبه‌شده فروش
+    scope: total (کل) | product (به ازای محصول) | day (به ازای روز)
+    """
+
+    __tablename__ = "sales_rollups"
+    __table_args__ = (
+        UniqueConstraint("scope", "bucket", name="uq_sales_rollups_scope_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    scope = Column(String(16), nullable=False)
+    # کلید گروه: "" برای total، شناسه محصول برای product، YYYY-MM-DD برای day
+    bucket = Column(String(32), nullable=False, default="")
+
+    sale_count = Column(Integer, default=0, nullable=False)
+    total_quantity = Column(Integer, default=0, nullable=False)
+    total_revenue = Column(Float, default=0.0, nullable=False)
+    total_cost = Column(Float, default=0.0, nullable=False)
+    total_extra_cost = Column(Float, default=0.0, nullable=False)
+
+
+class InventoryRollup(Base):
+    """جمع‌های از پیش محاسبه‌شده موجودی (همیشه یک ردیف با id=1)"""
+
+    __tablename__ = "inventory_rollup"
+
+    id = Column(Integer, primary_key=True)
+    total_products = Column(Integer, default=0, nullable=False)
+    total_items = Column(Integer, default=0, nullable=False)
+    low_stock_count = Column(Integer, default=0, nullable=False)
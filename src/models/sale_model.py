@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, ForeignKey, DateTime, Index, String
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..db.database import Base
@@ -17,4 +17,14 @@ class Sale(Base):
     total_sale = Column(Float, nullable=False)
     total_cost = Column(Float, nullable=False)
     extra_cost = Column(Float, default=0.0)
+    # تاریخ فروش: روز شمسی واردشده (تبدیل‌شده به میلادی) یا زمان ثبت؛ فیلتر و مرتب‌سازی روی این ستون
     sale_date = Column(DateTime, default=datetime.utcnow)
+    # همان تاریخ به شمسی (YYYY/MM/DD) برای نمایش، بدون تبدیل در هر خواندن
+    jalali_date = Column(String(10), nullable=True)
+
+    __table_args__ = (
+        # صفحه‌بندی لیست فروش‌ها: ORDER BY sale_date DESC, id DESC
+        Index("ix_sales_sale_date_id", sale_date.desc(), id.desc()),
+        # گزارش‌های یک محصول: WHERE product_id = ... (مرتب بر اساس تاریخ)
+        Index("ix_sales_product_id_sale_date", product_id, sale_date),
+    )
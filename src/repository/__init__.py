@@ -1,29 +1,58 @@
 from .product_repository import ProductRepository
 from .sale_repository import SaleRepository
+from .rollup_repository import RollupRepository
 from .dependencies import (
     get_db,
+    session_scope,
     get_product_repository,
     get_sale_repository,
     RepositoryManager,
 )
+from .data_version import DataVersion, data_version
+from .product_cache import ProductCache, MemoryCacheBackend, RedisCacheBackend, create_product_cache
 from .data_manager_adapter import DataManagerAdapter
 from .converters import (
     product_to_dict,
     sale_to_dict,
     products_to_dict_list,
     sales_to_dict_list,
+    product_to_view,
+    sale_to_view,
+    products_to_views,
+    sales_to_views,
+    product_rows_to_views,
+    sale_rows_to_views,
+    sale_report_rows_to_views,
 )
+from .dto import ProductView, SaleView
 
 __all__ = [
     "ProductRepository",
     "SaleRepository",
+    "RollupRepository",
     "get_db",
+    "session_scope",
     "get_product_repository",
     "get_sale_repository",
     "RepositoryManager",
+    "DataVersion",
+    "data_version",
+    "ProductCache",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    "create_product_cache",
     "DataManagerAdapter",
     "product_to_dict",
     "sale_to_dict",
     "products_to_dict_list",
     "sales_to_dict_list",
+    "product_to_view",
+    "sale_to_view",
+    "products_to_views",
+    "sales_to_views",
+    "product_rows_to_views",
+    "sale_rows_to_views",
+    "sale_report_rows_to_views",
+    "ProductView",
+    "SaleView",
 ]
@@ -0,0 +1,16 @@
+# لایه دسترسی ناهمگام به داده‌ها (AsyncSession + asyncpg)
+# فقط در حالت ASYNC_RUNTIME import می‌شود
+from .product_repository import AsyncProductRepository
+from .sale_repository import AsyncSaleRepository
+from .rollup_repository import AsyncRollupRepository
+from .dependencies import async_session_scope, AsyncRepositoryManager
+from .data_manager_adapter import AsyncDataManagerAdapter
+
+__all__ = [
+    "AsyncProductRepository",
+    "AsyncSaleRepository",
+    "AsyncRollupRepository",
+    "async_session_scope",
+    "AsyncRepositoryManager",
+    "AsyncDataManagerAdapter",
+]
@@ -0,0 +1,63 @@
+"""
+Adapter ناهمگام با همان interface خواندنی DataManagerAdapter
+"""
+
+from .dependencies import AsyncRepositoryManager
+from ..converters import (
+    product_rows_to_views,
+    sale_rows_to_views,
+)
+
+
+class AsyncDataManagerAdapter:
+    """
+    نسخه ناهمگام DataManagerAdapter برای صفحه‌های نمایشی و گزارش‌ها
+    """
+
+    def __init__(self):
+        self.repo_manager = AsyncRepositoryManager()
+        self.product_repo = self.repo_manager.product_repo
+        self.sale_repo = self.repo_manager.sale_repo
+        self.rollup_repo = self.repo_manager.rollup_repo
+
+    # ============ عملیات محصولات ============
+
+    async def get_all_products(self):
+        """دریافت تمام محصولات"""
+        products = await self.product_repo.get_all()
+        return product_rows_to_views(products)
+
+    async def get_products_page(self, page=1, per_page=5, only_available=False, cursor=None, direction=None):
+        """دریافت یک صفحه از محصولات (صفحه‌بندی در دیتابیس، keyset در صورت وجود cursor)"""
+        result = await self.product_repo.get_page(page, per_page, only_available, cursor, direction)
+        result["items"] = product_rows_to_views(result["items"])
+        return result
+
+    async def count_products(self, only_available=False):
+        """شمارش محصولات"""
+        return await self.product_repo.count(only_available)
+
+    async def get_inventory_summary(self):
+        """دریافت خلاصه موجودی (از rollup، یک ردیف)"""
+        return await self.rollup_repo.get_inventory_totals()
+
+    async def get_low_stock_products(self, low_stock_threshold):
+        """دریافت محصولات کم‌موجود"""
+        products = await self.product_repo.get_low_stock(low_stock_threshold)
+        return product_rows_to_views(products)
+
+    # ============ عملیات فروش‌ها ============
+
+    async def get_sales_page(self, page=1, per_page=5, cursor=None, direction=None):
+        """دریافت یک صفحه از فروش‌ها (صفحه‌بندی در دیتابیس، keyset در صورت وجود cursor)"""
+        result = await self.sale_repo.get_page(page, per_page, cursor, direction)
+        result["items"] = sale_rows_to_views(result["items"])
+        return result
+
+    async def get_sales_summary(self):
+        """دریافت خلاصه فروش‌ها (از rollup، یک ردیف)"""
+        return await self.rollup_repo.get_sales_totals()
+
+    async def close(self):
+        """بستن اتصالات"""
+        await self.repo_manager.close()
@@ -0,0 +1,43 @@
+"""
+مدیریت AsyncSession دیتابیس برای runtime ناهمگام
+"""
+
+from contextlib import asynccontextmanager
+from ...db.async_database import AsyncScopedSession, current_update_scope
+from .product_repository import AsyncProductRepository
+from .sale_repository import AsyncSaleRepository
+from .rollup_repository import AsyncRollupRepository
+
+
+@asynccontextmanager
+async def async_session_scope():
+    """
+    Unit of work ناهمگام برای پردازش یک آپدیت
+
+    تمام Repository های ناهمگام داخل این scope (و task هایی که از آن ساخته می‌شوند)
+    از یک AsyncSession استفاده می‌کنند. Session فقط در صورت استفاده ساخته می‌شود
+    و در پایان بسته شده و اتصالش (با rollback تراکنش باز) به pool برمی‌گردد.
+    """
+    token = current_update_scope.set(object())
+    try:
+        yield
+    finally:
+        await AsyncScopedSession.remove()
+        current_update_scope.reset(token)
+
+
+class AsyncRepositoryManager:
+    """
+    مدیریت کننده Repository های ناهمگام با Session مشترک
+    Session از رجیستری AsyncScopedSession گرفته می‌شود، پس هر آپدیت Session مستقل خودش را دارد
+    """
+
+    def __init__(self):
+        self.db = AsyncScopedSession
+        self.product_repo = AsyncProductRepository(self.db)
+        self.sale_repo = AsyncSaleRepository(self.db)
+        self.rollup_repo = AsyncRollupRepository(self.db)
+
+    async def close(self):
+        """بستن Session"""
+        await self.db.close()
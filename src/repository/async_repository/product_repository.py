@@ -0,0 +1,127 @@
+"""
+Repository ناهمگام (AsyncSession) برای خواندن محصولات
+"""
+
+from sqlalchemy import Row, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from ...models.product_model import Product
+from ...utils.pagination import get_page_bounds, decode_cursor, keyset_cursors, CURSOR_PREV
+from .rollup_repository import AsyncRollupRepository
+from ..product_repository import PRODUCT_LIST_COLUMNS, product_sort_key, seek_products
+
+
+class AsyncProductRepository:
+    """Repository ناهمگام برای کوئری‌های خواندنی محصولات"""
+
+    def __init__(self, db: AsyncSession):
+        """
+        Args:
+            db: AsyncSession دیتابیس SQLAlchemy
+        """
+        self.db = db
+        self.rollup = AsyncRollupRepository(db)
+
+    async def get_by_id(self, product_id: int) -> Optional[Product]:
+        """
+        دریافت محصول با شناسه
+
+        Args:
+            product_id: شناسه محصول
+
+        Returns:
+            Product یا None
+        """
+        return await self.db.get(Product, product_id)
+
+    async def get_all(self) -> List[Row]:
+        """
+        دریافت تمام محصولات (ردیف‌های سبک id, name, stock)
+
+        Returns:
+            لیست ردیف‌های محصولات
+        """
+        result = await self.db.execute(select(*PRODUCT_LIST_COLUMNS).order_by(Product.id))
+        return list(result)
+
+    async def get_low_stock(self, threshold: int) -> List[Row]:
+        """
+        دریافت محصولات کم‌موجود (موجودی بین 1 و آستانه)، ردیف‌های سبک id, name, stock
+
+        Args:
+            threshold: آستانه کم‌موجودی
+
+        Returns:
+            لیست ردیف‌های محصولات کم‌موجود
+        """
+        result = await self.db.execute(
+            select(*PRODUCT_LIST_COLUMNS)
+            .where(Product.stock > 0, Product.stock <= threshold)
+            .order_by(Product.id)
+        )
+        return list(result)
+
+    async def count(self, only_available: bool = False) -> int:
+        """
+        شمارش محصولات
+
+        Args:
+            only_available: فقط محصولات با موجودی بیشتر از صفر
+
+        Returns:
+            تعداد محصولات
+        """
+        query = select(func.count(Product.id))
+        if only_available:
+            query = query.where(Product.stock > 0)
+        return await self.db.scalar(query)
+
+    async def get_page(
+        self,
+        page: int = 1,
+        per_page: int = 5,
+        only_available: bool = False,
+        cursor: str = None,
+        direction: str = None,
+    ) -> dict:
+        """
+        دریافت یک صفحه از محصولات (keyset با cursor، در غیر این صورت LIMIT/OFFSET)
+
+        Args:
+            page: شماره صفحه
+            per_page: تعداد آیتم در هر صفحه
+            only_available: فقط محصولات با موجودی بیشتر از صفر
+            cursor: کلید مرزی صفحه مجاور
+            direction: CURSOR_NEXT یا CURSOR_PREV
+
+        Returns:
+            دیکشنری شامل: items (ردیف‌های سبک id, name, stock), page, total_pages, total_items,
+            prev_cursor, next_cursor
+        """
+        if only_available:
+            total_items = await self.count(only_available=True)
+        else:
+            # تعداد کل محصولات از rollup موجودی (یک ردیف) به جای COUNT روی کل جدول
+            total_items = (await self.rollup.get_inventory_totals())["total_products"]
+        page, total_pages, offset = get_page_bounds(total_items, page, per_page)
+
+        query = select(*PRODUCT_LIST_COLUMNS)
+        if only_available:
+            query = query.where(Product.stock > 0)
+
+        items = []
+        key = decode_cursor(cursor, 1)
+        if key is not None:
+            items = list(await self.db.execute(seek_products(query, key, direction).limit(per_page)))
+            if direction == CURSOR_PREV:
+                items.reverse()
+        if not items:
+            items = list(await self.db.execute(query.order_by(Product.id).offset(offset).limit(per_page)))
+
+        return {
+            "items": items,
+            "page": page,
+            "total_pages": total_pages,
+            "total_items": total_items,
+            **keyset_cursors(items, page, total_pages, product_sort_key),
+        }
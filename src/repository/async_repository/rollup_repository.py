@@ -0,0 +1,56 @@
+"""
+Repository ناهمگام (AsyncSession) برای خواندن rollup های فروش و موجودی
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from ...models.rollup_model import SalesRollup, InventoryRollup
+from ..rollup_repository import (
+    SCOPE_TOTAL,
+    SCOPE_PRODUCT,
+    INVENTORY_ROW_ID,
+    sales_row_to_dict,
+    inventory_row_to_dict,
+)
+
+
+class AsyncRollupRepository:
+    """Repository ناهمگام برای خواندن rollup ها"""
+
+    def __init__(self, db: AsyncSession):
+        """
+        Args:
+            db: AsyncSession دیتابیس SQLAlchemy
+        """
+        self.db = db
+
+    async def get_sales_totals(self) -> dict:
+        """
+        دریافت جمع کل فروش‌ها از rollup
+
+        Returns:
+            دیکشنری شامل: total_sales, total_revenue, total_cost, total_extra_cost
+        """
+        row = await self.db.scalar(
+            select(SalesRollup).where(SalesRollup.scope == SCOPE_TOTAL, SalesRollup.bucket == "")
+        )
+        return sales_row_to_dict(row)
+
+    async def get_product_totals(self, product_id: int) -> dict:
+        """دریافت جمع فروش‌های یک محصول از rollup"""
+        row = await self.db.scalar(
+            select(SalesRollup).where(
+                SalesRollup.scope == SCOPE_PRODUCT,
+                SalesRollup.bucket == str(product_id),
+            )
+        )
+        return sales_row_to_dict(row)
+
+    async def get_inventory_totals(self) -> dict:
+        """
+        دریافت خلاصه موجودی از rollup
+
+        Returns:
+            دیکشنری شامل: total_products, total_items, low_stock_count
+        """
+        return inventory_row_to_dict(await self.db.get(InventoryRollup, INVENTORY_ROW_ID))
@@ -0,0 +1,90 @@
+"""
+Repository ناهمگام (AsyncSession) برای خواندن فروش‌ها
+"""
+
+from sqlalchemy import select, desc, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from typing import Optional
+from ...models.product_model import Product
+from ...models.sale_model import Sale
+from ...utils.pagination import get_page_bounds, decode_cursor, keyset_cursors, CURSOR_PREV
+from .rollup_repository import AsyncRollupRepository
+from ..sale_repository import SALE_LIST_COLUMNS, sale_sort_key, seek_sales
+
+
+class AsyncSaleRepository:
+    """Repository ناهمگام برای کوئری‌های خواندنی فروش‌ها"""
+
+    def __init__(self, db: AsyncSession):
+        """
+        Args:
+            db: AsyncSession دیتابیس SQLAlchemy
+        """
+        self.db = db
+        self.rollup = AsyncRollupRepository(db)
+
+    async def get_by_id(self, sale_id: int) -> Optional[Sale]:
+        """
+        دریافت فروش با شناسه (همراه با محصول)
+
+        Args:
+            sale_id: شناسه فروش
+
+        Returns:
+            Sale یا None
+        """
+        # lazy load در AsyncSession ممکن نیست؛ محصول همراه فروش بارگذاری می‌شود
+        return await self.db.scalar(
+            select(Sale).options(joinedload(Sale.product)).where(Sale.id == sale_id)
+        )
+
+    async def count(self) -> int:
+        """
+        شمارش فروش‌ها
+
+        Returns:
+            تعداد فروش‌ها
+        """
+        return await self.db.scalar(select(func.count(Sale.id)))
+
+    async def get_page(self, page: int = 1, per_page: int = 5, cursor: str = None, direction: str = None) -> dict:
+        """
+        دریافت یک صفحه از فروش‌ها (از جدید به قدیم)؛ keyset با cursor، در غیر این صورت LIMIT/OFFSET
+
+        Args:
+            page: شماره صفحه
+            per_page: تعداد آیتم در هر صفحه
+            cursor: کلید مرزی صفحه مجاور
+            direction: CURSOR_NEXT یا CURSOR_PREV
+
+        Returns:
+            دیکشنری شامل: items (ردیف‌های سبک SALE_LIST_COLUMNS), page, total_pages, total_items,
+            prev_cursor, next_cursor
+        """
+        # تعداد کل فروش‌ها از rollup کل (یک ردیف) به جای COUNT روی کل جدول
+        total_items = (await self.rollup.get_sales_totals())["total_sales"]
+        page, total_pages, offset = get_page_bounds(total_items, page, per_page)
+
+        query = select(*SALE_LIST_COLUMNS).outerjoin(Product, Sale.product_id == Product.id)
+
+        items = []
+        key = decode_cursor(cursor, 2)
+        if key is not None:
+            items = list(await self.db.execute(seek_sales(query, key, direction).limit(per_page)))
+            if direction == CURSOR_PREV:
+                items.reverse()
+        if not items:
+            items = list(await self.db.execute(
+                query.order_by(desc(Sale.sale_date), desc(Sale.id))
+                .offset(offset)
+                .limit(per_page)
+            ))
+
+        return {
+            "items": items,
+            "page": page,
+            "total_pages": total_pages,
+            "total_items": total_items,
+            **keyset_cursors(items, page, total_pages, sale_sort_key),
+        }
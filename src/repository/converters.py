@@ -1,86 +1,142 @@
 """
-توابع تبدیل models به dictionary
+توابع تبدیل models و ردیف‌های کوئری به DTO های ProductView / SaleView
 """
 
 from ..models.product_model import Product
 from ..models.sale_model import Sale
+from .dto import ProductView, SaleView
 
 
-def product_to_dict(product: Product) -> dict:
+# نام محصول برای فروش‌هایی که محصولشان حذف شده است
+UNKNOWN_PRODUCT_NAME = "نامشخص"
+
+
+def product_to_view(product: Product) -> ProductView:
     """
-    تبدیل Product model به dictionary
+    تبدیل Product model به ProductView
 
     Args:
         product: Product instance
 
     Returns:
-        dictionary شامل اطلاعات محصول
+        ProductView یا None
     """
     if not product:
         return None
-
-    return {
-        "id": product.id,
-        "name": product.name,
-        "quantity": product.stock,
-        "stock": product.stock,
-        "created_at": product.created_at,
-    }
+    return ProductView(product.id, product.name, product.stock, product.created_at)
 
 
-def sale_to_dict(sale: Sale) -> dict:
+def sale_to_view(sale: Sale) -> SaleView:
     """
-    تبدیل Sale model به dictionary
+    تبدیل Sale model به SaleView (محصول باید همراه فروش load شده باشد)
 
     Args:
         sale: Sale instance
 
     Returns:
-        dictionary شامل اطلاعات فروش
+        SaleView یا None
     """
     if not sale:
         return None
-    
-    # بررسی اینکه sale واقعاً یک Sale object است
-    if not hasattr(sale, 'total_sale'):
-        return None
-    
-    try:
-        # اگر محصول وجود ندارد، نام را "نامشخص" قرار بده
-        product_name = "نامشخص"
-        try:
-            if sale.product:
-                product_name = sale.product.name
-        except Exception:
-            # اگر lazy loading خطا داد، نام را "نامشخص" بگذار
-            pass
-
-        net_profit = sale.total_sale - sale.total_cost - (sale.extra_cost or 0)
-        sale_price = sale.total_sale / sale.quantity if sale.quantity > 0 else 0
-
-        return {
-            "id": sale.id,
-            "product_id": sale.product_id,
-            "product_name": product_name,
-            "quantity": sale.quantity,
-            "sale_price": sale_price,
-            "total_sale_price": sale.total_sale,
-            "total_cost": sale.total_cost,
-            "extra_cost": sale.extra_cost or 0,
-            "net_profit": net_profit,
-            "date": sale.sale_date.strftime("%Y/%m/%d") if sale.sale_date else "",
-            "sale_date": sale.sale_date,
-        }
-    except Exception as e:
-        print(f"Error in sale_to_dict: {e}")
-        return None
+    product = sale.product
+    return SaleView(
+        sale.id,
+        sale.product_id,
+        product.name if product is not None else UNKNOWN_PRODUCT_NAME,
+        sale.sale_date,
+        sale.quantity,
+        sale.total_sale,
+        sale.total_cost,
+        sale.extra_cost or 0,
+        sale.jalali_date,
+    )
+
+
+def products_to_views(products: list) -> list:
+    """تبدیل لیست Product models به لیست ProductView در یک گذر"""
+    view = ProductView
+    return [view(p.id, p.name, p.stock, p.created_at) for p in products if p]
+
+
+def sales_to_views(sales: list) -> list:
+    """تبدیل لیست Sale models به لیست SaleView در یک گذر"""
+    view = SaleView
+    unknown = UNKNOWN_PRODUCT_NAME
+    return [
+        view(
+            s.id,
+            s.product_id,
+            s.product.name if s.product is not None else unknown,
+            s.sale_date,
+            s.quantity,
+            s.total_sale,
+            s.total_cost,
+            s.extra_cost or 0,
+            s.jalali_date,
+        )
+        for s in sales
+        if s
+    ]
+
+
+def product_rows_to_views(rows: list) -> list:
+    """تبدیل ردیف‌های سبک محصول (PRODUCT_LIST_COLUMNS) به لیست ProductView"""
+    view = ProductView
+    return [view(row.id, row.name, row.stock) for row in rows]
+
+
+def sale_rows_to_views(rows: list) -> list:
+    """
+    تبدیل ردیف‌های سبک فروش (SALE_LIST_COLUMNS) به لیست SaleView
+    فیلدهای مبلغ در این ردیف‌ها وجود ندارند و None می‌مانند
+    """
+    view = SaleView
+    unknown = UNKNOWN_PRODUCT_NAME
+    return [
+        view(row.id, row.product_id, row.product_name or unknown, row.sale_date, jalali_date=row.jalali_date)
+        for row in rows
+    ]
+
+
+def sale_report_rows_to_views(rows: list) -> list:
+    """تبدیل ردیف‌های گزارش فروش (SALE_REPORT_COLUMNS، همراه با مبالغ) به لیست SaleView"""
+    view = SaleView
+    unknown = UNKNOWN_PRODUCT_NAME
+    return [
+        view(
+            row.id,
+            row.product_id,
+            row.product_name or unknown,
+            row.sale_date,
+            row.quantity,
+            row.total_sale,
+            row.total_cost,
+            row.extra_cost or 0,
+            row.jalali_date,
+        )
+        for row in rows
+    ]
+
+
+# ============ سازگاری با کدهای قدیمی (خروجی dict) ============
+
+def product_to_dict(product: Product) -> dict:
+    """تبدیل Product model به dictionary"""
+    view = product_to_view(product)
+    return view.to_dict() if view else None
+
+
+def sale_to_dict(sale: Sale) -> dict:
+    """تبدیل Sale model به dictionary"""
+    view = sale_to_view(sale)
+    return view.to_dict() if view else None
 
 
 def products_to_dict_list(products: list) -> list:
     """تبدیل لیست Product models به لیست dictionaries"""
-    return [product_to_dict(p) for p in products if p]
+    return [view.to_dict() for view in products_to_views(products)]
 
 
 def sales_to_dict_list(sales: list) -> list:
     """تبدیل لیست Sale models به لیست dictionaries"""
-    return [sale_to_dict(s) for s in sales if s]
+    return [view.to_dict() for view in sales_to_views(sales)]
@@ -3,12 +3,25 @@ Adapter برای تبدیل Repository به interface مشابه DataManager
 این کلاس به عنوان یک Adapter عمل می‌کند تا کدهای موجود بدون تغییر زیاد کار کنند
 """
 
+from datetime import date, datetime, time
+
 from ..repository import RepositoryManager
 from ..repository.converters import (
-    product_to_dict,
-    sale_to_dict,
-    products_to_dict_list,
-    sales_to_dict_list,
+    product_to_view,
+    sale_to_view,
+    sales_to_views,
+    product_rows_to_views,
+    sale_rows_to_views,
+    sale_report_rows_to_views,
+)
+from ..repository.data_version import data_version
+from ..repository.rollup_repository import sales_row_to_dict
+from ..utils.jalali import to_jalali
+from ..repository.product_cache import (
+    create_product_cache,
+    product_key,
+    ALL_PRODUCTS_KEY,
+    AVAILABLE_PRODUCTS_KEY,
 )
 
 
@@ -21,27 +34,74 @@ class DataManagerAdapter:
         self.repo_manager = RepositoryManager()
         self.product_repo = self.repo_manager.product_repo
         self.sale_repo = self.repo_manager.sale_repo
+        self.rollup_repo = self.repo_manager.rollup_repo
+        self.product_cache = create_product_cache()
+
+    def _after_write(self, *product_ids):
+        """بی‌اعتبار کردن کش محصولات داده‌شده و افزایش نسخه داده‌ها بعد از هر تغییر"""
+        self.product_cache.invalidate_products(*product_ids)
+        data_version.bump()
 
     # ============ عملیات محصولات ============
 
     def add_product(self, name, quantity):
         """افزودن محصول جدید"""
         product, is_created = self.product_repo.create(name, int(quantity))
+        self._after_write(product.id)
         return {
             'product_id': product.id,
             'is_created': is_created,
             'current_stock': product.stock
         }
 
+    def upsert_products(self, stocks):
+        """
+        ایجاد یا به‌روزرسانی گروهی محصولات (یک تراکنش برای هر دسته)
+
+        Returns:
+            دیکشنری شامل: created, updated, product_ids
+        """
+        result = self.product_repo.upsert_many(stocks)
+        self._after_write(*result['product_ids'])
+        return result
+
+    def iter_product_batches(self, batch_size):
+        """خواندن دسته‌ای تمام محصولات (لیست ProductView برای هر دسته)"""
+        for rows in self.product_repo.iter_batches(batch_size):
+            yield product_rows_to_views(rows)
+
     def get_all_products(self):
-        """دریافت تمام محصولات"""
-        products = self.product_repo.get_all()
-        return products_to_dict_list(products)
+        """دریافت تمام محصولات (از کش)"""
+        return self.product_cache.get_or_load(
+            ALL_PRODUCTS_KEY,
+            lambda: product_rows_to_views(self.product_repo.get_all()),
+        )
+
+    def get_products_page(self, page=1, per_page=5, only_available=False, cursor=None, direction=None):
+        """دریافت یک صفحه از محصولات (صفحه‌بندی در دیتابیس، keyset در صورت وجود cursor)"""
+        result = self.product_repo.get_page(page, per_page, only_available, cursor, direction)
+        result["items"] = product_rows_to_views(result["items"])
+        return result
+
+    def count_products(self, only_available=False):
+        """شمارش محصولات"""
+        return self.product_repo.count(only_available)
+
+    def get_inventory_summary(self):
+        """دریافت خلاصه موجودی (از rollup، یک ردیف)"""
+        return self.rollup_repo.get_inventory_totals()
+
+    def get_low_stock_products(self, low_stock_threshold):
+        """دریافت محصولات کم‌موجود"""
+        products = self.product_repo.get_low_stock(low_stock_threshold)
+        return product_rows_to_views(products)
 
     def get_product(self, product_id):
-        """دریافت یک محصول"""
-        product = self.product_repo.get_by_id(product_id)
-        return product_to_dict(product)
+        """دریافت یک محصول (از کش)"""
+        return self.product_cache.get_or_load(
+            product_key(product_id),
+            lambda: product_to_view(self.product_repo.get_by_id(product_id)),
+        )
 
     def get_by_id(self, product_id):
         """دریافت محصول با ID (برای سازگاری با ProductValidator)"""
@@ -50,15 +110,24 @@ class DataManagerAdapter:
 
     def update_product_name(self, product_id, new_name):
         """به‌روزرسانی نام محصول"""
-        return self.product_repo.update_name(product_id, new_name)
+        try:
+            return self.product_repo.update_name(product_id, new_name)
+        finally:
+            self._after_write(product_id)
 
     def update_product_quantity(self, product_id, new_quantity):
         """به‌روزرسانی موجودی محصول"""
-        return self.product_repo.update_stock(product_id, int(new_quantity))
+        try:
+            return self.product_repo.update_stock(product_id, int(new_quantity))
+        finally:
+            self._after_write(product_id)
 
     def delete_product(self, product_id):
         """حذف محصول"""
-        return self.product_repo.delete(product_id)
+        try:
+            return self.product_repo.delete(product_id)
+        finally:
+            self._after_write(product_id)
 
     def get_products_text(self):
         """دریافت لیست محصولات به صورت متن"""
@@ -82,18 +151,163 @@ class DataManagerAdapter:
             total_sale=sale_data["total_sale_price"],
             total_cost=sale_data["total_cost"],
             extra_cost=sale_data.get("extra_cost", 0.0),
+            sale_date=sale_data.get("sale_date"),
+            jalali_date=sale_data.get("date"),
         )
+        data_version.bump()
         return sale.id
 
+    def add_sale_with_stock(self, sale_data):
+        """
+        کم کردن موجودی و ثبت فروش در یک تراکنش
+
+        Returns:
+            دیکشنری شامل: sale_id, remaining_stock؛ یا None اگر موجودی کافی نبود
+        """
+        try:
+            remaining_stock = self.product_repo.decrement_stock(
+                sale_data["product_id"], sale_data["quantity"]
+            )
+            if remaining_stock is None:
+                self.repo_manager.rollback()
+                return None
+
+            sale = self.sale_repo.create(
+                product_id=sale_data["product_id"],
+                quantity=sale_data["quantity"],
+                total_sale=sale_data["total_sale_price"],
+                total_cost=sale_data["total_cost"],
+                extra_cost=sale_data.get("extra_cost", 0.0),
+                sale_date=sale_data.get("sale_date"),
+                jalali_date=sale_data.get("date"),
+                commit=False,
+            )
+            sale_id = sale.id
+            self.repo_manager.commit()
+        except Exception:
+            self.repo_manager.rollback()
+            raise
+        finally:
+            self._after_write(sale_data["product_id"])
+
+        return {'sale_id': sale_id, 'remaining_stock': remaining_stock}
+
+    def add_sales_with_stock_bulk(self, sales):
+        """
+        ثبت گروهی فروش‌ها در یک تراکنش: جمع تعداد هر محصول با یک UPDATE از موجودی کم
+        و تمام فروش‌ها با یک INSERT چندردیفی ثبت می‌شوند
+
+        Returns:
+            دیکشنری شامل: created, remaining_stock (شناسه محصول -> موجودی)؛
+            یا None اگر موجودی یکی از محصولات (به خاطر تغییر هم‌زمان) کافی نبود
+        """
+        quantities = {}
+        for sale in sales:
+            quantities[sale["product_id"]] = quantities.get(sale["product_id"], 0) + sale["quantity"]
+
+        try:
+            remaining_stock = self.product_repo.decrement_stocks(quantities)
+            if len(remaining_stock) != len(quantities):
+                self.repo_manager.rollback()
+                return None
+
+            # فروش‌های بدون تاریخ: زمان ثبت (یک بار برای کل دسته تبدیل می‌شود)
+            now = datetime.utcnow()
+            today = str(to_jalali(now))
+            created = self.sale_repo.create_many([
+                {
+                    "product_id": sale["product_id"],
+                    "quantity": sale["quantity"],
+                    "total_sale": sale["total_sale_price"],
+                    "total_cost": sale["total_cost"],
+                    "extra_cost": sale.get("extra_cost", 0.0),
+                    "sale_date": sale.get("sale_date") or now,
+                    "jalali_date": sale.get("date") if sale.get("sale_date") else today,
+                }
+                for sale in sales
+            ])
+            self.repo_manager.commit()
+        except Exception:
+            self.repo_manager.rollback()
+            raise
+        finally:
+            self._after_write(*quantities)
+
+        return {'created': created, 'remaining_stock': remaining_stock}
+
     def get_all_sales(self):
         """دریافت تمام فروش‌ها"""
         sales = self.sale_repo.get_all(order_by_date=True)
-        return sales_to_dict_list(sales)
+        return sales_to_views(sales)
+
+    def iter_sale_batches(self, batch_size):
+        """خواندن جریانی تمام فروش‌ها همراه با مبالغ (لیست SaleView برای هر دسته)"""
+        for rows in self.sale_repo.iter_report_rows(batch_size):
+            yield sale_report_rows_to_views(rows)
+
+    def get_sales_page(self, page=1, per_page=5, cursor=None, direction=None):
+        """دریافت یک صفحه از فروش‌ها (صفحه‌بندی در دیتابیس، keyset در صورت وجود cursor)"""
+        result = self.sale_repo.get_page(page, per_page, cursor, direction)
+        result["items"] = sale_rows_to_views(result["items"])
+        return result
+
+    def get_sales_summary(self):
+        """دریافت خلاصه فروش‌ها (از rollup، یک ردیف)"""
+        return self.rollup_repo.get_sales_totals()
+
+    def get_daily_sales_totals(self, start, end, product_id=None):
+        """
+        جمع فروش‌ها به ازای روز در بازه [start, end) (تاریخ‌های میلادی)
+        کل فروشگاه از rollup روزانه و یک محصول با GROUP BY روی (product_id, sale_date)
+
+        Returns:
+            لیست (date, دیکشنری جمع‌ها) به ترتیب روز؛ روزهای بدون فروش حذف شده‌اند
+        """
+        if product_id is None:
+            rows = self.rollup_repo.get_day_totals(start.isoformat(), end.isoformat())
+            return [(date.fromisoformat(row.bucket), sales_row_to_dict(row)) for row in rows]
+
+        rows = self.sale_repo.get_totals_by_day(
+            datetime.combine(start, time.min), datetime.combine(end, time.min), product_id
+        )
+        # date() در PostgreSQL نوع date و در SQLite رشته برمی‌گرداند
+        return [
+            (row.day if isinstance(row.day, date) else date.fromisoformat(row.day), sales_row_to_dict(row))
+            for row in rows
+        ]
+
+    def get_product_sales_totals_page(self, start=None, end=None, page=1, per_page=10):
+        """
+        جمع فروش هر محصول در بازه [start, end) (تاریخ‌های میلادی، None = بدون مرز) مرتب بر اساس سود
+
+        Returns:
+            دیکشنری شامل: items (دیکشنری‌های product_id, product_name و جمع‌ها), page, total_pages, total_items
+        """
+        result = self.sale_repo.get_product_totals_page(
+            datetime.combine(start, time.min) if start else None,
+            datetime.combine(end, time.min) if end else None,
+            page,
+            per_page,
+        )
+        result["items"] = [
+            {"product_id": row.product_id, "product_name": row.product_name, **sales_row_to_dict(row)}
+            for row in result["items"]
+        ]
+        return result
+
+    def get_product_sales_totals(self, product_id):
+        """جمع فروش‌های یک محصول (از rollup، یک ردیف)"""
+        return self.rollup_repo.get_product_totals(product_id)
+
+    def rebuild_rollups(self):
+        """محاسبه دوباره rollup ها از روی داده‌های اصلی"""
+        self.rollup_repo.rebuild()
+        data_version.bump()
 
     def get_sale(self, sale_id):
         """دریافت یک فروش"""
         sale = self.sale_repo.get_by_id(sale_id)
-        return sale_to_dict(sale)
+        return sale_to_view(sale)
 
     def get_sale_by_id(self, sale_id):
         """دریافت فروش با ID (برای سازگاری با SaleValidator)"""
@@ -102,6 +316,70 @@ class DataManagerAdapter:
 
     def update_sale(self, sale_id, sale_data):
         """به‌روزرسانی فروش"""
+        try:
+            return self.sale_repo.update(sale_id, **self._sale_update_params(sale_data))
+        finally:
+            data_version.bump()
+
+    def update_sale_with_stock(self, sale_id, sale_data):
+        """
+        به‌روزرسانی فروش و اعمال تفاوت تعداد روی موجودی محصول در یک تراکنش
+
+        Returns:
+            دیکشنری شامل: success (bool), error (None | "not_found" | "insufficient_stock")
+        """
+        # محصولاتی که موجودی‌شان ممکن است تغییر کند (برای invalidate کش)
+        touched_products = []
+        try:
+            # قفل ردیف فروش تا ویرایش/حذف هم‌زمان همان فروش تعداد قدیمی را دوباره روی موجودی اعمال نکند
+            sale = self.sale_repo.get_by_id(sale_id, for_update=True)
+            if sale is None:
+                return {'success': False, 'error': 'not_found'}
+
+            old_product_id, old_quantity = sale.product_id, sale.quantity
+            new_product_id = sale_data.get("product_id") or old_product_id
+            touched_products = [old_product_id, new_product_id]
+            new_quantity = sale_data.get("quantity") or old_quantity
+
+            if new_product_id == old_product_id:
+                # همان محصول: فقط تفاوت تعداد از موجودی کم/به آن اضافه می‌شود
+                stock_ok = self._apply_stock_delta(old_product_id, new_quantity - old_quantity)
+            else:
+                if old_product_id is not None:
+                    self.product_repo.increment_stock(old_product_id, old_quantity)
+                stock_ok = self._apply_stock_delta(new_product_id, new_quantity)
+
+            if not stock_ok:
+                self.repo_manager.rollback()
+                return {'success': False, 'error': 'insufficient_stock'}
+
+            self.sale_repo.update(sale_id, commit=False, **self._sale_update_params(sale_data))
+            self.repo_manager.commit()
+        except Exception:
+            self.repo_manager.rollback()
+            raise
+        finally:
+            self._after_write(*touched_products)
+
+        return {'success': True, 'error': None}
+
+    def _apply_stock_delta(self, product_id, sold_delta):
+        """
+        اعمال تغییر تعداد فروخته‌شده روی موجودی (بدون commit)
+
+        Returns:
+            False اگر برای افزایش فروش موجودی کافی نبود
+        """
+        if product_id is None or not sold_delta:
+            return True
+        if sold_delta > 0:
+            return self.product_repo.decrement_stock(product_id, sold_delta) is not None
+        self.product_repo.increment_stock(product_id, -sold_delta)
+        return True
+
+    @staticmethod
+    def _sale_update_params(sale_data):
+        """تبدیل کلیدهای sale_data به پارامترهای SaleRepository.update"""
         # فقط پارامترهایی که در sale_data وجود دارند و None نیستند را ارسال کن
         update_params = {}
         
@@ -115,58 +393,105 @@ class DataManagerAdapter:
             update_params["total_cost"] = sale_data["total_cost"]
         if "extra_cost" in sale_data and sale_data["extra_cost"] is not None:
             update_params["extra_cost"] = sale_data["extra_cost"]
+        if sale_data.get("sale_date") is not None:
+            update_params["sale_date"] = sale_data["sale_date"]
+            update_params["jalali_date"] = sale_data.get("date")
         
-        return self.sale_repo.update(sale_id, **update_params)
+        return update_params
 
     def delete_sale(self, sale_id):
         """حذف فروش"""
-        return self.sale_repo.delete(sale_id)
+        try:
+            return self.sale_repo.delete(sale_id)
+        finally:
+            data_version.bump()
+
+    def delete_sale_with_stock(self, sale_id):
+        """
+        حذف فروش و بازگرداندن تعداد آن به موجودی محصول (با product_id) در یک تراکنش
+
+        Returns:
+            فروش حذف‌شده (SaleView) یا None اگر فروش وجود نداشت
+        """
+        product_id = None
+        try:
+            # قفل ردیف فروش تا ویرایش/حذف هم‌زمان همان فروش تعداد قدیمی را دوباره روی موجودی اعمال نکند
+            sale = self.sale_repo.get_by_id(sale_id, for_update=True)
+            if sale is None:
+                return None
+
+            deleted_sale = sale_to_view(sale)
+            product_id = sale.product_id
+            if product_id is not None:
+                self.product_repo.increment_stock(product_id, sale.quantity)
+            self.sale_repo.delete(sale_id, commit=False)
+            self.repo_manager.commit()
+        except Exception:
+            self.repo_manager.rollback()
+            raise
+        finally:
+            self._after_write(product_id)
+
+        return deleted_sale
 
     def get_sales_text(self):
-        """دریافت لیست فروش‌ها به صورت متن"""
+        """
+        دریافت لیست فروش‌ها به صورت متن
+        (برای تعداد زیاد فروش از گزارش فایلی ReportService.write_sales_report استفاده شود)
+        """
         sales = self.get_all_sales()
         if not sales:
             return "📊 هیچ فروشی ثبت نشده است."
 
-        text = "📊 *لیست فروش‌ها*\n\n"
-        text += "=" * 50 + "\n"
+        # خطوط در لیست جمع و یک بار join می‌شوند (نه += روی یک رشته بزرگ)
+        lines = ["📊 *لیست فروش‌ها*\n", "=" * 50]
 
         total_revenue = 0
         total_cost = 0
         total_profit = 0
 
         for sale in sales:
-            text += f"\n🔹 فروش شماره {sale['id']}\n"
-            text += f"📦 محصول: {sale['product_name']}\n"
-            text += f"🔢 تعداد: {sale['quantity']}\n"
-            text += f"💵 قیمت فروش: {sale['sale_price']}\n"
-            text += f"💰 کل فروش: {sale['total_sale_price']}\n"
-            text += f"💸 کل خرید: {sale['total_cost']}\n"
-            text += f"🏷️ هزینه‌های جانبی: {sale['extra_cost']}\n"
-            text += f"📈 سود خالص: {sale['net_profit']}\n"
-            text += f"📅 تاریخ: {sale['date']}\n"
-            text += "-" * 50 + "\n"
+            lines += [
+                f"\n🔹 فروش شماره {sale['id']}",
+                f"📦 محصول: {sale['product_name']}",
+                f"🔢 تعداد: {sale['quantity']}",
+                f"💵 قیمت فروش: {sale['sale_price']}",
+                f"💰 کل فروش: {sale['total_sale_price']}",
+                f"💸 کل خرید: {sale['total_cost']}",
+                f"🏷️ هزینه‌های جانبی: {sale['extra_cost']}",
+                f"📈 سود خالص: {sale['net_profit']}",
+                f"📅 تاریخ: {sale['date']}",
+                "-" * 50,
+            ]
 
             total_revenue += sale["total_sale_price"]
             total_cost += sale["total_cost"] + sale["extra_cost"]
             total_profit += sale["net_profit"]
 
-        text += f"\n📊 *خلاصه کلی*\n"
-        text += f"💰 کل فروش: {total_revenue}\n"
-        text += f"💸 کل هزینه: {total_cost}\n"
-        text += f"📈 کل سود: {total_profit}\n"
+        lines += [
+            "\n📊 *خلاصه کلی*",
+            f"💰 کل فروش: {total_revenue}",
+            f"💸 کل هزینه: {total_cost}",
+            f"📈 کل سود: {total_profit}",
+        ]
 
-        return text
+        return "\n".join(lines) + "\n"
 
     # ============ مدیریت موجودی ============
 
     def reduce_inventory(self, product_id, quantity):
         """کم کردن موجودی محصول"""
-        return self.product_repo.reduce_stock(product_id, quantity)
+        try:
+            return self.product_repo.reduce_stock(product_id, quantity)
+        finally:
+            self._after_write(product_id)
 
     def increase_inventory(self, product_id, quantity):
         """اضافه کردن موجودی محصول"""
-        return self.product_repo.increase_stock(product_id, quantity)
+        try:
+            return self.product_repo.increase_stock(product_id, quantity)
+        finally:
+            self._after_write(product_id)
 
     def check_inventory(self, product_id, quantity):
         """بررسی موجودی کافی"""
@@ -177,14 +502,24 @@ class DataManagerAdapter:
         return self.product_repo.check_stock_availability(product_id, quantity)
 
     def get_available_products(self):
-        """دریافت محصولات با موجودی بیش از صفر"""
-        products = self.product_repo.get_available_products()
-        return products_to_dict_list(products)
+        """دریافت محصولات با موجودی بیش از صفر (از کش)"""
+        return self.product_cache.get_or_load(
+            AVAILABLE_PRODUCTS_KEY,
+            lambda: product_rows_to_views(self.product_repo.get_available_products()),
+        )
+
+    def get_product_cache_stats(self):
+        """آمار کش محصولات (hit/miss)"""
+        return self.product_cache.stats()
+
+    def find_products(self, product_ids=(), names=()):
+        """پیدا کردن گروهی از محصولات با شناسه یا نام در یک کوئری"""
+        return product_rows_to_views(self.product_repo.get_many(product_ids, names))
 
     def find_product_by_name(self, product_name):
         """پیدا کردن محصول با نام"""
         product = self.product_repo.get_by_name(product_name)
-        return product_to_dict(product)
+        return product_to_view(product)
 
     def close(self):
         """بستن اتصالات"""
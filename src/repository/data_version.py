@@ -0,0 +1,29 @@
+"""
+شماره نسخه داده‌ها
+بعد از هر تغییر در محصولات یا فروش‌ها یک واحد زیاد می‌شود؛
+کش‌هایی که خروجی را از روی داده‌ها می‌سازند (مثل صفحه‌های رندرشده) با آن اعتبارسنجی می‌شوند
+"""
+
+import threading
+
+
+class DataVersion:
+    """شمارنده نسخه داده‌ها (امن برای چند thread)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 0
+
+    def current(self) -> int:
+        """نسخه فعلی"""
+        return self._version
+
+    def bump(self) -> int:
+        """افزایش نسخه بعد از یک تغییر"""
+        with self._lock:
+            self._version += 1
+            return self._version
+
+
+# نسخه مشترک داده‌های این نمونه ربات
+data_version = DataVersion()
@@ -2,10 +2,12 @@
 Dependency injection و مدیریت Session دیتابیس
 """
 
+from contextlib import contextmanager
 from sqlalchemy.orm import Session
-from ..db.database import SessionLocal
+from ..db.database import SessionLocal, ScopedSession
 from .product_repository import ProductRepository
 from .sale_repository import SaleRepository
+from .rollup_repository import RollupRepository
 
 
 def get_db() -> Session:
@@ -22,6 +24,29 @@ def get_db() -> Session:
         db.close()
 
 
+@contextmanager
+def session_scope():
+    """
+    Unit of work برای پردازش یک آپدیت
+
+    تمام Repository هایی که در این thread ساخته شده‌اند از همین Session استفاده می‌کنند.
+    در صورت خطا تراکنش rollback می‌شود تا آپدیت‌های بعدی با تراکنش خراب شروع نشوند؛
+    در پایان تمام object ها expunge شده و Session به رجیستری برگردانده می‌شود.
+
+    Yields:
+        Session: Session مخصوص این آپدیت
+    """
+    session = ScopedSession()
+    try:
+        yield session
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.expunge_all()
+        ScopedSession.remove()
+
+
 def get_product_repository(db: Session = None) -> ProductRepository:
     """
     دریافت ProductRepository
@@ -55,12 +80,14 @@ def get_sale_repository(db: Session = None) -> SaleRepository:
 class RepositoryManager:
     """
     مدیریت کننده Repository ها با Session مشترک
+    Session از رجیستری ScopedSession گرفته می‌شود، پس هر thread Session مستقل خودش را دارد
     """
 
     def __init__(self):
-        self.db = SessionLocal()
+        self.db = ScopedSession
         self.product_repo = ProductRepository(self.db)
         self.sale_repo = SaleRepository(self.db)
+        self.rollup_repo = RollupRepository(self.db)
 
     def close(self):
         """بستن Session"""
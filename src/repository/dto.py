@@ -0,0 +1,119 @@
+"""
+DTO های فشرده (frozen و __slots__) برای داده‌هایی که از Repository به سرویس‌ها می‌رسند
+به جای ساخت یک dict تازه برای هر ردیف؛ دسترسی dict مانند (view['name']) برای سازگاری حفظ شده است
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import ClassVar, Optional
+
+from ..utils.jalali import to_jalali
+
+
+class _DictAccess:
+    """دسترسی dict مانند (فقط خواندنی) روی فیلدها و property های KEYS"""
+
+    __slots__ = ()
+
+    KEYS: ClassVar[tuple] = ()
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.KEYS
+
+    def get(self, key, default=None):
+        """مثل dict.get"""
+        return getattr(self, key) if key in self.KEYS else default
+
+    def keys(self) -> tuple:
+        return self.KEYS
+
+    def items(self) -> list:
+        return [(key, getattr(self, key)) for key in self.KEYS]
+
+    def to_dict(self) -> dict:
+        """تبدیل به dict (همان کلیدهای converters قدیمی)"""
+        return {key: getattr(self, key) for key in self.KEYS}
+
+    def copy(self) -> dict:
+        """یک dict قابل تغییر (مثل dict.copy)"""
+        return self.to_dict()
+
+
+@dataclass(frozen=True, slots=True)
+class ProductView(_DictAccess):
+    """نمای فقط خواندنی محصول"""
+
+    KEYS: ClassVar[tuple] = ("id", "name", "quantity", "stock", "created_at")
+
+    id: int
+    name: str
+    stock: int
+    created_at: Optional[datetime] = None
+
+    @property
+    def quantity(self) -> int:
+        """نام قدیمی stock"""
+        return self.stock
+
+
+@dataclass(frozen=True, slots=True)
+class SaleView(_DictAccess):
+    """
+    نمای فقط خواندنی فروش
+    در لیست‌ها (ردیف‌های سبک) فیلدهای مبلغ None هستند و فیلدهای محاسبه‌شده هم None برمی‌گردانند
+    """
+
+    KEYS: ClassVar[tuple] = (
+        "id",
+        "product_id",
+        "product_name",
+        "quantity",
+        "sale_price",
+        "total_sale_price",
+        "total_cost",
+        "extra_cost",
+        "net_profit",
+        "date",
+        "sale_date",
+    )
+
+    id: int
+    product_id: Optional[int]
+    product_name: str
+    sale_date: Optional[datetime]
+    quantity: Optional[int] = None
+    total_sale_price: Optional[float] = None
+    total_cost: Optional[float] = None
+    extra_cost: Optional[float] = None
+    jalali_date: Optional[str] = None
+
+    @property
+    def net_profit(self) -> Optional[float]:
+        """سود خالص: فروش - خرید - هزینه‌های جانبی"""
+        if self.total_sale_price is None:
+            return None
+        return self.total_sale_price - self.total_cost - (self.extra_cost or 0)
+
+    @property
+    def unit_price(self) -> Optional[float]:
+        """قیمت واحد"""
+        if self.total_sale_price is None:
+            return None
+        return self.total_sale_price / self.quantity if self.quantity > 0 else 0
+
+    @property
+    def sale_price(self) -> Optional[float]:
+        """نام قدیمی unit_price"""
+        return self.unit_price
+
+    @property
+    def date(self) -> str:
+        """تاریخ فروش (شمسی) برای نمایش؛ فقط فروش‌های بدون jalali_date تبدیل می‌شوند"""
+        if self.jalali_date:
+            return self.jalali_date
+        return str(to_jalali(self.sale_date)) if self.sale_date else ""
@@ -0,0 +1,188 @@
+"""
+کش read-through محصولات برای DataManagerAdapter
+- کلیدها: هر محصول با id، و لیست‌های مرتب (همه محصولات / محصولات با موجودی)
+- انقضا با TTL و invalidate صریح بعد از هر تغییر محصول یا موجودی
+- backend حافظه (پیش‌فرض) یا Redis برای اشتراک کش و invalidate بین چند نمونه ربات
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+
+from ..core.config import settings
+from .dto import ProductView
+
+
+ALL_PRODUCTS_KEY = "products:all"
+AVAILABLE_PRODUCTS_KEY = "products:available"
+LIST_KEYS = (ALL_PRODUCTS_KEY, AVAILABLE_PRODUCTS_KEY)
+
+
+def product_key(product_id) -> str:
+    """کلید کش یک محصول"""
+    return f"product:{product_id}"
+
+
+class MemoryCacheBackend:
+    """backend حافظه با TTL (امن برای چند thread)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # کلید -> (زمان انقضا، مقدار)
+        self._entries = {}
+
+    def get(self, key):
+        """دریافت مقدار یا None در صورت نبود/انقضا"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value, ttl: int):
+        """ذخیره مقدار برای ttl ثانیه"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, *keys):
+        """حذف کلیدها"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+
+def _encode(value):
+    """تبدیل datetime و ProductView به JSON"""
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, ProductView):
+        return {"__product__": [value.id, value.name, value.stock, value.created_at]}
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _decode(obj):
+    """بازگرداندن datetime و ProductView از JSON"""
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__product__" in obj:
+        return ProductView(*obj["__product__"])
+    return obj
+
+
+class RedisCacheBackend:
+    """
+    backend مشترک روی Redis (یا هر سرور سازگار)
+    چون کلیدها در یک جا نگه‌داری می‌شوند، invalidate یک نمونه برای همه نمونه‌ها اعمال می‌شود
+    """
+
+    def __init__(self, client, prefix: str = "sale-bot:"):
+        """
+        Args:
+            client: کلاینت سازگار با redis-py (get / set(ex=) / delete)
+            prefix: پیشوند کلیدها
+        """
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        """دریافت مقدار یا None"""
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        return json.loads(raw, object_hook=_decode)
+
+    def set(self, key, value, ttl: int):
+        """ذخیره مقدار برای ttl ثانیه"""
+        self.client.set(self.prefix + key, json.dumps(value, default=_encode), ex=ttl)
+
+    def delete(self, *keys):
+        """حذف کلیدها"""
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+
+
+class ProductCache:
+    """کش محصولات با شمارنده hit/miss"""
+
+    def __init__(self, backend, ttl: int):
+        """
+        Args:
+            backend: backend ذخیره‌سازی (Memory یا Redis)
+            ttl: عمر هر کلید به ثانیه (0 = کش غیرفعال)
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get_or_load(self, key: str, loader):
+        """
+        دریافت مقدار از کش یا بارگذاری با loader و ذخیره آن
+
+        Args:
+            key: کلید کش
+            loader: تابع بدون آرگومان که مقدار را از دیتابیس می‌خواند
+
+        Returns:
+            مقدار؛ لیست‌ها کپی می‌شوند تا تغییر آن‌ها توسط فراخواننده به کش نرسد
+            (خود ProductView ها immutable هستند)
+        """
+        if not self.enabled:
+            return loader()
+
+        value = self.backend.get(key)
+        if value is not None:
+            self._count("hits")
+        else:
+            self._count("misses")
+            value = loader()
+            if value is not None:
+                self.backend.set(key, value, self.ttl)
+
+        return list(value) if isinstance(value, list) else value
+
+    def invalidate_products(self, *product_ids):
+        """حذف محصولات داده‌شده و لیست‌ها از کش"""
+        if not self.enabled:
+            return
+        keys = [product_key(product_id) for product_id in product_ids if product_id is not None]
+        self.backend.delete(*keys, *LIST_KEYS)
+        self._count("invalidations")
+
+    def stats(self) -> dict:
+        """
+        آمار کش
+
+        Returns:
+            دیکشنری شامل: hits, misses, invalidations, hit_ratio
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+def create_product_cache() -> ProductCache:
+    """ساخت کش محصولات از روی Settings"""
+    if settings.PRODUCT_CACHE_REDIS_URL:
+        # import دیرهنگام: redis فقط در صورت استفاده از backend مشترک لازم است
+        import redis
+
+        backend = RedisCacheBackend(redis.Redis.from_url(settings.PRODUCT_CACHE_REDIS_URL))
+    else:
+        backend = MemoryCacheBackend()
+    return ProductCache(backend, settings.PRODUCT_CACHE_TTL)
@@ -2,9 +2,33 @@
 Repository برای مدیریت عملیات دیتابیس محصولات
 """
 
+from sqlalchemy import Integer, Row, column, or_, select, update, values
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from ..models.product_model import Product
+from ..utils.pagination import get_page_bounds, decode_cursor, keyset_cursors, CURSOR_PREV
+from .rollup_repository import RollupRepository
+
+
+# ستون‌هایی که لیست‌ها لازم دارند؛ لیست‌ها به جای Product کامل این ردیف‌های سبک را می‌خوانند
+PRODUCT_LIST_COLUMNS = (Product.id, Product.name, Product.stock)
+
+
+def product_sort_key(product) -> tuple:
+    """کلید مرتب‌سازی لیست محصولات برای keyset"""
+    return (product.id,)
+
+
+def seek_products(query, key: tuple, direction: str):
+    """
+    محدود کردن query (Query یا select) به محصولات بعد/قبل از کلید، به ترتیب لیست
+    برای CURSOR_PREV ترتیب برعکس است و نتیجه باید reverse شود
+    """
+    (product_id,) = key
+    if direction == CURSOR_PREV:
+        return query.filter(Product.id < product_id).order_by(Product.id.desc())
+    return query.filter(Product.id > product_id).order_by(Product.id)
 
 
 class ProductRepository:
@@ -16,6 +40,7 @@ class ProductRepository:
             db: Session دیتابیس SQLAlchemy
         """
         self.db = db
+        self.rollup = RollupRepository(db)
 
     def create(self, name: str, stock: int) -> tuple[Product, bool]:
         """
@@ -36,6 +61,7 @@ class ProductRepository:
             
             product = Product(name=name, stock=stock)
             self.db.add(product)
+            self.rollup.apply_stock_change(0, stock, product_delta=1)
             self.db.commit()
             self.db.refresh(product)
             return product, True
@@ -43,17 +69,168 @@ class ProductRepository:
             self.db.rollback()
             raise
 
-    def get_by_id(self, product_id: int) -> Optional[Product]:
+    def upsert_many(self, stocks: dict) -> dict:
+        """
+        ایجاد یا به‌روزرسانی موجودی گروهی از محصولات (با commit)
+
+        محصولات جدید با یک INSERT ... ON CONFLICT (name) DO NOTHING RETURNING ساخته می‌شوند، پس
+        ایجادشده‌ها از خروجی خود INSERT می‌آیند (نه از خواندنی قبل از آن که با import هم‌زمان کهنه شود).
+        بقیه نام‌ها حالا ردیف commit شده دارند: با SELECT ... FOR UPDATE قفل و موجودی قبلی‌شان
+        خوانده می‌شود و با یک UPDATE ... FROM (VALUES ...) بازنویسی می‌شوند؛ rollup موجودی
+        در همان تراکنش با یک upsert به‌روزرسانی می‌شود. نامی که ردیفش بین INSERT و قفل حذف شده باشد
+        دوباره درج می‌شود، پس هر نام یا ایجاد یا به‌روزرسانی می‌شود.
+
+        Args:
+            stocks: نام محصول -> موجودی (نام‌ها یکتا)
+
+        Returns:
+            دیکشنری شامل: created, updated, product_ids
+        """
+        if not stocks:
+            return {'created': 0, 'updated': 0, 'product_ids': []}
+
+        try:
+            created, existing = {}, {}
+            pending = list(stocks)
+            while pending:
+                stmt = insert(Product).values([{"name": name, "stock": stocks[name]} for name in pending])
+                stmt = stmt.on_conflict_do_nothing(index_elements=[Product.name]).returning(Product.name, Product.id)
+                inserted = dict(self.db.execute(stmt).all())
+                created.update(inserted)
+
+                conflicting = [name for name in pending if name not in inserted]
+                if conflicting:
+                    existing.update(
+                        (name, (product_id, stock))
+                        for product_id, name, stock in self.db.execute(
+                            select(*PRODUCT_LIST_COLUMNS)
+                            .where(Product.name.in_(conflicting))
+                            .with_for_update()
+                        )
+                    )
+                # محصولی که بین INSERT و قفل حذف شد در هیچ‌کدام نیست؛ دوباره درج می‌شود
+                pending = [name for name in conflicting if name not in existing]
+
+            if existing:
+                # WITH new_stocks(id, stock) AS (VALUES ...) UPDATE ... FROM new_stocks
+                new_stocks = values(
+                    column("id", Integer), column("stock", Integer), name="new_stocks"
+                ).data([(product_id, stocks[name]) for name, (product_id, _) in existing.items()]).cte("new_stocks")
+                self.db.execute(
+                    update(Product)
+                    .where(Product.id == new_stocks.c.id)
+                    .values(stock=new_stocks.c.stock)
+                )
+
+            self.rollup.apply_stock_changes(
+                [(0, stocks[name], 1) for name in created]
+                + [(old_stock, stocks[name], 0) for name, (_, old_stock) in existing.items()]
+            )
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        return {
+            'created': len(created),
+            'updated': len(existing),
+            'product_ids': [*created.values(), *(product_id for product_id, _ in existing.values())],
+        }
+
+    def get_many(self, product_ids=(), names=()) -> List[Row]:
+        """
+        دریافت گروهی از محصولات با شناسه یا نام در یک کوئری (ردیف‌های سبک id, name, stock)
+
+        Args:
+            product_ids: شناسه‌ها
+            names: نام‌ها
+
+        Returns:
+            لیست ردیف‌های محصولات پیدا شده
+        """
+        conditions = []
+        if product_ids:
+            conditions.append(Product.id.in_(list(product_ids)))
+        if names:
+            conditions.append(Product.name.in_(list(names)))
+        if not conditions:
+            return []
+        return self.db.query(*PRODUCT_LIST_COLUMNS).filter(or_(*conditions)).all()
+
+    def decrement_stocks(self, quantities: dict) -> dict:
+        """
+        کم کردن اتمیک موجودی چند محصول با یک UPDATE ... FROM (VALUES ...) RETURNING (بدون commit)
+
+        شرط موجودی (stock >= مقدار) برای هر محصول داخل همان UPDATE است؛
+        محصولی که موجودی کافی نداشت در نتیجه نمی‌آید و فراخواننده باید rollback کند.
+
+        Args:
+            quantities: شناسه محصول -> مقدار کم شونده (جمع فروش‌های هر محصول)
+
+        Returns:
+            شناسه محصول -> موجودی باقی‌مانده، برای محصولاتی که کم شدند
+        """
+        if not quantities:
+            return {}
+
+        # WITH deltas(id, quantity) AS (VALUES ...) UPDATE ... FROM deltas (در PostgreSQL و SQLite)
+        deltas = values(
+            column("id", Integer), column("quantity", Integer), name="deltas"
+        ).data(list(quantities.items())).cte("deltas")
+        remaining = dict(
+            self.db.execute(
+                update(Product)
+                .where(Product.id == deltas.c.id, Product.stock >= deltas.c.quantity)
+                .values(stock=Product.stock - deltas.c.quantity)
+                .returning(Product.id, Product.stock)
+            ).all()
+        )
+
+        self.rollup.apply_stock_changes(
+            (stock + quantities[product_id], stock, 0) for product_id, stock in remaining.items()
+        )
+        return remaining
+
+    def iter_batches(self, batch_size: int = 1000) -> Iterator[List[Row]]:
+        """
+        خواندن تمام محصولات به صورت دسته‌ای با keyset (WHERE id > ...) تا حافظه محدود بماند
+
+        Args:
+            batch_size: تعداد ردیف هر دسته
+
+        Yields:
+            لیست ردیف‌های سبک id, name, stock به ترتیب id
+        """
+        last_id = 0
+        while True:
+            rows = (
+                self.db.query(*PRODUCT_LIST_COLUMNS)
+                .filter(Product.id > last_id)
+                .order_by(Product.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1].id
+
+    def get_by_id(self, product_id: int, for_update: bool = False) -> Optional[Product]:
         """
         دریافت محصول با شناسه
 
         Args:
             product_id: شناسه محصول
+            for_update: قفل ردیف با SELECT ... FOR UPDATE و خواندن دوباره از دیتابیس
+                (وقتی موجودی فعلی مبنای تغییر rollup موجودی است)
 
         Returns:
             Product یا None
         """
-        return self.db.query(Product).filter(Product.id == product_id).first()
+        query = self.db.query(Product).filter(Product.id == product_id)
+        if for_update:
+            query = query.with_for_update().populate_existing()
+        return query.first()
 
     def get_by_name(self, name: str) -> Optional[Product]:
         """
@@ -67,23 +244,107 @@ class ProductRepository:
         """
         return self.db.query(Product).filter(Product.name == name).first()
 
-    def get_all(self) -> List[Product]:
+    def get_all(self) -> List[Row]:
         """
-        دریافت تمام محصولات
+        دریافت تمام محصولات (ردیف‌های سبک id, name, stock)
 
         Returns:
-            لیست محصولات
+            لیست ردیف‌های محصولات
         """
-        return self.db.query(Product).all()
+        return self.db.query(*PRODUCT_LIST_COLUMNS).order_by(Product.id).all()
 
-    def get_available_products(self) -> List[Product]:
+    def get_available_products(self) -> List[Row]:
         """
-        دریافت محصولات با موجودی بیشتر از صفر
+        دریافت محصولات با موجودی بیشتر از صفر (ردیف‌های سبک id, name, stock)
 
         Returns:
-            لیست محصولات با موجودی
+            لیست ردیف‌های محصولات با موجودی
+        """
+        return self.db.query(*PRODUCT_LIST_COLUMNS).filter(Product.stock > 0).order_by(Product.id).all()
+
+    def get_low_stock(self, threshold: int) -> List[Row]:
         """
-        return self.db.query(Product).filter(Product.stock > 0).all()
+        دریافت محصولات کم‌موجود (موجودی بین 1 و آستانه)، ردیف‌های سبک id, name, stock
+
+        Args:
+            threshold: آستانه کم‌موجودی
+
+        Returns:
+            لیست ردیف‌های محصولات کم‌موجود
+        """
+        return (
+            self.db.query(*PRODUCT_LIST_COLUMNS)
+            .filter(Product.stock > 0, Product.stock <= threshold)
+            .order_by(Product.id)
+            .all()
+        )
+
+    def count(self, only_available: bool = False) -> int:
+        """
+        شمارش محصولات
+
+        Args:
+            only_available: فقط محصولات با موجودی بیشتر از صفر
+
+        Returns:
+            تعداد محصولات
+        """
+        query = self.db.query(Product)
+        if only_available:
+            query = query.filter(Product.stock > 0)
+        return query.count()
+
+    def get_page(
+        self,
+        page: int = 1,
+        per_page: int = 5,
+        only_available: bool = False,
+        cursor: str = None,
+        direction: str = None,
+    ) -> dict:
+        """
+        دریافت یک صفحه از محصولات
+        با cursor از keyset (WHERE id > ...) و بدون آن از LIMIT/OFFSET استفاده می‌شود
+
+        Args:
+            page: شماره صفحه
+            per_page: تعداد آیتم در هر صفحه
+            only_available: فقط محصولات با موجودی بیشتر از صفر
+            cursor: کلید مرزی صفحه مجاور (خروجی prev_cursor / next_cursor)
+            direction: CURSOR_NEXT یا CURSOR_PREV
+
+        Returns:
+            دیکشنری شامل: items (ردیف‌های سبک id, name, stock), page, total_pages, total_items,
+            prev_cursor, next_cursor
+        """
+        if only_available:
+            total_items = self.count(only_available=True)
+        else:
+            # تعداد کل محصولات از rollup موجودی (یک ردیف) به جای COUNT روی کل جدول
+            total_items = self.rollup.get_inventory_totals()["total_products"]
+        page, total_pages, offset = get_page_bounds(total_items, page, per_page)
+
+        query = self.db.query(*PRODUCT_LIST_COLUMNS)
+        if only_available:
+            query = query.filter(Product.stock > 0)
+
+        items = []
+        key = decode_cursor(cursor, 1)
+        if key is not None:
+            items = seek_products(query, key, direction).limit(per_page).all()
+            if direction == CURSOR_PREV:
+                items.reverse()
+        if not items:
+            # صفحه بدون cursor یا cursor بی‌اعتبار/قدیمی
+            items = query.order_by(Product.id).offset(offset).limit(per_page).all()
+
+        return {
+            "items": items,
+            "page": page,
+            "total_pages": total_pages,
+            "total_items": total_items,
+            **keyset_cursors(items, page, total_pages, product_sort_key),
+        }
 
     def update_name(self, product_id: int, new_name: str) -> bool:
         """
@@ -107,6 +368,9 @@ class ProductRepository:
         """
         به‌روزرسانی موجودی محصول
 
+        ردیف محصول با SELECT ... FOR UPDATE قفل می‌شود تا موجودی قبلی (و تغییر rollup موجودی)
+        با فروش یا ویرایش هم‌زمان کهنه نشود
+
         Args:
             product_id: شناسه محصول
             new_stock: موجودی جدید
@@ -114,12 +378,41 @@ class ProductRepository:
         Returns:
             True اگر موفق باشد
         """
-        product = self.get_by_id(product_id)
-        if product:
-            product.stock = new_stock
-            self.db.commit()
-            return True
-        return False
+        try:
+            product = self.get_by_id(product_id, for_update=True)
+            if product:
+                self.rollup.apply_stock_change(product.stock, new_stock)
+                product.stock = new_stock
+                self.db.commit()
+                return True
+            return False
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def decrement_stock(self, product_id: int, quantity: int) -> Optional[int]:
+        """
+        کم کردن اتمیک موجودی با یک UPDATE ... WHERE stock >= quantity RETURNING stock (بدون commit)
+
+        شرط موجودی داخل خود UPDATE است، پس دو فروش هم‌زمان نمی‌توانند بیش از موجودی بفروشند.
+
+        Args:
+            product_id: شناسه محصول
+            quantity: مقدار کم شونده
+
+        Returns:
+            موجودی باقی‌مانده، یا None اگر محصول نبود یا موجودی کافی نبود
+        """
+        new_stock = self.db.execute(
+            update(Product)
+            .where(Product.id == product_id, Product.stock >= quantity)
+            .values(stock=Product.stock - quantity)
+            .returning(Product.stock)
+        ).scalar_one_or_none()
+
+        if new_stock is not None:
+            self.rollup.apply_stock_change(new_stock + quantity, new_stock)
+        return new_stock
 
     def reduce_stock(self, product_id: int, quantity: int) -> bool:
         """
@@ -132,12 +425,37 @@ class ProductRepository:
         Returns:
             True اگر موفق باشد
         """
-        product = self.get_by_id(product_id)
-        if product and product.stock >= quantity:
-            product.stock -= quantity
+        try:
+            if self.decrement_stock(product_id, quantity) is None:
+                self.db.rollback()
+                return False
             self.db.commit()
             return True
-        return False
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def increment_stock(self, product_id: int, quantity: int) -> Optional[int]:
+        """
+        اضافه کردن اتمیک به موجودی با یک UPDATE ... RETURNING stock (بدون commit)
+
+        Args:
+            product_id: شناسه محصول
+            quantity: مقدار اضافه شونده
+
+        Returns:
+            موجودی جدید، یا None اگر محصول وجود نداشت
+        """
+        new_stock = self.db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(stock=Product.stock + quantity)
+            .returning(Product.stock)
+        ).scalar_one_or_none()
+
+        if new_stock is not None:
+            self.rollup.apply_stock_change(new_stock - quantity, new_stock)
+        return new_stock
 
     def increase_stock(self, product_id: int, quantity: int) -> bool:
         """
@@ -150,17 +468,22 @@ class ProductRepository:
         Returns:
             True اگر موفق باشد
         """
-        product = self.get_by_id(product_id)
-        if product:
-            product.stock += quantity
+        try:
+            if self.increment_stock(product_id, quantity) is None:
+                self.db.rollback()
+                return False
             self.db.commit()
             return True
-        return False
+        except Exception:
+            self.db.rollback()
+            raise
 
     def delete(self, product_id: int) -> bool:
         """
         حذف محصول
 
+        ردیف محصول مثل update_stock قفل می‌شود تا موجودی کم‌شده از rollup با فروش هم‌زمان کهنه نشود
+
         Args:
             product_id: شناسه محصول
 
@@ -168,8 +491,10 @@ class ProductRepository:
             True اگر موفق باشد
         """
         try:
-            product = self.get_by_id(product_id)
+            product = self.get_by_id(product_id, for_update=True)
             if product:
+                self.rollup.apply_stock_change(product.stock, 0, product_delta=-1)
+                self.rollup.drop_product(product_id)
                 self.db.delete(product)
                 self.db.commit()
                 return True
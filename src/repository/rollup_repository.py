@@ -0,0 +1,323 @@
+"""
+Repository برای نگهداری جمع‌های از پیش محاسبه‌شده (rollup) فروش و موجودی
+این جمع‌ها در همان تراکنشِ تغییر فروش/موجودی به‌روزرسانی می‌شوند
+"""
+
+from sqlalchemy import func, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ..models.product_model import Product
+from ..models.sale_model import Sale
+from ..models.rollup_model import SalesRollup, InventoryRollup
+from ..utils.constants import LOW_STOCK_THRESHOLD
+
+
+SCOPE_TOTAL = "total"
+SCOPE_PRODUCT = "product"
+SCOPE_DAY = "day"
+
+INVENTORY_ROW_ID = 1
+
+# ستون‌های جمع در SalesRollup
+SALES_ROLLUP_FIELDS = ("sale_count", "total_quantity", "total_revenue", "total_cost", "total_extra_cost")
+
+
+def day_bucket(sale_date) -> str:
+    """کلید روز برای rollup روزانه (YYYY-MM-DD)"""
+    return sale_date.strftime("%Y-%m-%d")
+
+
+def sale_buckets(product_id, sale_date) -> list:
+    """bucket های rollup که یک فروش در آن‌ها شمرده می‌شود: (scope, bucket)"""
+    buckets = [(SCOPE_TOTAL, "")]
+    if product_id is not None:
+        buckets.append((SCOPE_PRODUCT, str(product_id)))
+    if sale_date is not None:
+        buckets.append((SCOPE_DAY, day_bucket(sale_date)))
+    return buckets
+
+
+def is_low_stock(stock: int) -> bool:
+    """آیا موجودی در محدوده کم‌موجود است"""
+    return 0 < stock <= LOW_STOCK_THRESHOLD
+
+
+def sales_row_to_dict(row) -> dict:
+    """تبدیل ردیف SalesRollup (یا None) به دیکشنری جمع‌ها"""
+    if row is None:
+        return {
+            "total_sales": 0,
+            "total_quantity": 0,
+            "total_revenue": 0.0,
+            "total_cost": 0.0,
+            "total_extra_cost": 0.0,
+        }
+    return {
+        "total_sales": row.sale_count,
+        "total_quantity": row.total_quantity,
+        "total_revenue": row.total_revenue,
+        "total_cost": row.total_cost,
+        "total_extra_cost": row.total_extra_cost,
+    }
+
+
+def inventory_row_to_dict(row) -> dict:
+    """تبدیل ردیف InventoryRollup (یا None) به دیکشنری خلاصه موجودی"""
+    if row is None:
+        return {"total_products": 0, "total_items": 0, "low_stock_count": 0}
+    return {
+        "total_products": row.total_products,
+        "total_items": row.total_items,
+        "low_stock_count": row.low_stock_count,
+    }
+
+
+class RollupRepository:
+    """Repository برای خواندن و به‌روزرسانی rollup ها"""
+
+    def __init__(self, db: Session):
+        """
+        Args:
+            db: Session دیتابیس SQLAlchemy
+        """
+        self.db = db
+
+    # ============ فروش ============
+
+    def apply_sale(self, sale: Sale, sign: int = 1):
+        """
+        اعمال یک فروش روی rollup ها (بدون commit)
+
+        Args:
+            sale: فروش
+            sign: 1 برای اضافه شدن و -1 برای حذف شدن فروش
+        """
+        deltas = {
+            "sale_count": sign,
+            "total_quantity": sign * sale.quantity,
+            "total_revenue": sign * sale.total_sale,
+            "total_cost": sign * sale.total_cost,
+            "total_extra_cost": sign * (sale.extra_cost or 0),
+        }
+        self._add_to_buckets([
+            {"scope": scope, "bucket": bucket, **deltas}
+            for scope, bucket in sale_buckets(sale.product_id, sale.sale_date)
+        ])
+
+    def apply_sales(self, sales):
+        """
+        اعمال گروهی از فروش‌های جدید روی rollup ها؛ جمع هر bucket در حافظه و یک upsert چندردیفی (بدون commit)
+
+        Args:
+            sales: دیکشنری‌های فروش با کلیدهای ستون‌های Sale
+                (product_id, quantity, total_sale, total_cost, extra_cost, sale_date)
+        """
+        totals = {}
+        for sale in sales:
+            for key in sale_buckets(sale["product_id"], sale["sale_date"]):
+                bucket = totals.get(key)
+                if bucket is None:
+                    bucket = totals[key] = dict.fromkeys(SALES_ROLLUP_FIELDS, 0)
+                bucket["sale_count"] += 1
+                bucket["total_quantity"] += sale["quantity"]
+                bucket["total_revenue"] += sale["total_sale"]
+                bucket["total_cost"] += sale["total_cost"]
+                bucket["total_extra_cost"] += sale.get("extra_cost") or 0
+
+        self._add_to_buckets([
+            {"scope": scope, "bucket": bucket, **deltas}
+            for (scope, bucket), deltas in totals.items()
+        ])
+
+    def _add_to_buckets(self, rows: list):
+        """افزودن مقادیر به چند bucket (یکتا) با یک INSERT ... ON CONFLICT DO UPDATE"""
+        if not rows:
+            return
+        stmt = insert(SalesRollup).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SalesRollup.scope, SalesRollup.bucket],
+            set_={
+                name: getattr(SalesRollup, name) + getattr(stmt.excluded, name)
+                for name in SALES_ROLLUP_FIELDS
+            },
+        )
+        self.db.execute(stmt)
+
+    def drop_product(self, product_id: int):
+        """حذف rollup یک محصول حذف‌شده (بدون commit)"""
+        self.db.execute(
+            delete(SalesRollup).where(
+                SalesRollup.scope == SCOPE_PRODUCT,
+                SalesRollup.bucket == str(product_id),
+            )
+        )
+
+    def get_sales_totals(self) -> dict:
+        """
+        دریافت جمع کل فروش‌ها از rollup
+
+        Returns:
+            دیکشنری شامل: total_sales, total_revenue, total_cost, total_extra_cost
+        """
+        row = (
+            self.db.query(SalesRollup)
+            .filter(SalesRollup.scope == SCOPE_TOTAL, SalesRollup.bucket == "")
+            .first()
+        )
+        return sales_row_to_dict(row)
+
+    def get_product_totals(self, product_id: int) -> dict:
+        """دریافت جمع فروش‌های یک محصول از rollup"""
+        row = (
+            self.db.query(SalesRollup)
+            .filter(
+                SalesRollup.scope == SCOPE_PRODUCT,
+                SalesRollup.bucket == str(product_id),
+            )
+            .first()
+        )
+        return sales_row_to_dict(row)
+
+    def get_day_totals(self, start_day: str, end_day: str) -> list:
+        """
+        جمع فروش روزهای بازه [start_day, end_day) از rollup روزانه (بدون خواندن جدول sales)
+
+        Args:
+            start_day: اولین روز (YYYY-MM-DD)
+            end_day: روز بعد از آخرین روز (YYYY-MM-DD)
+
+        Returns:
+            ردیف‌های SalesRollup به ترتیب روز (bucket = YYYY-MM-DD)
+        """
+        return (
+            self.db.query(SalesRollup)
+            .filter(
+                SalesRollup.scope == SCOPE_DAY,
+                SalesRollup.bucket >= start_day,
+                SalesRollup.bucket < end_day,
+            )
+            .order_by(SalesRollup.bucket)
+            .all()
+        )
+
+    # ============ موجودی ============
+
+    def apply_stock_change(self, old_stock: int, new_stock: int, product_delta: int = 0):
+        """
+        اعمال تغییر موجودی یک محصول روی rollup موجودی (بدون commit)
+
+        Args:
+            old_stock: موجودی قبلی (برای محصول جدید 0)
+            new_stock: موجودی جدید (برای محصول حذف‌شده 0)
+            product_delta: تغییر تعداد محصولات (1 ایجاد، -1 حذف)
+        """
+        self.apply_stock_changes([(old_stock, new_stock, product_delta)])
+
+    def apply_stock_changes(self, changes):
+        """
+        اعمال تغییر موجودی چند محصول با یک upsert روی rollup موجودی (بدون commit)
+
+        Args:
+            changes: (old_stock, new_stock, product_delta) برای هر محصول
+        """
+        product_delta = items_delta = low_stock_delta = 0
+        for old_stock, new_stock, delta in changes:
+            product_delta += delta
+            items_delta += new_stock - old_stock
+            low_stock_delta += int(is_low_stock(new_stock)) - int(is_low_stock(old_stock))
+
+        if not (items_delta or low_stock_delta or product_delta):
+            return
+
+        stmt = insert(InventoryRollup).values(
+            id=INVENTORY_ROW_ID,
+            total_products=product_delta,
+            total_items=items_delta,
+            low_stock_count=low_stock_delta,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[InventoryRollup.id],
+            set_={
+                "total_products": InventoryRollup.total_products + stmt.excluded.total_products,
+                "total_items": InventoryRollup.total_items + stmt.excluded.total_items,
+                "low_stock_count": InventoryRollup.low_stock_count + stmt.excluded.low_stock_count,
+            },
+        )
+        self.db.execute(stmt)
+
+    def get_inventory_totals(self) -> dict:
+        """
+        دریافت خلاصه موجودی از rollup
+
+        Returns:
+            دیکشنری شامل: total_products, total_items, low_stock_count
+        """
+        return inventory_row_to_dict(self.db.get(InventoryRollup, INVENTORY_ROW_ID))
+
+    # ============ بازسازی ============
+
+    def rebuild(self):
+        """
+        محاسبه دوباره تمام rollup ها از روی جداول sales و products (با commit)
+        """
+        try:
+            self.db.execute(delete(SalesRollup))
+            self.db.execute(delete(InventoryRollup))
+
+            sums = (
+                func.count(Sale.id),
+                func.coalesce(func.sum(Sale.quantity), 0),
+                func.coalesce(func.sum(Sale.total_sale), 0.0),
+                func.coalesce(func.sum(Sale.total_cost), 0.0),
+                func.coalesce(func.sum(Sale.extra_cost), 0.0),
+            )
+            rows = [(SCOPE_TOTAL, "", *self.db.query(*sums).one())]
+
+            by_product = (
+                self.db.query(Sale.product_id, *sums)
+                .filter(Sale.product_id.isnot(None))
+                .group_by(Sale.product_id)
+            )
+            rows += [(SCOPE_PRODUCT, str(product_id), *values) for product_id, *values in by_product]
+
+            day = func.date(Sale.sale_date)
+            by_day = (
+                self.db.query(day, *sums)
+                .filter(Sale.sale_date.isnot(None))
+                .group_by(day)
+            )
+            rows += [(SCOPE_DAY, str(bucket), *values) for bucket, *values in by_day]
+
+            self.db.add_all(
+                SalesRollup(
+                    scope=scope,
+                    bucket=bucket,
+                    sale_count=count,
+                    total_quantity=quantity,
+                    total_revenue=revenue,
+                    total_cost=cost,
+                    total_extra_cost=extra_cost,
+                )
+                for scope, bucket, count, quantity, revenue, cost, extra_cost in rows
+            )
+
+            total_products, total_items, low_stock_count = self.db.query(
+                func.count(Product.id),
+                func.coalesce(func.sum(Product.stock), 0),
+                func.count(Product.id).filter(
+                    Product.stock > 0, Product.stock <= LOW_STOCK_THRESHOLD
+                ),
+            ).one()
+            self.db.add(
+                InventoryRollup(
+                    id=INVENTORY_ROW_ID,
+                    total_products=total_products,
+                    total_items=total_items,
+                    low_stock_count=low_stock_count,
+                )
+            )
+
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
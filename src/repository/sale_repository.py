@@ -3,9 +3,85 @@ Repository برای مدیریت عملیات دیتابیس فروش‌ها
 """
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
-from typing import List, Optional
+from sqlalchemy import Row, desc, distinct, func, insert, select, tuple_
+from datetime import datetime
+from typing import Iterator, List, Optional
+from ..models.product_model import Product
 from ..models.sale_model import Sale
+from ..utils.jalali import to_jalali
+from ..utils.pagination import (
+    get_page_bounds,
+    decode_cursor,
+    keyset_cursors,
+    datetime_to_cursor,
+    cursor_to_datetime,
+    CURSOR_PREV,
+)
+from .rollup_repository import RollupRepository
+
+
+# ستون‌هایی که لیست فروش‌ها لازم دارد (به جای Sale کامل و joinedload محصول)
+SALE_LIST_COLUMNS = (
+    Sale.id,
+    Sale.product_id,
+    Product.name.label("product_name"),
+    Sale.sale_date,
+    Sale.jalali_date,
+)
+
+
+# ستون‌های گزارش کامل فروش‌ها (همه مبالغ، بدون ساخت Sale و Product کامل)
+SALE_REPORT_COLUMNS = (
+    Sale.id,
+    Sale.product_id,
+    Product.name.label("product_name"),
+    Sale.sale_date,
+    Sale.jalali_date,
+    Sale.quantity,
+    Sale.total_sale,
+    Sale.total_cost,
+    Sale.extra_cost,
+)
+
+
+# جمع‌های گزارش تحلیلی (همان نام ستون‌های SalesRollup تا sales_row_to_dict روی هر دو کار کند)
+SALE_TOTAL_COLUMNS = (
+    func.count(Sale.id).label("sale_count"),
+    func.coalesce(func.sum(Sale.quantity), 0).label("total_quantity"),
+    func.coalesce(func.sum(Sale.total_sale), 0.0).label("total_revenue"),
+    func.coalesce(func.sum(Sale.total_cost), 0.0).label("total_cost"),
+    func.coalesce(func.sum(Sale.extra_cost), 0.0).label("total_extra_cost"),
+)
+SALE_PROFIT = (
+    func.sum(Sale.total_sale) - func.sum(Sale.total_cost) - func.coalesce(func.sum(Sale.extra_cost), 0.0)
+).label("profit")
+
+
+def filter_sale_dates(query, start: Optional[datetime], end: Optional[datetime]):
+    """محدود کردن query به فروش‌های بازه [start, end) (None یعنی بدون مرز)"""
+    if start is not None:
+        query = query.filter(Sale.sale_date >= start)
+    if end is not None:
+        query = query.filter(Sale.sale_date < end)
+    return query
+
+
+def sale_sort_key(sale) -> tuple:
+    """کلید مرتب‌سازی لیست فروش‌ها (sale_date, id) به صورت اعداد صحیح برای keyset"""
+    return (datetime_to_cursor(sale.sale_date), sale.id)
+
+
+def seek_sales(query, key: tuple, direction: str):
+    """
+    محدود کردن query (Query یا select) به فروش‌های بعد/قبل از کلید، به ترتیب لیست
+    (sale_date DESC, id DESC) تا از ix_sales_sale_date_id استفاده شود؛
+    برای CURSOR_PREV ترتیب برعکس است و نتیجه باید reverse شود
+    """
+    sale_date, sale_id = cursor_to_datetime(key[0]), key[1]
+    row = tuple_(Sale.sale_date, Sale.id)
+    if direction == CURSOR_PREV:
+        return query.filter(row > tuple_(sale_date, sale_id)).order_by(Sale.sale_date, Sale.id)
+    return query.filter(row < tuple_(sale_date, sale_id)).order_by(desc(Sale.sale_date), desc(Sale.id))
 
 
 class SaleRepository:
@@ -17,6 +93,7 @@ class SaleRepository:
             db: Session دیتابیس SQLAlchemy
         """
         self.db = db
+        self.rollup = RollupRepository(db)
 
     def create(
         self,
@@ -25,6 +102,9 @@ class SaleRepository:
         total_sale: float,
         total_cost: float,
         extra_cost: float = 0.0,
+        sale_date: datetime = None,
+        jalali_date: str = None,
+        commit: bool = True,
     ) -> Sale:
         """
         ایجاد فروش جدید
@@ -35,34 +115,71 @@ class SaleRepository:
             total_sale: مبلغ کل فروش
             total_cost: مبلغ کل خرید
             extra_cost: هزینه‌های جانبی
+            sale_date: تاریخ فروش (پیش‌فرض زمان ثبت)
+            jalali_date: همان تاریخ به شمسی (پیش‌فرض تبدیل sale_date)
+            commit: False یعنی فروش داخل تراکنش فراخواننده می‌ماند (فقط flush)
 
         Returns:
             Sale: فروش ایجاد شده
         """
+        sale_date = sale_date or datetime.utcnow()
         sale = Sale(
             product_id=product_id,
             quantity=quantity,
             total_sale=total_sale,
             total_cost=total_cost,
             extra_cost=extra_cost,
+            sale_date=sale_date,
+            jalali_date=jalali_date or str(to_jalali(sale_date)),
         )
-        self.db.add(sale)
-        self.db.commit()
-        self.db.refresh(sale)
-        return sale
+        try:
+            self.db.add(sale)
+            self.db.flush()
+            # به‌روزرسانی rollup در همان تراکنش
+            self.rollup.apply_sale(sale, 1)
+            if commit:
+                self.db.commit()
+                self.db.refresh(sale)
+            return sale
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def create_many(self, sales: List[dict]) -> int:
+        """
+        ایجاد گروهی فروش‌ها با یک INSERT چندردیفی (executemany) و یک upsert برای rollup ها (بدون commit)
 
-    def get_by_id(self, sale_id: int) -> Optional[Sale]:
+        Args:
+            sales: دیکشنری‌های فروش با کلیدهای product_id, quantity, total_sale, total_cost, extra_cost,
+                sale_date, jalali_date
+
+        Returns:
+            تعداد فروش‌های ایجاد شده
+        """
+        if not sales:
+            return 0
+        self.db.execute(insert(Sale), sales)
+        self.rollup.apply_sales(sales)
+        return len(sales)
+
+    def get_by_id(self, sale_id: int, for_update: bool = False) -> Optional[Sale]:
         """
         دریافت فروش با شناسه
 
         Args:
             sale_id: شناسه فروش
+            for_update: قفل ردیف با SELECT ... FOR UPDATE و خواندن دوباره از دیتابیس
+                (برای تغییر موجودی بر اساس تعداد فروش؛ فراخواننده تراکنش را commit/rollback می‌کند)
 
         Returns:
             Sale یا None
         """
         try:
-            return self.db.query(Sale).options(joinedload(Sale.product)).filter(Sale.id == sale_id).first()
+            if for_update:
+                # محصول بعداً lazy خوانده می‌شود (FOR UPDATE روی outer join مجاز نیست)
+                return self.db.get(Sale, sale_id, with_for_update=True, populate_existing=True)
+            # اگر فروش در همین Session بارگذاری شده باشد از identity map برگردانده می‌شود (بدون کوئری)
+            return self.db.get(Sale, sale_id, options=[joinedload(Sale.product)])
         except Exception:
             self.db.rollback()
             return None
@@ -82,6 +199,149 @@ class SaleRepository:
             query = query.order_by(desc(Sale.sale_date))
         return query.all()
 
+    def iter_report_rows(self, batch_size: int = 1000) -> Iterator[List[Row]]:
+        """
+        خواندن جریانی تمام فروش‌ها برای گزارش (از جدید به قدیم) با cursor سمت سرور (yield_per)
+        در هر لحظه فقط یک دسته در حافظه است
+
+        Args:
+            batch_size: تعداد ردیف هر دسته
+
+        Yields:
+            لیست ردیف‌های SALE_REPORT_COLUMNS
+        """
+        result = self.db.execute(
+            select(*SALE_REPORT_COLUMNS)
+            .outerjoin(Product, Sale.product_id == Product.id)
+            .order_by(desc(Sale.sale_date), desc(Sale.id))
+            .execution_options(yield_per=batch_size)
+        )
+        try:
+            for partition in result.partitions():
+                yield partition
+        finally:
+            result.close()
+
+    def get_totals_by_day(self, start: datetime, end: datetime, product_id: int = None) -> List[Row]:
+        """
+        جمع فروش‌ها به ازای روز در بازه [start, end)، با GROUP BY در دیتابیس
+        با product_id از ix_sales_product_id_sale_date و بدون آن از ix_sales_sale_date_id استفاده می‌شود
+
+        Args:
+            start: ابتدای بازه
+            end: انتهای بازه (خود آن شامل نمی‌شود)
+            product_id: فقط فروش‌های یک محصول (اختیاری)
+
+        Returns:
+            ردیف‌های (day, sale_count, total_quantity, total_revenue, total_cost, total_extra_cost) به ترتیب روز
+        """
+        day = func.date(Sale.sale_date).label("day")
+        query = filter_sale_dates(self.db.query(day, *SALE_TOTAL_COLUMNS), start, end)
+        if product_id is not None:
+            query = query.filter(Sale.product_id == product_id)
+        return query.group_by(day).order_by(day).all()
+
+    def get_product_totals_page(
+        self,
+        start: datetime = None,
+        end: datetime = None,
+        page: int = 1,
+        per_page: int = 10,
+    ) -> dict:
+        """
+        جمع فروش هر محصول در بازه [start, end)، مرتب بر اساس سود خالص (بیشترین اول)، صفحه‌بندی در دیتابیس
+
+        Args:
+            start: ابتدای بازه (None = از ابتدا)
+            end: انتهای بازه (None = تا انتها)
+            page: شماره صفحه
+            per_page: تعداد محصول در هر صفحه
+
+        Returns:
+            دیکشنری شامل: items (ردیف‌های product_id, product_name, جمع‌ها و profit), page, total_pages, total_items
+        """
+        total_items = filter_sale_dates(
+            self.db.query(func.count(distinct(Sale.product_id))).filter(Sale.product_id.isnot(None)),
+            start,
+            end,
+        ).scalar()
+        page, total_pages, offset = get_page_bounds(total_items, page, per_page)
+
+        query = self.db.query(
+            Sale.product_id,
+            Product.name.label("product_name"),
+            *SALE_TOTAL_COLUMNS,
+            SALE_PROFIT,
+        ).join(Product, Sale.product_id == Product.id)
+        items = (
+            filter_sale_dates(query, start, end)
+            .group_by(Sale.product_id, Product.name)
+            .order_by(desc(SALE_PROFIT), Sale.product_id)
+            .offset(offset)
+            .limit(per_page)
+            .all()
+        )
+
+        return {
+            "items": items,
+            "page": page,
+            "total_pages": total_pages,
+            "total_items": total_items,
+        }
+
+    def count(self) -> int:
+        """
+        شمارش فروش‌ها
+
+        Returns:
+            تعداد فروش‌ها
+        """
+        return self.db.query(Sale).count()
+
+    def get_page(self, page: int = 1, per_page: int = 5, cursor: str = None, direction: str = None) -> dict:
+        """
+        دریافت یک صفحه از فروش‌ها (از جدید به قدیم)
+        با cursor از keyset روی (sale_date, id) و بدون آن از LIMIT/OFFSET استفاده می‌شود
+
+        Args:
+            page: شماره صفحه
+            per_page: تعداد آیتم در هر صفحه
+            cursor: کلید مرزی صفحه مجاور (خروجی prev_cursor / next_cursor)
+            direction: CURSOR_NEXT یا CURSOR_PREV
+
+        Returns:
+            دیکشنری شامل: items (ردیف‌های سبک SALE_LIST_COLUMNS), page, total_pages, total_items,
+            prev_cursor, next_cursor
+        """
+        # تعداد کل فروش‌ها از rollup کل (یک ردیف) به جای COUNT روی کل جدول
+        total_items = self.rollup.get_sales_totals()["total_sales"]
+        page, total_pages, offset = get_page_bounds(total_items, page, per_page)
+
+        query = self.db.query(*SALE_LIST_COLUMNS).outerjoin(Product, Sale.product_id == Product.id)
+
+        items = []
+        key = decode_cursor(cursor, 2)
+        if key is not None:
+            items = seek_sales(query, key, direction).limit(per_page).all()
+            if direction == CURSOR_PREV:
+                items.reverse()
+        if not items:
+            # صفحه بدون cursor یا cursor بی‌اعتبار/قدیمی
+            items = (
+                query.order_by(desc(Sale.sale_date), desc(Sale.id))
+                .offset(offset)
+                .limit(per_page)
+                .all()
+            )
+
+        return {
+            "items": items,
+            "page": page,
+            "total_pages": total_pages,
+            "total_items": total_items,
+            **keyset_cursors(items, page, total_pages, sale_sort_key),
+        }
+
     def update(
         self,
         sale_id: int,
@@ -90,6 +350,9 @@ class SaleRepository:
         total_sale: float = None,
         total_cost: float = None,
         extra_cost: float = None,
+        sale_date: datetime = None,
+        jalali_date: str = None,
+        commit: bool = True,
     ) -> bool:
         """
         به‌روزرسانی فروش
@@ -101,6 +364,9 @@ class SaleRepository:
             total_sale: مبلغ فروش جدید (اختیاری)
             total_cost: مبلغ خرید جدید (اختیاری)
             extra_cost: هزینه جانبی جدید (اختیاری)
+            sale_date: تاریخ جدید (اختیاری)
+            jalali_date: تاریخ جدید به شمسی (پیش‌فرض تبدیل sale_date)
+            commit: False یعنی تغییر داخل تراکنش فراخواننده می‌ماند
 
         Returns:
             True اگر موفق باشد
@@ -110,6 +376,9 @@ class SaleRepository:
             if not sale:
                 return False
 
+            # خارج کردن مقادیر قبلی از rollup
+            self.rollup.apply_sale(sale, -1)
+
             # فقط اگر مقدار None نباشد، به‌روزرسانی کن
             if product_id is not None:
                 sale.product_id = product_id
@@ -121,27 +390,41 @@ class SaleRepository:
                 sale.total_cost = total_cost
             if extra_cost is not None:
                 sale.extra_cost = extra_cost
+            if sale_date is not None:
+                sale.sale_date = sale_date
+                sale.jalali_date = jalali_date or str(to_jalali(sale_date))
+
+            # اضافه کردن مقادیر جدید به rollup
+            self.rollup.apply_sale(sale, 1)
 
-            self.db.commit()
+            if commit:
+                self.db.commit()
             return True
         except Exception:
             self.db.rollback()
             raise
 
-    def delete(self, sale_id: int) -> bool:
+    def delete(self, sale_id: int, commit: bool = True) -> bool:
         """
         حذف فروش
 
         Args:
             sale_id: شناسه فروش
+            commit: False یعنی حذف داخل تراکنش فراخواننده می‌ماند
 
         Returns:
             True اگر موفق باشد
         """
-        sale = self.get_by_id(sale_id)
-        if sale:
-            self.db.delete(sale)
-            self.db.commit()
-            return True
-        return False
+        try:
+            sale = self.get_by_id(sale_id)
+            if sale:
+                self.rollup.apply_sale(sale, -1)
+                self.db.delete(sale)
+                if commit:
+                    self.db.commit()
+                return True
+            return False
+        except Exception:
+            self.db.rollback()
+            raise
 
@@ -0,0 +1,10 @@
+from .inventory_service import AsyncInventoryService
+from .sales_service import AsyncSalesService
+from .report_service import AsyncReportService
+
+
+__all__ = [
+    'AsyncInventoryService',
+    'AsyncSalesService',
+    'AsyncReportService'
+]
@@ -0,0 +1,54 @@
+"""
+سرویس ناهمگام موجودی (نمایش و خلاصه)
+"""
+
+from ..inventory_services.inventory_service import InventoryService
+from ...utils.constants import LOW_STOCK_THRESHOLD
+
+
+class AsyncInventoryService:
+    """نسخه ناهمگام عملیات خواندنی InventoryService"""
+    
+    def __init__(self, data_manager):
+        """
+        Args:
+            data_manager: مدیریت‌کننده داده‌های ناهمگام
+        """
+        self.data_manager = data_manager
+    
+    async def calculate_inventory_summary(self, include_low_stock_products: bool = True) -> dict:
+        """
+        محاسبه خلاصه موجودی
+        
+        Args:
+            include_low_stock_products: دریافت لیست محصولات کم‌موجود (یک کوئری اضافه)
+        
+        Returns:
+            دیکشنری شامل: total_products, total_items, low_stock_count, low_stock_products
+        """
+        summary = await self.data_manager.get_inventory_summary()
+        
+        if include_low_stock_products and summary['low_stock_count']:
+            low_stock = await self.data_manager.get_low_stock_products(LOW_STOCK_THRESHOLD)
+        else:
+            low_stock = []
+        
+        return InventoryService.build_inventory_summary(summary, low_stock)
+    
+    async def get_inventory_page(self, page: int = 1, items_per_page: int = 5, cursor: str = None, direction: str = None) -> dict:
+        """
+        دریافت صفحه‌ای از موجودی محصولات
+        
+        Args:
+            page: شماره صفحه
+            items_per_page: تعداد آیتم در هر صفحه
+            cursor: کلید مرزی صفحه مجاور برای keyset (از callback_data)
+            direction: جهت cursor (CURSOR_NEXT / CURSOR_PREV)
+            
+        Returns:
+            دیکشنری شامل: products, page, total_pages, text, prev_cursor, next_cursor
+        """
+        pagination_result = await self.data_manager.get_products_page(
+            page, items_per_page, cursor=cursor, direction=direction
+        )
+        return InventoryService.build_inventory_page(pagination_result)
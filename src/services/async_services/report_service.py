@@ -0,0 +1,51 @@
+"""
+سرویس ناهمگام تولید گزارش‌ها
+"""
+
+from ..common_services.report_service import ReportService
+
+
+class AsyncReportService:
+    """نسخه ناهمگام گزارش‌های ReportService"""
+    
+    def __init__(self, data_manager, inventory_service, sales_service):
+        """
+        Args:
+            data_manager: مدیریت‌کننده داده‌های ناهمگام
+            inventory_service: سرویس ناهمگام موجودی
+            sales_service: سرویس ناهمگام فروش
+        """
+        self.data_manager = data_manager
+        self.inventory_service = inventory_service
+        self.sales_service = sales_service
+    
+    async def generate_summary_report(self) -> str:
+        """
+        تولید گزارش خلاصه
+        
+        Returns:
+            متن گزارش خلاصه
+        """
+        inventory_summary = await self.inventory_service.calculate_inventory_summary(include_low_stock_products=False)
+        sales_summary = await self.sales_service.calculate_sales_summary()
+        
+        return ReportService.format_summary_report(inventory_summary, sales_summary)
+    
+    async def get_full_report_page(self, page: int = 1, items_per_page: int = 5) -> dict:
+        """
+        دریافت صفحه‌ای از گزارش کامل
+        
+        Args:
+            page: شماره صفحه
+            items_per_page: تعداد آیتم در هر صفحه
+            
+        Returns:
+            دیکشنری شامل: text, page, total_pages
+        """
+        products = await self.data_manager.get_all_products()
+        inventory_summary = await self.inventory_service.calculate_inventory_summary()
+        sales_summary = await self.sales_service.calculate_sales_summary()
+        
+        return ReportService.build_full_report_page(
+            products, inventory_summary, sales_summary, page, items_per_page
+        )
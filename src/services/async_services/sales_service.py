@@ -0,0 +1,42 @@
+"""
+سرویس ناهمگام فروش (نمایش و خلاصه)
+"""
+
+from ..sale_services.sales_service import SalesService
+
+
+class AsyncSalesService:
+    """نسخه ناهمگام عملیات خواندنی SalesService"""
+    
+    def __init__(self, data_manager):
+        """
+        Args:
+            data_manager: مدیریت‌کننده داده‌های ناهمگام
+        """
+        self.data_manager = data_manager
+    
+    async def calculate_sales_summary(self) -> dict:
+        """
+        محاسبه خلاصه فروش‌ها
+        
+        Returns:
+            دیکشنری شامل: total_sales, total_revenue, total_cost, total_profit
+        """
+        summary = await self.data_manager.get_sales_summary()
+        return SalesService.build_sales_summary(summary)
+    
+    async def get_sales_page(self, page: int = 1, items_per_page: int = 5, cursor: str = None, direction: str = None) -> dict:
+        """
+        دریافت صفحه‌ای از فروش‌ها برای نمایش
+        
+        Args:
+            page: شماره صفحه
+            items_per_page: تعداد آیتم در هر صفحه
+            cursor: کلید مرزی صفحه مجاور برای keyset (از callback_data)
+            direction: جهت cursor (CURSOR_NEXT / CURSOR_PREV)
+            
+        Returns:
+            دیکشنری شامل: sales, page, total_pages, text, has_sales, message, prev_cursor, next_cursor
+        """
+        pagination_result = await self.data_manager.get_sales_page(page, items_per_page, cursor, direction)
+        return SalesService.build_sales_page(pagination_result)
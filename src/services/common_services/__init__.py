@@ -1,6 +1,8 @@
 from .report_service import ReportService
+from .analytics_service import AnalyticsService
 
 
 __all__ = [
-    'ReportService'
+    'ReportService',
+    'AnalyticsService'
 ]
@@ -0,0 +1,221 @@
+"""
+سرویس گزارش‌های تحلیلی فروش: روند فروش در بازه‌های شمسی (روزانه، هفتگی، ماهانه، سالانه)،
+پرسودترین محصولات و گزارش یک محصول
+"""
+
+from ...utils.jalali import (
+    PERIOD_DAY,
+    PERIOD_WEEK,
+    PERIOD_MONTH,
+    PERIOD_YEAR,
+    period_start,
+    previous_period_start,
+    next_period_start,
+    period_label,
+    local_today,
+)
+from ...utils.pagination import paginate
+from ..sale_services import SalesService
+
+
+# تعداد بازه‌های نمایش داده‌شده در روند فروش (از بازه جاری به عقب)
+TREND_LOOKBACK = {
+    PERIOD_DAY: 30,
+    PERIOD_WEEK: 12,
+    PERIOD_MONTH: 12,
+    PERIOD_YEAR: 5,
+}
+TREND_TITLES = {
+    PERIOD_DAY: "روزانه",
+    PERIOD_WEEK: "هفتگی",
+    PERIOD_MONTH: "ماهانه",
+    PERIOD_YEAR: "سالانه",
+}
+
+# بازه‌های گزارش پرسودترین محصولات: ماه جاری، سال جاری، کل
+TOP_WINDOW_ALL = "all"
+TOP_WINDOWS = (PERIOD_MONTH, PERIOD_YEAR, TOP_WINDOW_ALL)
+
+# تعداد ماه‌های روند در گزارش یک محصول
+PRODUCT_TREND_MONTHS = 12
+
+# کلیدهای جمع فروش (خروجی get_daily_sales_totals)
+TOTAL_KEYS = ('total_sales', 'total_quantity', 'total_revenue', 'total_cost', 'total_extra_cost')
+
+
+def margin_percent(totals: dict) -> float:
+    """درصد سود خالص از درآمد (0 اگر درآمدی نیست)"""
+    if not totals['total_revenue']:
+        return 0.0
+    return round(totals['total_profit'] * 100 / totals['total_revenue'], 1)
+
+
+class AnalyticsService:
+    """سرویس گزارش‌های تحلیلی فروش"""
+
+    def __init__(self, data_manager):
+        """
+        Args:
+            data_manager: مدیریت‌کننده داده‌ها
+        """
+        self.data_manager = data_manager
+
+    @staticmethod
+    def _today():
+        """روز جاری به وقت ایران؛ تاریخ فروش‌ها روز شمسی واردشده توسط کاربر است"""
+        return local_today()
+
+    def get_period_totals(self, period: str, periods: int, product_id: int = None, today=None) -> list:
+        """
+        جمع فروش‌ها در آخرین بازه‌های شمسی
+
+        دیتابیس فقط جمع روزانه را برمی‌گرداند (حداکثر یک ردیف برای هر روز، از rollup روزانه یا
+        GROUP BY روی ایندکس (product_id, sale_date))؛ مرز ماه و سال شمسی با date_trunc میلادی
+        هم‌خوان نیست، پس روزها اینجا در بازه‌های شمسی جمع می‌شوند
+
+        Args:
+            period: day, week, month یا year
+            periods: تعداد بازه‌ها (بازه جاری و قبلی‌ها)
+            product_id: فقط فروش‌های یک محصول (اختیاری)
+            today: روز مرجع (پیش‌فرض امروز)
+
+        Returns:
+            لیست (شروع بازه، خلاصه فروش) از جدید به قدیم، شامل بازه‌های بدون فروش
+        """
+        current = period_start(today or self._today(), period)
+        starts = [current]
+        for _ in range(periods - 1):
+            starts.append(previous_period_start(starts[-1], period))
+
+        totals = {start: dict.fromkeys(TOTAL_KEYS, 0) for start in starts}
+        days = self.data_manager.get_daily_sales_totals(
+            starts[-1], next_period_start(current, period), product_id
+        )
+        for day, day_totals in days:
+            bucket = totals[period_start(day, period)]
+            for key, value in day_totals.items():
+                bucket[key] += value
+
+        return [(start, SalesService.build_sales_summary(totals[start])) for start in starts]
+
+    def get_trend_page(self, period: str, page: int = 1, items_per_page: int = 10, today=None) -> dict:
+        """
+        صفحه‌ای از روند فروش در بازه‌های شمسی
+
+        Args:
+            period: day, week, month یا year
+            page: شماره صفحه
+            items_per_page: تعداد بازه در هر صفحه
+            today: روز مرجع (پیش‌فرض امروز)
+
+        Returns:
+            دیکشنری شامل: text, page, total_pages
+        """
+        rows = self.get_period_totals(period, TREND_LOOKBACK[period], today=today)
+        pagination_result = paginate(rows, page, items_per_page)
+
+        text = f"📈 *روند فروش {TREND_TITLES[period]}* (صفحه {pagination_result['page']}/{pagination_result['total_pages']})\n\n"
+        for start, summary in pagination_result['items']:
+            text += f"📅 *{period_label(start, period)}*\n"
+            if summary['total_sales']:
+                text += (
+                    f"  {summary['total_sales']} فروش | درآمد: {summary['total_revenue']} | "
+                    f"سود: {summary['total_profit']}\n"
+                )
+            else:
+                text += "  بدون فروش\n"
+
+        return {
+            'text': text,
+            'page': pagination_result['page'],
+            'total_pages': pagination_result['total_pages']
+        }
+
+    def get_top_products_page(self, window: str, page: int = 1, items_per_page: int = 10, today=None) -> dict:
+        """
+        صفحه‌ای از محصولات مرتب بر اساس سود خالص همراه با حاشیه سود
+
+        Args:
+            window: month (ماه جاری)، year (سال جاری) یا all (کل)
+            page: شماره صفحه
+            items_per_page: تعداد محصول در هر صفحه
+            today: روز مرجع (پیش‌فرض امروز)
+
+        Returns:
+            دیکشنری شامل: products, page, total_pages, text
+        """
+        start = end = None
+        title = "کل فروش‌ها"
+        if window != TOP_WINDOW_ALL:
+            start = period_start(today or self._today(), window)
+            end = next_period_start(start, window)
+            title = period_label(start, window)
+
+        pagination_result = self.data_manager.get_product_sales_totals_page(start, end, page, items_per_page)
+
+        if not pagination_result['total_items']:
+            return {
+                'products': [],
+                'page': 1,
+                'total_pages': 1,
+                'text': f"🏆 *پرسودترین محصولات* ({title})\n\n❌ فروشی در این بازه ثبت نشده است."
+            }
+
+        text = f"🏆 *پرسودترین محصولات* ({title}) (صفحه {pagination_result['page']}/{pagination_result['total_pages']})\n\n"
+        rank = (pagination_result['page'] - 1) * items_per_page
+        products = []
+        for item in pagination_result['items']:
+            rank += 1
+            summary = SalesService.build_sales_summary(item)
+            text += (
+                f"{rank}. {item['product_name']}\n"
+                f"  سود: {summary['total_profit']} | حاشیه سود: {margin_percent(summary)}% | "
+                f"{item['total_quantity']} عدد در {summary['total_sales']} فروش\n"
+            )
+            products.append({'id': item['product_id'], 'name': item['product_name']})
+
+        return {
+            'products': products,
+            'page': pagination_result['page'],
+            'total_pages': pagination_result['total_pages'],
+            'text': text
+        }
+
+    def get_product_report(self, product_id: int) -> dict:
+        """
+        گزارش یک محصول: جمع کل، حاشیه سود و روند ماهانه (ماه‌های شمسی)
+
+        Args:
+            product_id: شناسه محصول
+
+        Returns:
+            دیکشنری شامل: success, text
+        """
+        product = self.data_manager.get_product(product_id)
+        if not product:
+            return {'success': False, 'text': "❌ محصول یافت نشد."}
+
+        summary = SalesService.build_sales_summary(self.data_manager.get_product_sales_totals(product_id))
+
+        text = f"📈 *گزارش محصول {product['name']}*\n\n"
+        text += f"📦 موجودی: {product['quantity']} عدد\n"
+        text += f"📊 تعداد فروش: {summary['total_sales']}\n"
+        text += f"💰 کل درآمد: {summary['total_revenue']}\n"
+        text += f"💸 کل هزینه: {summary['total_cost'] + summary['total_extra_cost']}\n"
+        text += f"📈 سود خالص: {summary['total_profit']} (حاشیه سود: {margin_percent(summary)}%)\n"
+
+        months = [
+            (start, month_summary)
+            for start, month_summary in self.get_period_totals(PERIOD_MONTH, PRODUCT_TREND_MONTHS, product_id)
+            if month_summary['total_sales']
+        ]
+        text += f"\n📅 *فروش ماهانه ({PRODUCT_TREND_MONTHS} ماه اخیر):*\n"
+        if not months:
+            text += "بدون فروش\n"
+        for start, month_summary in months:
+            text += (
+                f"• {period_label(start, PERIOD_MONTH)}: {month_summary['total_sales']} فروش | "
+                f"سود: {month_summary['total_profit']}\n"
+            )
+
+        return {'success': True, 'text': text}
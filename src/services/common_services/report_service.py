@@ -2,7 +2,15 @@
 سرویس تولید گزارش‌ها
 """
 
+from ...core.config import settings
 from ...utils.pagination import paginate
+from ...utils.table_io import table_writer
+
+
+# ستون‌های فایل گزارش فروش
+SALES_REPORT_HEADER = (
+    "شماره", "محصول", "تعداد", "قیمت واحد", "کل فروش", "کل خرید", "هزینه جانبی", "سود خالص", "تاریخ"
+)
 
 
 class ReportService:
@@ -57,13 +65,11 @@ class ReportService:
         Returns:
             متن گزارش
         """
-        sales = self.data_manager.get_all_sales()
+        summary = self.sales_service.calculate_sales_summary()
         
-        if not sales:
+        if not summary['total_sales']:
             return "💳 *گزارش فروش‌ها*\n\n❌ هیچ فروشی ثبت نشده است."
         
-        summary = self.sales_service.calculate_sales_summary()
-        
         text = "💳 *گزارش فروش‌ها*\n\n"
         text += f"📊 تعداد فروش: {summary['total_sales']}\n"
         text += f"💰 کل درآمد: {summary['total_revenue']}\n"
@@ -85,6 +91,55 @@ class ReportService:
         
         return f"📊 *گزارش کامل فروشگاه*\n\n{inventory_report}\n\n{sales_report}"
     
+    def write_sales_report(self, stream, extension: str = ".csv", progress=None) -> dict:
+        """
+        نوشتن گزارش کامل فروش‌ها در فایل (CSV یا XLSX)
+        
+        فروش‌ها با cursor سمت سرور دسته‌ای خوانده و مستقیم در فایل نوشته می‌شوند،
+        پس حافظه مستقل از تعداد فروش‌هاست؛ خلاصه (از rollup) در انتهای فایل می‌آید.
+        
+        Args:
+            stream: فایل باینری مقصد (فایل موقت یا بافر)
+            extension: ".csv" یا ".xlsx"
+            progress: تابع اختیاری progress(تعداد نوشته‌شده) بعد از هر دسته
+            
+        Returns:
+            دیکشنری شامل: total_sales
+        """
+        total = 0
+        with table_writer(stream, extension, sheet_title="sales") as writer:
+            writer.writerow(SALES_REPORT_HEADER)
+            for sales in self.data_manager.iter_sale_batches(settings.BULK_BATCH_SIZE):
+                writer.writerows(
+                    (
+                        sale.id,
+                        sale.product_name,
+                        sale.quantity,
+                        sale.unit_price,
+                        sale.total_sale_price,
+                        sale.total_cost,
+                        sale.extra_cost,
+                        sale.net_profit,
+                        sale.date,
+                    )
+                    for sale in sales
+                )
+                total += len(sales)
+                if progress is not None:
+                    progress(total)
+            
+            summary = self.sales_service.calculate_sales_summary()
+            writer.writerow(())
+            writer.writerows((
+                ("تعداد فروش", summary['total_sales']),
+                ("کل درآمد", summary['total_revenue']),
+                ("کل هزینه", summary['total_cost']),
+                ("هزینه‌های جانبی", summary['total_extra_cost']),
+                ("سود خالص", summary['total_profit']),
+            ))
+        
+        return {'total_sales': total}
+    
     def generate_summary_report(self) -> str: 
         """
         تولید گزارش خلاصه
@@ -92,9 +147,20 @@ class ReportService:
         Returns:
             متن گزارش خلاصه
         """
-        inventory_summary = self.inventory_service.calculate_inventory_summary()
+        # فقط شمارش‌ها لازم است، نه لیست محصولات کم‌موجود
+        inventory_summary = self.inventory_service.calculate_inventory_summary(include_low_stock_products=False)
         sales_summary = self.sales_service.calculate_sales_summary()
         
+        return self.format_summary_report(inventory_summary, sales_summary)
+    
+    @staticmethod
+    def format_summary_report(inventory_summary: dict, sales_summary: dict) -> str:
+        """
+        فرمت‌بندی گزارش خلاصه از خلاصه موجودی و فروش
+        
+        Returns:
+            متن گزارش خلاصه
+        """
         text = "📊 *گزارش خلاصه*\n\n"
         text += "📦 *موجودی:*\n"
         text += f"  • کل محصولات: {inventory_summary['total_products']}\n"
@@ -126,6 +192,24 @@ class ReportService:
         inventory_summary = self.inventory_service.calculate_inventory_summary()
         sales_summary = self.sales_service.calculate_sales_summary()
         
+        return self.build_full_report_page(products, inventory_summary, sales_summary, page, items_per_page)
+    
+    @staticmethod
+    def build_full_report_page(products: list, inventory_summary: dict, sales_summary: dict,
+                               page: int = 1, items_per_page: int = 5) -> dict:
+        """
+        ساخت صفحه‌ای از گزارش کامل از داده‌های آماده
+        
+        Args:
+            products: تمام محصولات
+            inventory_summary: خلاصه موجودی (همراه با لیست کم‌موجودها)
+            sales_summary: خلاصه فروش
+            page: شماره صفحه
+            items_per_page: تعداد آیتم در هر صفحه
+            
+        Returns:
+            دیکشنری شامل: text, page, total_pages
+        """
         # ساخت لیست محصولات برای صفحه‌بندی (کم‌موجود اول، سپس عادی)
         product_items = []
         
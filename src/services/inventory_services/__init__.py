@@ -1,6 +1,8 @@
 from .inventory_service import InventoryService
+from .product_transfer_service import ProductTransferService
 
 
 __all__ = [
-    'InventoryService'
+    'InventoryService',
+    'ProductTransferService'
 ]
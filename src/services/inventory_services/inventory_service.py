@@ -4,7 +4,7 @@
 
 from ...validations.deletion_validation import DeletionValidator
 from ...validations.product_validation import ProductValidator
-from ...utils.pagination import paginate
+from ...utils.constants import LOW_STOCK_THRESHOLD
 
 
 class InventoryService:
@@ -19,24 +19,38 @@ class InventoryService:
         self.deletion_validator = DeletionValidator(data_manager)
         self.product_validator = ProductValidator(data_manager)
     
-    def calculate_inventory_summary(self) -> dict: 
+    def calculate_inventory_summary(self, include_low_stock_products: bool = True) -> dict: 
         """
         محاسبه خلاصه موجودی
         
+        Args:
+            include_low_stock_products: دریافت لیست محصولات کم‌موجود (یک کوئری اضافه)
+        
         Returns:
-            دیکشنری شامل: total_products, total_items, low_stock_products
+            دیکشنری شامل: total_products, total_items, low_stock_count, low_stock_products
         """
-        products = self.data_manager.get_all_products()
+        summary = self.data_manager.get_inventory_summary()
         
-        total_products = len(products)
-        total_items = sum(p.get('quantity', 0) for p in products)
-        low_stock = [p for p in products if 0 < p.get('quantity', 0) <= 2]
+        if include_low_stock_products and summary['low_stock_count']:
+            low_stock = self.data_manager.get_low_stock_products(LOW_STOCK_THRESHOLD)
+        else:
+            low_stock = []
+        
+        return self.build_inventory_summary(summary, low_stock)
+    
+    @staticmethod
+    def build_inventory_summary(summary: dict, low_stock: list) -> dict:
+        """
+        ساخت خلاصه موجودی از جمع‌های rollup و لیست کم‌موجودها
         
+        Returns:
+            دیکشنری شامل: total_products, total_items, low_stock_count, low_stock_products
+        """
         return {
-            'total_products': total_products,
-            'total_items': total_items,
+            'total_products': summary['total_products'],
+            'total_items': summary['total_items'],
             'low_stock_products': low_stock,
-            'low_stock_count': len(low_stock)
+            'low_stock_count': summary['low_stock_count']
         }
     
     def delete_product(self, product_id: int) -> dict:
@@ -196,20 +210,33 @@ class InventoryService:
             'error_message': None
         }
     
-    def get_inventory_page(self, page: int = 1, items_per_page: int = 5) -> dict:
+    def get_inventory_page(self, page: int = 1, items_per_page: int = 5, cursor: str = None, direction: str = None) -> dict:
         """
         دریافت صفحه‌ای از موجودی محصولات
         
         Args:
             page: شماره صفحه
             items_per_page: تعداد آیتم در هر صفحه
+            cursor: کلید مرزی صفحه مجاور برای keyset (از callback_data)
+            direction: جهت cursor (CURSOR_NEXT / CURSOR_PREV)
             
         Returns:
-            دیکشنری شامل: products, page, total_pages, text
+            دیکشنری شامل: products, page, total_pages, text, prev_cursor, next_cursor
         """
-        all_products = self.data_manager.get_all_products()
+        # صفحه‌بندی در دیتابیس (keyset با cursor، در غیر این صورت LIMIT/OFFSET)
+        pagination_result = self.data_manager.get_products_page(page, items_per_page, cursor=cursor, direction=direction)
         
-        if not all_products:
+        return self.build_inventory_page(pagination_result)
+    
+    @staticmethod
+    def build_inventory_page(pagination_result: dict) -> dict:
+        """
+        ساخت متن صفحه موجودی از نتیجه صفحه‌بندی
+        
+        Returns:
+            دیکشنری شامل: products, page, total_pages, text, prev_cursor, next_cursor
+        """
+        if not pagination_result['total_items']:
             return {
                 'products': [],
                 'page': 1,
@@ -217,9 +244,6 @@ class InventoryService:
                 'text': "📦 *موجودی محصولات*\n\n❌ هیچ محصولی ثبت نشده است."
             }
         
-        # استفاده از تابع paginate
-        pagination_result = paginate(all_products, page, items_per_page)
-        
         # ساخت متن
         text = f"📦 *موجودی محصولات* (صفحه {pagination_result['page']}/{pagination_result['total_pages']})\n\n"
         for product in pagination_result['items']:
@@ -231,23 +255,28 @@ class InventoryService:
             'products': pagination_result['items'],
             'page': pagination_result['page'],
             'total_pages': pagination_result['total_pages'],
-            'text': text
+            'text': text,
+            'prev_cursor': pagination_result.get('prev_cursor'),
+            'next_cursor': pagination_result.get('next_cursor')
         }
     
-    def get_products_for_edit_page(self, page: int = 1, items_per_page: int = 5) -> dict:
+    def get_products_for_edit_page(self, page: int = 1, items_per_page: int = 5, cursor: str = None, direction: str = None) -> dict:
         """
         دریافت صفحه‌ای از محصولات برای ویرایش
         
         Args:
             page: شماره صفحه
             items_per_page: تعداد آیتم در هر صفحه
+            cursor: کلید مرزی صفحه مجاور برای keyset (از callback_data)
+            direction: جهت cursor (CURSOR_NEXT / CURSOR_PREV)
             
         Returns:
-            دیکشنری شامل: products, page, total_pages, text, has_products
+            دیکشنری شامل: products, page, total_pages, text, has_products, prev_cursor, next_cursor
         """
-        all_products = self.data_manager.get_all_products()
+        # صفحه‌بندی در دیتابیس (keyset با cursor، در غیر این صورت LIMIT/OFFSET)
+        pagination_result = self.data_manager.get_products_page(page, items_per_page, cursor=cursor, direction=direction)
         
-        if not all_products:
+        if not pagination_result['total_items']:
             return {
                 'products': [],
                 'page': 1,
@@ -256,9 +285,6 @@ class InventoryService:
                 'has_products': False
             }
         
-        # استفاده از تابع paginate
-        pagination_result = paginate(all_products, page, items_per_page)
-        
         # ساخت متن
         text = f"✏️ *محصول مورد نظر را انتخاب کنید* (صفحه {pagination_result['page']}/{pagination_result['total_pages']})\n\n"
         for product in pagination_result['items']:
@@ -271,5 +297,7 @@ class InventoryService:
             'page': pagination_result['page'],
             'total_pages': pagination_result['total_pages'],
             'text': text,
-            'has_products': True
+            'has_products': True,
+            'prev_cursor': pagination_result.get('prev_cursor'),
+            'next_cursor': pagination_result.get('next_cursor')
         }
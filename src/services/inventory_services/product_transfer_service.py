@@ -0,0 +1,133 @@
+"""
+سرویس ورود و خروج گروهی محصولات با فایل (CSV / XLSX)
+"""
+
+from ...core.config import settings
+from ...utils.constants import MAX_REPORTED_ERRORS
+from ...utils.table_io import iter_table_rows, map_columns, csv_writer
+from ...validations.product_validation import ProductValidator
+
+
+# نام‌های قابل قبول ستون‌ها در ردیف عنوان (بدون عنوان: ستون اول نام و ستون دوم موجودی)
+PRODUCT_COLUMNS = {
+    'name': ('name', 'product', 'نام', 'نام محصول', 'محصول'),
+    'stock': ('stock', 'quantity', 'qty', 'موجودی', 'تعداد'),
+}
+EXPORT_HEADER = ('id', 'name', 'stock')
+
+
+class ProductTransferService:
+    """سرویس ورود و خروج گروهی محصولات"""
+
+    def __init__(self, data_manager, batch_size: int = None):
+        """
+        Args:
+            data_manager: مدیریت‌کننده داده‌ها
+            batch_size: تعداد ردیف در هر تراکنش (پیش‌فرض BULK_BATCH_SIZE)
+        """
+        self.data_manager = data_manager
+        self.batch_size = batch_size or settings.BULK_BATCH_SIZE
+        self.product_validator = ProductValidator(data_manager)
+
+    def import_products(self, stream, filename: str, progress=None) -> dict:
+        """
+        ورود محصولات از فایل: ردیف‌ها جریانی خوانده، ولیدیشن و به صورت دسته‌ای upsert می‌شوند
+        (محصول موجود با همان نام: موجودی آن با مقدار فایل جایگزین می‌شود)
+
+        Args:
+            stream: فایل باینری
+            filename: نام فایل (برای تشخیص CSV یا XLSX)
+            progress: تابع اختیاری progress(نتیجه تا این لحظه) بعد از هر دسته
+
+        Returns:
+            دیکشنری شامل: total_rows, created, updated, invalid, errors (لیست پیام‌ها با شماره ردیف)
+        """
+        result = {'total_rows': 0, 'created': 0, 'updated': 0, 'invalid': 0, 'errors': []}
+        columns = None
+        # نام -> موجودی؛ تکرار یک نام در یک دسته: آخرین مقدار (یک ردیف در ON CONFLICT)
+        batch = {}
+
+        for line, cells in iter_table_rows(stream, filename):
+            if columns is None:
+                columns = map_columns(cells, PRODUCT_COLUMNS)
+                if columns:
+                    # ردیف عنوان
+                    continue
+                columns = {'name': 0, 'stock': 1}
+
+            result['total_rows'] += 1
+            product = self._validate_row(cells, columns)
+            if isinstance(product, str):
+                self._add_error(result, line, product)
+                continue
+
+            name, stock = product
+            batch[name] = stock
+            if len(batch) >= self.batch_size:
+                self._flush(batch, result, progress)
+
+        self._flush(batch, result, progress)
+        return result
+
+    def _validate_row(self, cells: list, columns: dict):
+        """
+        ولیدیشن یک ردیف با همان قوانین افزودن تکی محصول
+
+        Returns:
+            (name, stock) یا پیام خطا
+        """
+        def cell(column):
+            index = columns[column]
+            return cells[index] if index < len(cells) else ""
+
+        name_validation = self.product_validator.validate_product_name(cell('name'))
+        if not name_validation['is_valid']:
+            return name_validation['error_message']
+
+        quantity_validation = self.product_validator.validate_product_quantity(cell('stock'))
+        if not quantity_validation['is_valid']:
+            return quantity_validation['error_message']
+
+        return name_validation['name'], quantity_validation['quantity']
+
+    @staticmethod
+    def _add_error(result: dict, line: int, message: str):
+        """ثبت ردیف نامعتبر (فقط چند خطای اول با متن)"""
+        result['invalid'] += 1
+        if len(result['errors']) < MAX_REPORTED_ERRORS:
+            result['errors'].append(f"ردیف {line}: {message}")
+
+    def _flush(self, batch: dict, result: dict, progress):
+        """ذخیره یک دسته در یک تراکنش"""
+        if not batch:
+            return
+
+        written = self.data_manager.upsert_products(batch)
+        result['created'] += written['created']
+        result['updated'] += written['updated']
+        batch.clear()
+
+        if progress is not None:
+            progress(result)
+
+    def export_products(self, stream, progress=None) -> dict:
+        """
+        خروجی CSV تمام محصولات؛ محصولات دسته‌ای خوانده و مستقیم در فایل نوشته می‌شوند
+
+        Args:
+            stream: فایل باینری مقصد (مثلاً فایل موقت)
+            progress: تابع اختیاری progress(تعداد نوشته‌شده) بعد از هر دسته
+
+        Returns:
+            دیکشنری شامل: total_products
+        """
+        total = 0
+        with csv_writer(stream) as writer:
+            writer.writerow(EXPORT_HEADER)
+            for products in self.data_manager.iter_product_batches(self.batch_size):
+                writer.writerows((product.id, product.name, product.stock) for product in products)
+                total += len(products)
+                if progress is not None:
+                    progress(total)
+
+        return {'total_products': total}
@@ -1,6 +1,8 @@
 from .sales_service import SalesService
+from .sale_import_service import SaleImportService
 
 
 __all__ = [
-    'SalesService'
+    'SalesService',
+    'SaleImportService'
 ]
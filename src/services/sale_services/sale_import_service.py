@@ -0,0 +1,93 @@
+"""
+سرویس ورود گروهی فروش‌ها از فایل (CSV / XLSX)
+"""
+
+from ...core.config import settings
+from ...utils.constants import MAX_REPORTED_ERRORS
+from ...utils.table_io import iter_table_rows, map_columns
+from .sales_service import SalesService
+
+
+# نام‌های قابل قبول ستون‌ها در ردیف عنوان
+# (بدون عنوان به همین ترتیب: محصول، تعداد، کل فروش، کل خرید، هزینه جانبی، تاریخ)
+SALE_COLUMNS = {
+    'product_name': ('product', 'product_name', 'name', 'محصول', 'نام محصول'),
+    'quantity': ('quantity', 'qty', 'تعداد'),
+    'total_sale_price': ('total_sale', 'total_sale_price', 'sale', 'کل فروش', 'مبلغ فروش'),
+    'total_cost': ('total_cost', 'cost', 'کل خرید', 'هزینه خرید'),
+    'extra_cost': ('extra_cost', 'extra', 'هزینه جانبی', 'هزینه‌های جانبی'),
+    'date': ('date', 'تاریخ'),
+}
+OPTIONAL_COLUMNS = ('extra_cost', 'date')
+
+
+class SaleImportService:
+    """سرویس ورود گروهی فروش‌ها"""
+
+    def __init__(self, data_manager, batch_size: int = None):
+        """
+        Args:
+            data_manager: مدیریت‌کننده داده‌ها
+            batch_size: تعداد فروش در هر تراکنش (پیش‌فرض BULK_BATCH_SIZE)
+        """
+        self.data_manager = data_manager
+        self.batch_size = batch_size or settings.BULK_BATCH_SIZE
+        self.sales_service = SalesService(data_manager)
+
+    def import_sales(self, stream, filename: str, progress=None) -> dict:
+        """
+        ورود فروش‌ها از فایل: ردیف‌ها جریانی خوانده و در دسته‌های batch_size با
+        SalesService.create_sales_bulk ثبت می‌شوند (هر دسته یک تراکنش)
+
+        Args:
+            stream: فایل باینری
+            filename: نام فایل (برای تشخیص CSV یا XLSX)
+            progress: تابع اختیاری progress(نتیجه تا این لحظه) بعد از هر دسته
+
+        Returns:
+            دیکشنری شامل: total_rows, created, invalid, failed_batches, errors (لیست پیام‌ها)
+        """
+        result = {'total_rows': 0, 'created': 0, 'invalid': 0, 'failed_batches': 0, 'errors': []}
+        columns = None
+        batch = []
+
+        for line, cells in iter_table_rows(stream, filename):
+            if columns is None:
+                columns = map_columns(cells, SALE_COLUMNS, OPTIONAL_COLUMNS)
+                if columns:
+                    # ردیف عنوان
+                    continue
+                columns = {column: index for index, column in enumerate(SALE_COLUMNS)}
+
+            result['total_rows'] += 1
+            sale = {
+                column: cells[index]
+                for column, index in columns.items()
+                if index < len(cells) and cells[index]
+            }
+            sale['line'] = line
+            batch.append(sale)
+            if len(batch) >= self.batch_size:
+                self._flush(batch, result, progress)
+
+        self._flush(batch, result, progress)
+        return result
+
+    def _flush(self, batch: list, result: dict, progress):
+        """ثبت یک دسته در یک تراکنش"""
+        if not batch:
+            return
+
+        written = self.sales_service.create_sales_bulk(batch)
+        result['created'] += written['created']
+        result['invalid'] += written['invalid']
+        room = MAX_REPORTED_ERRORS - len(result['errors'])
+        result['errors'].extend(written['errors'][:max(0, room)])
+        if not written['success']:
+            # دسته به خاطر تغییر هم‌زمان موجودی rollback شد
+            result['failed_batches'] += 1
+            result['errors'].append(f"ردیف‌های {batch[0]['line']} تا {batch[-1]['line']}: {written['error_message']}")
+        batch.clear()
+
+        if progress is not None:
+            progress(result)
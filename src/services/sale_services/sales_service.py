@@ -2,9 +2,8 @@
 سرویس مدیریت فروش‌ها و محاسبات
 """
 
-from ...validations.deletion_validation import DeletionValidator
+from ...utils.constants import MAX_REPORTED_ERRORS
 from ...validations.sale_validation import SaleValidator, SaleInputValidator
-from ...utils.pagination import paginate
 
 
 class SalesService:
@@ -16,7 +15,6 @@ class SalesService:
             data_manager: مدیریت‌کننده داده‌ها
         """
         self.data_manager = data_manager
-        self.deletion_validator = DeletionValidator(data_manager)
         self.sale_validator = SaleValidator(data_manager)
         self.input_validator = SaleInputValidator(data_manager)
 
@@ -70,16 +68,26 @@ class SalesService:
         Returns:
             دیکشنری شامل: total_sales, total_revenue, total_cost, total_profit
         """
-        sales = self.data_manager.get_all_sales()
+        # یک رفت‌وبرگشت COUNT/SUM به جای بارگذاری تمام فروش‌ها
+        summary = self.data_manager.get_sales_summary()
         
-        total_sales = len(sales)
-        total_revenue = sum(s.get('total_sale_price', 0) for s in sales)
-        total_cost = sum(s.get('total_cost', 0) for s in sales)
-        total_extra_cost = sum(s.get('extra_cost', 0) for s in sales)
+        return self.build_sales_summary(summary)
+    
+    @staticmethod
+    def build_sales_summary(summary: dict) -> dict:
+        """
+        ساخت خلاصه فروش (همراه با سود خالص) از جمع‌های rollup
+        
+        Returns:
+            دیکشنری شامل: total_sales, total_revenue, total_cost, total_extra_cost, total_profit
+        """
+        total_revenue = summary['total_revenue']
+        total_cost = summary['total_cost']
+        total_extra_cost = summary['total_extra_cost']
         total_profit = total_revenue - total_cost - total_extra_cost
         
         return {
-            'total_sales': total_sales,
+            'total_sales': summary['total_sales'],
             'total_revenue': total_revenue,
             'total_cost': total_cost,
             'total_extra_cost': total_extra_cost,
@@ -88,7 +96,7 @@ class SalesService:
     
     def delete_sale(self, sale_id: int) -> dict: 
         """
-        حذف فروش و بازگرداندن موجودی
+        حذف فروش و بازگرداندن موجودی (در یک تراکنش)
         
         Args:
             sale_id: شناسه فروش
@@ -96,23 +104,7 @@ class SalesService:
         Returns:
             دیکشنری شامل: sale (فروش حذف‌شده یا None)
         """
-        validation = self.deletion_validator.validate_sale_deletion(sale_id)
-        
-        if not validation['is_valid']:
-            return None
-        
-        sale = validation['sale']
-        
-        # بازگرداندن موجودی
-        if 'product_id' in sale:
-            product = self.data_manager.find_product_by_name(sale['product_name'])
-            if product:
-                self.data_manager.increase_inventory(product['id'], sale['quantity'])
-        
-        # حذف فروش
-        self.data_manager.delete_sale(sale_id)
-        
-        return sale
+        return self.data_manager.delete_sale_with_stock(sale_id)
     
     def get_sale_details(self, sale_id: int) -> dict: 
         """
@@ -156,17 +148,6 @@ class SalesService:
         product_id = sale_data.get('product_id')
         quantity = sale_data.get('quantity')
         
-        # ولیدیشن دسترسی محصول
-        availability = self.input_validator.validate_product_availability(product_id, quantity)
-        if not availability['is_valid']:
-            return {
-                'success': False,
-                'sale_id': None,
-                'summary': None,
-                'error_message': availability['error_message'],
-                'remaining_qty': None
-            }
-        
         # ولیدیشن تاریخ
         date_validation = self.input_validator.validate_sale_date(sale_data.get('date', ''))
         if not date_validation['is_valid']:
@@ -213,26 +194,30 @@ class SalesService:
         
         # استفاده از داده‌های ولیدیشن‌شده
         sale_data['date'] = date_validation['date']
+        sale_data['sale_date'] = date_validation['sale_date']
         sale_data['total_sale_price'] = price_validation['price']
         sale_data['total_cost'] = cost_validation['cost']
         sale_data['extra_cost'] = extra_cost_validation['extra_cost']
         
-        # کم کردن موجودی
-        if not self.data_manager.reduce_inventory(product_id, quantity):
+        # کم کردن اتمیک موجودی و ثبت فروش در یک تراکنش
+        result = self.data_manager.add_sale_with_stock(sale_data)
+        if result is None:
+            # فقط در حالت شکست محصول خوانده می‌شود تا پیام خطای دقیق ساخته شود
+            availability = self.input_validator.validate_product_availability(product_id, quantity)
+            error_message = (
+                availability['error_message'] if not availability['is_valid']
+                else '❌ خطا در کم کردن موجودی! لطفاً دوباره تلاش کنید.'
+            )
             return {
                 'success': False,
                 'sale_id': None,
                 'summary': None,
-                'error_message': '❌ خطا در کم کردن موجودی! لطفاً دوباره تلاش کنید.',
+                'error_message': error_message,
                 'remaining_qty': None
             }
         
-        # اضافه کردن فروش
-        sale_id = self.data_manager.add_sale(sale_data)
-        
-        # دریافت موجودی باقی‌مانده
-        current_product = self.data_manager.get_product(product_id)
-        remaining_qty = current_product['quantity'] if current_product else 0
+        sale_id = result['sale_id']
+        remaining_qty = result['remaining_stock']
         
         # فرمت‌بندی خلاصه
         summary = self.format_sale_summary(sale_data)
@@ -246,6 +231,114 @@ class SalesService:
             'remaining_qty': remaining_qty
         }
     
+    def create_sales_bulk(self, sales: list) -> dict:
+        """
+        ثبت گروهی فروش‌ها در یک تراکنش
+        
+        کل دسته در حافظه ولیدیشن می‌شود (محصولات با یک کوئری خوانده می‌شوند)؛ فروش‌هایی که
+        از موجودی باقی‌مانده محصول (بعد از فروش‌های قبلی همین دسته) بیشتر باشند کنار گذاشته می‌شوند.
+        
+        Args:
+            sales: لیست داده‌های فروش با کلیدهای product_id یا product_name، quantity,
+                total_sale_price, total_cost, extra_cost (اختیاری), date (اختیاری)، و line (اختیاری، برای پیام خطا)
+            
+        Returns:
+            دیکشنری شامل: success (bool), created, invalid, errors (لیست پیام‌ها), remaining_stock, error_message (str|None)
+        """
+        result = {
+            'success': True,
+            'created': 0,
+            'invalid': 0,
+            'errors': [],
+            'remaining_stock': {},
+            'error_message': None
+        }
+        
+        # خواندن تمام محصولات دسته با یک کوئری
+        products = self.data_manager.find_products(
+            product_ids={sale['product_id'] for sale in sales if sale.get('product_id') is not None},
+            names={sale['product_name'] for sale in sales if sale.get('product_id') is None and sale.get('product_name')}
+        )
+        by_id = {product.id: product for product in products}
+        by_name = {product.name: product for product in products}
+        # موجودی باقی‌مانده هر محصول بعد از فروش‌های پذیرفته‌شده قبلی در همین دسته
+        available = {product.id: product.stock for product in products}
+        
+        valid_sales = []
+        for index, sale in enumerate(sales, start=1):
+            if sale.get('product_id') is not None:
+                product = by_id.get(sale['product_id'])
+            else:
+                product = by_name.get(sale.get('product_name'))
+            
+            if product is None:
+                error_message = '❌ محصول یافت نشد.'
+            else:
+                sale_data, error_message = self._validate_bulk_sale(sale, available[product.id])
+            
+            if error_message:
+                result['invalid'] += 1
+                if len(result['errors']) < MAX_REPORTED_ERRORS:
+                    result['errors'].append(f"ردیف {sale.get('line', index)}: {error_message}")
+                continue
+            
+            sale_data['product_id'] = product.id
+            available[product.id] -= sale_data['quantity']
+            valid_sales.append(sale_data)
+        
+        if not valid_sales:
+            return result
+        
+        # یک UPDATE برای موجودی تمام محصولات و یک INSERT چندردیفی برای فروش‌ها
+        written = self.data_manager.add_sales_with_stock_bulk(valid_sales)
+        if written is None:
+            result['success'] = False
+            result['error_message'] = '❌ موجودی برخی محصولات هم‌زمان تغییر کرد. لطفاً دوباره تلاش کنید.'
+            return result
+        
+        result['created'] = written['created']
+        result['remaining_stock'] = written['remaining_stock']
+        return result
+    
+    def _validate_bulk_sale(self, sale: dict, available_quantity: int):
+        """
+        ولیدیشن یک فروش دسته با همان قوانین ثبت تکی فروش
+        
+        Returns:
+            (داده‌های ولیدیشن‌شده، None) یا (None, پیام خطا)
+        """
+        quantity_validation = self.input_validator.validate_sale_quantity(sale.get('quantity'), available_quantity)
+        if not quantity_validation['is_valid']:
+            return None, quantity_validation['error_message'].splitlines()[0]
+        
+        price_validation = self.input_validator.validate_sale_price(sale.get('total_sale_price'))
+        if not price_validation['is_valid']:
+            return None, price_validation['error_message']
+        
+        cost_validation = self.input_validator.validate_sale_cost(sale.get('total_cost'))
+        if not cost_validation['is_valid']:
+            return None, cost_validation['error_message']
+        
+        extra_cost_validation = self.input_validator.validate_sale_extra_cost(sale.get('extra_cost') or 0)
+        if not extra_cost_validation['is_valid']:
+            return None, extra_cost_validation['error_message']
+        
+        sale_data = {
+            'quantity': quantity_validation['quantity'],
+            'total_sale_price': price_validation['price'],
+            'total_cost': cost_validation['cost'],
+            'extra_cost': extra_cost_validation['extra_cost']
+        }
+        
+        if sale.get('date'):
+            date_validation = self.input_validator.validate_sale_date(sale['date'])
+            if not date_validation['is_valid']:
+                return None, date_validation['error_message'].splitlines()[0]
+            sale_data['date'] = date_validation['date']
+            sale_data['sale_date'] = date_validation['sale_date']
+        
+        return sale_data, None
+    
     def update_sale(self, sale_id: int, sale_data: dict) -> dict: 
         """
         بروزرسانی فروش
@@ -257,14 +350,6 @@ class SalesService:
         Returns:
             دیکشنری شامل: success (bool), error_message (str|None)
         """
-        # ولیدیشن وجود فروش
-        validation = self.sale_validator.validate_sale_exists(sale_id)
-        if not validation['is_valid']:
-            return {
-                'success': False,
-                'error_message': '❌ فروش یافت نشد.'
-            }
-        
         # ولیدیشن تاریخ
         date_validation = self.input_validator.validate_sale_date(sale_data.get('date', ''))
         if not date_validation['is_valid']:
@@ -299,6 +384,7 @@ class SalesService:
         
         # استفاده از داده‌های ولیدیشن‌شده
         sale_data['date'] = date_validation['date']
+        sale_data['sale_date'] = date_validation['sale_date']
         sale_data['total_sale_price'] = price_validation['price']
         sale_data['total_cost'] = cost_validation['cost']
         sale_data['extra_cost'] = extra_cost_validation['extra_cost']
@@ -306,32 +392,53 @@ class SalesService:
         # محاسبه سود خالص
         sale_data['net_profit'] = sale_data['total_sale_price'] - sale_data['total_cost'] - sale_data['extra_cost']
         
-        # بروزرسانی
-        if self.data_manager.update_sale(sale_id, sale_data):
+        # بروزرسانی فروش و اعمال تفاوت تعداد روی موجودی در یک تراکنش
+        result = self.data_manager.update_sale_with_stock(sale_id, sale_data)
+        if result['success']:
             return {
                 'success': True,
                 'error_message': None
             }
         
+        if result['error'] == 'not_found':
+            error_message = '❌ فروش یافت نشد.'
+        elif result['error'] == 'insufficient_stock':
+            error_message = '❌ موجودی محصول برای افزایش تعداد فروش کافی نیست!'
+        else:
+            error_message = '❌ خطا در بروزرسانی فروش!'
+        
         return {
             'success': False,
-            'error_message': '❌ خطا در بروزرسانی فروش!'
+            'error_message': error_message
         }
     
-    def get_sales_page(self, page: int = 1, items_per_page: int = 5) -> dict:
+    def get_sales_page(self, page: int = 1, items_per_page: int = 5, cursor: str = None, direction: str = None) -> dict:
         """
         دریافت صفحه‌ای از فروش‌ها برای نمایش
         
         Args:
             page: شماره صفحه
             items_per_page: تعداد آیتم در هر صفحه
+            cursor: کلید مرزی صفحه مجاور برای keyset (از callback_data)
+            direction: جهت cursor (CURSOR_NEXT / CURSOR_PREV)
             
         Returns:
-            دیکشنری شامل: sales, page, total_pages, text, has_sales, message
+            دیکشنری شامل: sales, page, total_pages, text, has_sales, message, prev_cursor, next_cursor
         """
-        all_sales = self.data_manager.get_all_sales()
+        # صفحه‌بندی در دیتابیس (keyset با cursor، در غیر این صورت LIMIT/OFFSET)
+        pagination_result = self.data_manager.get_sales_page(page, items_per_page, cursor, direction)
         
-        if not all_sales:
+        return self.build_sales_page(pagination_result)
+    
+    @staticmethod
+    def build_sales_page(pagination_result: dict) -> dict:
+        """
+        ساخت متن صفحه فروش‌ها از نتیجه صفحه‌بندی
+        
+        Returns:
+            دیکشنری شامل: sales, page, total_pages, text, has_sales, message, prev_cursor, next_cursor
+        """
+        if not pagination_result['total_items']:
             return {
                 'sales': [],
                 'page': 1,
@@ -341,9 +448,6 @@ class SalesService:
                 'message': '📊 هیچ فروشی ثبت نشده است.'
             }
         
-        # استفاده از تابع paginate
-        pagination_result = paginate(all_sales, page, items_per_page)
-        
         # ساخت متن
         text = f"📊 *لیست فروش‌ها* (صفحه {pagination_result['page']}/{pagination_result['total_pages']})\n\n"
         text += "فروش مورد نظر را انتخاب کنید:"
@@ -354,25 +458,31 @@ class SalesService:
             'total_pages': pagination_result['total_pages'],
             'text': text,
             'has_sales': True,
-            'message': None
+            'message': None,
+            'prev_cursor': pagination_result.get('prev_cursor'),
+            'next_cursor': pagination_result.get('next_cursor')
         }
 
-    def get_products_for_sale_page(self, page: int = 1, items_per_page: int = 5) -> dict:
+    def get_products_for_sale_page(self, page: int = 1, items_per_page: int = 5, cursor: str = None, direction: str = None) -> dict:
         """
         دریافت صفحه‌ای از محصولات برای فروش
         
         Args:
             page: شماره صفحه
             items_per_page: تعداد آیتم در هر صفحه
+            cursor: کلید مرزی صفحه مجاور برای keyset (از callback_data)
+            direction: جهت cursor (CURSOR_NEXT / CURSOR_PREV)
             
         Returns:
-            دیکشنری شامل: products, page, total_pages, text, has_products, message
+            دیکشنری شامل: products, page, total_pages, text, has_products, message, prev_cursor, next_cursor
         """
-        available_products = self.data_manager.get_available_products()
+        # صفحه‌بندی در دیتابیس (keyset با cursor، در غیر این صورت LIMIT/OFFSET)
+        pagination_result = self.data_manager.get_products_page(
+            page, items_per_page, only_available=True, cursor=cursor, direction=direction
+        )
         
-        if not available_products:
-            all_products = self.data_manager.get_all_products()
-            if not all_products:
+        if not pagination_result['total_items']:
+            if not self.data_manager.count_products():
                 return {
                     'products': [],
                     'page': 1,
@@ -391,9 +501,6 @@ class SalesService:
                     'message': '❌ هیچ محصولی با موجودی کافی برای فروش وجود ندارد.\n\nلطفاً ابتدا موجودی محصولات را تکمیل کنید.'
                 }
         
-        # استفاده از تابع paginate
-        pagination_result = paginate(available_products, page, items_per_page)
-        
         # ساخت متن
         text = f"📝 *محصول مورد نظر را از لیست زیر انتخاب کنید* (صفحه {pagination_result['page']}/{pagination_result['total_pages']})\n\n"
         for product in pagination_result['items']:
@@ -406,5 +513,7 @@ class SalesService:
             'total_pages': pagination_result['total_pages'],
             'text': text,
             'has_products': True,
-            'message': None
+            'message': None,
+            'prev_cursor': pagination_result.get('prev_cursor'),
+            'next_cursor': pagination_result.get('next_cursor')
         }
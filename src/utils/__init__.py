@@ -10,6 +10,8 @@ from .constants import (
     SHARE_MENU_TITLE,
     DISABLED_BUTTON_MESSAGE,
     REPORT_SHARED_MESSAGE,
+    LOW_STOCK_THRESHOLD,
+    MAX_REPORTED_ERRORS,
 )
 
 __all__ = [
@@ -24,4 +26,6 @@ __all__ = [
     "SHARE_MENU_TITLE",
     "DISABLED_BUTTON_MESSAGE",
     "REPORT_SHARED_MESSAGE",
+    "LOW_STOCK_THRESHOLD",
+    "MAX_REPORTED_ERRORS",
 ]
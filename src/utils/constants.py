@@ -2,6 +2,12 @@
 پیام‌های ثابت برای هندلرها
 """
 
+# آستانه کم‌موجودی (محصولات با موجودی بین 1 و این مقدار)
+LOW_STOCK_THRESHOLD = 2
+
+# حداکثر تعداد ردیف‌های نامعتبری که در ورود گروهی با متن خطا گزارش می‌شوند
+MAX_REPORTED_ERRORS = 10
+
 HELP_TEXT = """
 📖 *راهنمای کامل استفاده از ربات*
 
@@ -29,6 +35,10 @@ HELP_TEXT = """
 📋 *مشاهده موجودی:*
 • گزینه "📋 مشاهده موجودی" برای دیدن تمام محصولات
 
+📥 *ورود و خروج گروهی:*
+• "📥 ورود از فایل": ارسال فایل CSV یا XLSX (ستون نام و موجودی)
+• "📤 خروجی CSV": دریافت فایل تمام محصولات
+
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 💳 *مدیریت فروش*
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -55,6 +65,9 @@ HELP_TEXT = """
 3️⃣ تأیید حذف را تأیید کنید
 📌 نکته: موجودی محصول بازگردانده می‌شود
 
+📥 *ورود گروهی فروش‌ها:*
+• "📥 ورود فروش‌ها از فایل": ارسال فایل CSV یا XLSX (محصول، تعداد، کل فروش، کل خرید)
+
 📊 *مشاهده فروش‌ها:*
 • گزینه "📊 مشاهده فروش‌ها" برای دیدن تمام فروش‌های ثبت شده
 
@@ -68,8 +81,14 @@ HELP_TEXT = """
 • کل درآمد و هزینه
 • سود و زیان خالص
 
+📈 *تحلیل فروش (منوی فروش):*
+• روند فروش روزانه، هفتگی، ماهانه و سالانه (تقویم شمسی)
+• پرسودترین محصولات این ماه، امسال یا کل، با حاشیه سود
+• گزارش هر محصول با فروش ماهانه آن
+
 📤 *اشتراک‌گذاری گزارش:*
 • گزارش کامل را برای دیگران ارسال کنید
+• "📄 فایل فروش‌ها": دریافت تمام فروش‌ها به صورت فایل CSV یا XLSX
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 💡 *نکات مهم*
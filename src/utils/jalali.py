@@ -0,0 +1,170 @@
+"""
+تبدیل تاریخ شمسی (جلالی) و میلادی و گروه‌بندی تاریخ‌ها در بازه‌های شمسی (روز، هفته، ماه، سال)
+برای گزارش‌های تحلیلی
+"""
+
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import NamedTuple
+
+
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+PERIOD_YEAR = "year"
+PERIODS = (PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH, PERIOD_YEAR)
+
+JALALI_MONTH_NAMES = (
+    "فروردین", "اردیبهشت", "خرداد", "تیر", "مرداد", "شهریور",
+    "مهر", "آبان", "آذر", "دی", "بهمن", "اسفند",
+)
+
+# روز شروع هفته شمسی (شنبه) در date.weekday()
+_WEEK_START = 5
+
+# ساعت رسمی ایران (UTC+03:30، بدون ساعت تابستانی از 1401)؛ تقویمی که تاریخ فروش با آن وارد می‌شود
+IRAN_TIMEZONE = timezone(timedelta(hours=3, minutes=30), "Asia/Tehran")
+
+
+class JalaliDate(NamedTuple):
+    """تاریخ شمسی"""
+
+    year: int
+    month: int
+    day: int
+
+    def __str__(self) -> str:
+        return f"{self.year:04d}/{self.month:02d}/{self.day:02d}"
+
+
+def _jalali_new_year_ordinal(year: int) -> int:
+    """ordinal میلادی (date.toordinal) روز اول فروردین سال شمسی year (روش محاسباتی)"""
+    jy = year + 1595
+    days = -355668 + 365 * jy + (jy // 33) * 8 + ((jy % 33) + 3) // 4 + 1
+    # days از ابتدای سال 0 میلادی (کبیسه، 366 روز) شمرده شده است
+    return days - 365
+
+
+@lru_cache(maxsize=512)
+def _month_starts(year: int) -> tuple:
+    """
+    جدول یک سال شمسی: ordinal میلادی روز اول هر 12 ماه و روز اول سال بعد (13 عدد)
+    هر سال یک بار محاسبه و کش می‌شود؛ تبدیل‌ها بعد از آن فقط جستجو در این جدول‌اند
+    """
+    first = _jalali_new_year_ordinal(year)
+    # شش ماه اول 31 روز، پنج ماه بعد 30 روز، اسفند 29 یا 30 روز (تا شروع سال بعد)
+    starts = [first + 31 * month for month in range(6)]
+    starts += [first + 186 + 30 * month for month in range(6)]
+    starts.append(_jalali_new_year_ordinal(year + 1))
+    return tuple(starts)
+
+
+def month_length(year: int, month: int) -> int:
+    """تعداد روزهای یک ماه شمسی"""
+    starts = _month_starts(year)
+    return starts[month] - starts[month - 1]
+
+
+def local_today() -> date:
+    """روز جاری به وقت ایران (تا 03:30 بامداد، روز UTC هنوز روز قبل است)"""
+    return datetime.now(IRAN_TIMEZONE).date()
+
+
+def to_jalali(value: date) -> JalaliDate:
+    """
+    تبدیل تاریخ میلادی (date یا datetime) به شمسی
+
+    Returns:
+        JalaliDate
+    """
+    ordinal = value.toordinal()
+    # نوروز 20 یا 21 مارس است: قبل از آن سال شمسی year - 622 و بعد از آن year - 621
+    year = value.year - 621
+    starts = _month_starts(year)
+    if ordinal < starts[0]:
+        year -= 1
+        starts = _month_starts(year)
+    month = bisect_right(starts, ordinal)
+    return JalaliDate(year, month, ordinal - starts[month - 1] + 1)
+
+
+def to_gregorian(year: int, month: int, day: int) -> date:
+    """
+    تبدیل تاریخ شمسی به میلادی
+
+    Returns:
+        date
+
+    Raises:
+        ValueError: اگر ماه یا روز در سال شمسی وجود نداشته باشد (مثلاً 1403/07/31)
+    """
+    if not 1 <= month <= 12:
+        raise ValueError(f"invalid Jalali month: {month}")
+    starts = _month_starts(year)
+    if not 1 <= day <= starts[month] - starts[month - 1]:
+        raise ValueError(f"invalid Jalali day: {year}/{month}/{day}")
+    return date.fromordinal(starts[month - 1] + day - 1)
+
+
+def parse_jalali(text: str) -> JalaliDate:
+    """
+    خواندن تاریخ شمسی با فرمت YYYY/MM/DD
+
+    Raises:
+        ValueError: اگر فرمت اشتباه باشد یا چنین روزی وجود نداشته باشد
+    """
+    parts = text.strip().split('/')
+    if len(parts) != 3:
+        raise ValueError(f"invalid Jalali date: {text!r}")
+    value = JalaliDate(*(int(part) for part in parts))
+    to_gregorian(*value)
+    return value
+
+
+def period_start(value: date, period: str) -> date:
+    """
+    تاریخ میلادی شروع بازه شمسی (روز، هفته از شنبه، ماه یا سال) که value در آن است
+    """
+    if period == PERIOD_DAY:
+        return value
+    if period == PERIOD_WEEK:
+        return value - timedelta(days=(value.weekday() - _WEEK_START) % 7)
+    jalali = to_jalali(value)
+    if period == PERIOD_MONTH:
+        return to_gregorian(jalali.year, jalali.month, 1)
+    if period == PERIOD_YEAR:
+        return to_gregorian(jalali.year, 1, 1)
+    raise ValueError(f"unknown period: {period!r}")
+
+
+def previous_period_start(start: date, period: str) -> date:
+    """شروع بازه قبل از بازه‌ای که از start شروع می‌شود"""
+    if period == PERIOD_WEEK:
+        return start - timedelta(days=7)
+    return period_start(start - timedelta(days=1), period)
+
+
+def next_period_start(start: date, period: str) -> date:
+    """شروع بازه بعد از بازه‌ای که از start شروع می‌شود"""
+    if period == PERIOD_DAY:
+        return start + timedelta(days=1)
+    if period == PERIOD_WEEK:
+        return start + timedelta(days=7)
+    # طولانی‌ترین ماه شمسی 31 روز و سال 366 روز است
+    step = 31 if period == PERIOD_MONTH else 366
+    return period_start(start + timedelta(days=step), period)
+
+
+def period_label(start: date, period: str) -> str:
+    """
+    نام بازه برای نمایش؛ مثال: "1403/05/12"، "هفته 1403/05/06"، "مرداد 1403"، "1403"
+    """
+    jalali = to_jalali(start)
+    if period == PERIOD_WEEK:
+        return f"هفته {jalali}"
+    if period == PERIOD_MONTH:
+        return f"{JALALI_MONTH_NAMES[jalali.month - 1]} {jalali.year}"
+    if period == PERIOD_YEAR:
+        return str(jalali.year)
+    return str(jalali)
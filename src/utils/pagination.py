@@ -1,7 +1,62 @@
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+
+# جهت حرکت با cursor: صفحه بعد (بعد از آخرین کلید) یا صفحه قبل (قبل از اولین کلید)
+CURSOR_NEXT = "n"
+CURSOR_PREV = "p"
+
+# محدودیت طول callback_data در تلگرام (بایت)
+MAX_CALLBACK_DATA = 64
+
+# پیشوند callback_data دکمه‌های صفحه‌بندی لیست‌ها و گزارش
+PAGE_CALLBACK_PREFIXES = (
+    "products_page_",
+    "edit_products_page_",
+    "sale_products_page_",
+    "sales_page_",
+    "report_page_",
+    "trend_day_page_",
+    "trend_week_page_",
+    "trend_month_page_",
+    "trend_year_page_",
+    "top_month_page_",
+    "top_year_page_",
+    "top_all_page_",
+)
+
+_EPOCH = datetime(1970, 1, 1)
+_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+class PageRef(NamedTuple):
+    """آدرس یک صفحه: شماره صفحه و در صورت وجود cursor کلید مرزی صفحه مجاور"""
+
+    page: int
+    direction: Optional[str] = None
+    cursor: Optional[str] = None
+
+
+def get_page_bounds(total_items: int, page: int = 1, per_page: int = 5):
+    """
+    محاسبه مرزهای یک صفحه بدون نیاز به داشتن کل آیتم‌ها
+
+    Returns:
+        (page, total_pages, offset)
+    """
+    total_pages = max(1, (total_items + per_page - 1) // per_page)
+
+    # جلوگیری از صفحه غیرمجاز
+    page = max(1, min(page, total_pages))
+
+    offset = (page - 1) * per_page
+    return page, total_pages, offset
+
+
 def paginate(items: list, page: int = 1, per_page: int = 5):
     """
     صفحه‌بندی یک لیست ساده
-    
+
     Returns:
         {
             "items": [...],
@@ -9,13 +64,8 @@ def paginate(items: list, page: int = 1, per_page: int = 5):
             "total_pages": total_pages
         }
     """
-    total_items = len(items)
-    total_pages = max(1, (total_items + per_page - 1) // per_page)
-
-    # جلوگیری از صفحه غیرمجاز
-    page = max(1, min(page, total_pages))
+    page, total_pages, start = get_page_bounds(len(items), page, per_page)
 
-    start = (page - 1) * per_page
     end = start + per_page
     paginated_items = items[start:end]
 
@@ -24,3 +74,103 @@ def paginate(items: list, page: int = 1, per_page: int = 5):
         "page": page,
         "total_pages": total_pages
     }
+
+
+def _to_base36(value: int) -> str:
+    if value < 0:
+        return "-" + _to_base36(-value)
+    digits = ""
+    while True:
+        value, remainder = divmod(value, 36)
+        digits = _DIGITS[remainder] + digits
+        if not value:
+            return digits
+
+
+def encode_cursor(*values: int) -> str:
+    """
+    فشرده‌سازی کلید مرتب‌سازی (اعداد صحیح) برای قرار گرفتن در callback_data
+
+    مثال: (1716212345000000, 4213) -> "gx2b2pz9kw.38t"
+    """
+    return ".".join(_to_base36(value) for value in values)
+
+
+def decode_cursor(cursor: str, size: int) -> Optional[tuple]:
+    """
+    بازگرداندن کلید از cursor
+
+    Args:
+        cursor: خروجی encode_cursor
+        size: تعداد اجزای کلید
+
+    Returns:
+        tuple اعداد یا None اگر cursor معتبر نبود
+    """
+    if not cursor:
+        return None
+    try:
+        values = tuple(int(part, 36) for part in cursor.split("."))
+    except ValueError:
+        return None
+    return values if len(values) == size else None
+
+
+def datetime_to_cursor(value: datetime) -> int:
+    """تبدیل datetime (بدون timezone) به عدد صحیح میکروثانیه برای cursor"""
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def cursor_to_datetime(value: int) -> datetime:
+    """بازگرداندن datetime از عدد cursor"""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def keyset_cursors(items: list, page: int, total_pages: int, key) -> dict:
+    """
+    cursor های صفحه قبل و بعد از روی اولین و آخرین آیتم صفحه
+
+    Args:
+        key: تابعی که کلید مرتب‌سازی یک آیتم را (tuple اعداد) برمی‌گرداند
+
+    Returns:
+        دیکشنری شامل: prev_cursor, next_cursor (None اگر صفحه‌ای در آن جهت نیست)
+    """
+    if not items:
+        return {"prev_cursor": None, "next_cursor": None}
+    return {
+        "prev_cursor": encode_cursor(*key(items[0])) if page > 1 else None,
+        "next_cursor": encode_cursor(*key(items[-1])) if page < total_pages else None,
+    }
+
+
+def page_callback_data(action_prefix: str, page: int, direction: str = None, cursor: str = None) -> str:
+    """
+    ساخت callback_data یک صفحه: "{prefix}_{page}" یا "{prefix}_{page}_{direction}{cursor}"
+
+    صفحه اول همیشه بدون cursor است (تا آیتم‌های تازه هم دیده شوند) و اگر طول از
+    محدودیت تلگرام بیشتر شود به شماره صفحه (OFFSET) برمی‌گردد
+    """
+    data = f"{action_prefix}_{page}"
+    if cursor and direction and page > 1:
+        keyed = f"{data}_{direction}{cursor}"
+        if len(keyed.encode()) <= MAX_CALLBACK_DATA:
+            return keyed
+    return data
+
+
+def parse_page_callback(data: str, action_prefix: str) -> PageRef:
+    """
+    خواندن PageRef از callback_data ساخته‌شده با page_callback_data
+    (callback های قدیمی فقط با شماره صفحه هم پشتیبانی می‌شوند)
+    """
+    parts = data[len(action_prefix) + 1:].split("_", 1)
+    page = int(parts[0])
+    if len(parts) == 2 and parts[1][:1] in (CURSOR_NEXT, CURSOR_PREV):
+        return PageRef(page, parts[1][0], parts[1][1:])
+    return PageRef(page)
+
+
+def is_page_callback(data: str) -> bool:
+    """آیا callback_data مربوط به دکمه‌های صفحه‌بندی است"""
+    return bool(data) and data.startswith(PAGE_CALLBACK_PREFIXES)
@@ -0,0 +1,161 @@
+"""
+خواندن و نوشتن جریانی فایل‌های جدولی (CSV و XLSX) برای ورود و خروج گروهی داده‌ها
+ردیف‌ها یکی‌یکی خوانده می‌شوند تا حافظه مستقل از تعداد ردیف‌ها بماند
+"""
+
+import csv
+import io
+import os
+from contextlib import contextmanager
+
+
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx")
+
+
+class TableFormatError(ValueError):
+    """فایل قابل خواندن نیست (پسوند ناشناخته یا نبود پکیج لازم)"""
+
+
+def table_extension(filename: str) -> str:
+    """پسوند فایل (با حروف کوچک) یا خطا برای پسوند پشتیبانی‌نشده"""
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension not in SUPPORTED_EXTENSIONS:
+        raise TableFormatError(f"unsupported table format: {extension or filename!r}")
+    return extension
+
+
+def iter_table_rows(stream, filename: str):
+    """
+    خواندن ردیف‌های یک فایل CSV یا XLSX
+
+    Args:
+        stream: فایل باینری (فایل موقت، BytesIO و ...)
+        filename: نام فایل برای تشخیص فرمت
+
+    Yields:
+        (شماره ردیف، لیست سلول‌ها به صورت رشته) برای ردیف‌های غیرخالی
+    """
+    if table_extension(filename) == ".xlsx":
+        yield from _numbered(_iter_xlsx(stream))
+        return
+
+    # utf-8-sig: فایل‌های CSV ذخیره‌شده با Excel با BOM شروع می‌شوند
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        yield from _numbered(csv.reader(text))
+    finally:
+        # جدا کردن wrapper تا فایل اصلی با آن بسته نشود
+        text.detach()
+
+
+def _numbered(rows):
+    """شماره‌گذاری ردیف‌ها، تبدیل سلول‌ها به رشته و حذف ردیف‌های خالی"""
+    for line, row in enumerate(rows, start=1):
+        cells = ["" if cell is None else str(cell).strip() for cell in row]
+        if any(cells):
+            yield line, cells
+
+
+def _iter_xlsx(stream):
+    """ردیف‌های اولین sheet فایل XLSX در حالت read_only (بدون بارگذاری کل فایل)"""
+    try:
+        # import دیرهنگام: openpyxl فقط برای فایل‌های XLSX لازم است
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise TableFormatError("reading .xlsx files requires the openpyxl package") from e
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            # عددهای صحیح در Excel به صورت float ذخیره می‌شوند (12.0)
+            yield [int(cell) if isinstance(cell, float) and cell.is_integer() else cell for cell in row]
+    finally:
+        workbook.close()
+
+
+def map_columns(header: list, aliases: dict, optional: tuple = ()) -> dict:
+    """
+    پیدا کردن جای ستون‌ها در ردیف عنوان
+
+    Args:
+        header: سلول‌های ردیف اول
+        aliases: نام ستون -> نام‌های قابل قبول (با حروف کوچک)
+        optional: ستون‌هایی که می‌توانند در فایل نباشند
+
+    Returns:
+        نام ستون -> اندیس؛ یا دیکشنری خالی اگر ردیف اول عنوان نیست (یکی از ستون‌های لازم پیدا نشد)
+    """
+    titles = [cell.strip().lower() for cell in header]
+    columns = {}
+    for column, names in aliases.items():
+        for index, title in enumerate(titles):
+            if title in names:
+                columns[column] = index
+                break
+        else:
+            if column not in optional:
+                return {}
+    return columns
+
+
+@contextmanager
+def csv_writer(stream):
+    """
+    writer برای نوشتن CSV در یک فایل باینری (UTF-8 با BOM تا Excel متن فارسی را درست نشان دهد)
+
+    Yields:
+        csv.writer
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        yield csv.writer(text)
+    finally:
+        text.flush()
+        text.detach()
+
+
+class _XlsxRows:
+    """رابط writerow/writerows (مثل csv.writer) روی یک sheet در حالت write_only"""
+
+    def __init__(self, sheet):
+        self._sheet = sheet
+
+    def writerow(self, row):
+        self._sheet.append(list(row))
+
+    def writerows(self, rows):
+        for row in rows:
+            self._sheet.append(list(row))
+
+
+@contextmanager
+def table_writer(stream, extension: str, sheet_title: str = "Sheet"):
+    """
+    writer جریانی برای CSV یا XLSX با رابط writerow/writerows
+
+    XLSX در حالت write_only ساخته می‌شود (ردیف‌ها نگه‌داری نمی‌شوند) و هنگام خروج در stream ذخیره می‌شود.
+
+    Args:
+        stream: فایل باینری مقصد
+        extension: ".csv" یا ".xlsx"
+        sheet_title: نام sheet در XLSX
+
+    Yields:
+        writer
+    """
+    if extension == ".csv":
+        with csv_writer(stream) as writer:
+            yield writer
+        return
+
+    if extension != ".xlsx":
+        raise TableFormatError(f"unsupported table format: {extension!r}")
+    try:
+        # import دیرهنگام: openpyxl فقط برای فایل‌های XLSX لازم است
+        from openpyxl import Workbook
+    except ImportError as e:
+        raise TableFormatError("writing .xlsx files requires the openpyxl package") from e
+
+    workbook = Workbook(write_only=True)
+    yield _XlsxRows(workbook.create_sheet(sheet_title))
+    workbook.save(stream)
@@ -3,7 +3,7 @@
 """
 
 from ..repository import ProductRepository, SaleRepository, RepositoryManager
-from ..repository.converters import product_to_dict, sale_to_dict
+from ..repository.converters import product_to_view, sale_to_view
 
 
 class DeletionValidator:
@@ -42,10 +42,10 @@ class DeletionValidator:
             product_id: شناسه محصول
 
         Returns:
-            دیکشنری شامل: is_valid (bool), product (dict|None)
+            دیکشنری شامل: is_valid (bool), product (ProductView|None)
         """
         product_model = self.product_repo.get_by_id(product_id)
-        product = product_to_dict(product_model) if product_model else None
+        product = product_to_view(product_model) if product_model else None
 
         return {"is_valid": product is not None, "product": product}
 
@@ -57,9 +57,9 @@ class DeletionValidator:
             sale_id: شناسه فروش
 
         Returns:
-            دیکشنری شامل: is_valid (bool), sale (dict|None)
+            دیکشنری شامل: is_valid (bool), sale (SaleView|None)
         """
         sale_model = self.sale_repo.get_by_id(sale_id)
-        sale = sale_to_dict(sale_model) if sale_model else None
+        sale = sale_to_view(sale_model) if sale_model else None
 
         return {"is_valid": sale is not None, "sale": sale}
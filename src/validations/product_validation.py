@@ -3,7 +3,7 @@
 """
 
 from ..repository import ProductRepository, RepositoryManager
-from ..repository.converters import product_to_dict
+from ..repository.converters import product_to_view
 
 
 class ProductValidator:
@@ -37,10 +37,10 @@ class ProductValidator:
             product_id: شناسه محصول
 
         Returns:
-            دیکشنری شامل: is_valid (bool), product (dict|None)
+            دیکشنری شامل: is_valid (bool), product (ProductView|None)
         """
         product_model = self.product_repo.get_by_id(product_id)
-        product = product_to_dict(product_model) if product_model else None
+        product = product_to_view(product_model) if product_model else None
 
         return {
             'is_valid': product is not None,
@@ -2,8 +2,11 @@
 ولیدیشن‌های فروش
 """
 
+from datetime import datetime, time
+
 from ..repository import SaleRepository, ProductRepository, RepositoryManager
-from ..repository.converters import sale_to_dict, product_to_dict
+from ..repository.converters import sale_to_view, product_to_view
+from ..utils.jalali import JalaliDate, to_gregorian
 
 
 class SaleValidator:
@@ -38,10 +41,10 @@ class SaleValidator:
             sale_id: شناسه فروش
 
         Returns:
-            دیکشنری شامل: is_valid (bool), sale (dict|None)
+            دیکشنری شامل: is_valid (bool), sale (SaleView|None)
         """
         sale_model = self.sale_repo.get_by_id(sale_id)
-        sale = sale_to_dict(sale_model) if sale_model else None
+        sale = sale_to_view(sale_model) if sale_model else None
 
         return {
             'is_valid': sale is not None,
@@ -212,7 +215,8 @@ class SaleInputValidator:
             date: تاریخ فروش
 
         Returns:
-            دیکشنری شامل: is_valid (bool), error_message (str|None), date (str|None)
+            دیکشنری شامل: is_valid (bool), error_message (str|None),
+            date (str|None، شمسی با فرمت یکسان 1403/09/29), sale_date (datetime|None، همان روز به میلادی)
         """
         if not date or not date.strip():
             return {
@@ -240,11 +244,9 @@ class SaleInputValidator:
             if year_int < 1300 or year_int > 1500:
                 raise ValueError("سال نامعتبر")
 
-            if month_int < 1 or month_int > 12:
-                raise ValueError("ماه نامعتبر")
-
-            if day_int < 1 or day_int > 31:
-                raise ValueError("روز نامعتبر")
+            # ماه و روز باید در تقویم شمسی وجود داشته باشند (مثلاً 1403/07/31 یا اسفند 30 سال غیرکبیسه نه)
+            jalali_date = JalaliDate(year_int, month_int, day_int)
+            gregorian_date = to_gregorian(*jalali_date)
 
         except (ValueError, TypeError):
             return {
@@ -255,7 +257,8 @@ class SaleInputValidator:
         return {
             'is_valid': True,
             'error_message': None,
-            'date': date_str
+            'date': str(jalali_date),
+            'sale_date': datetime.combine(gregorian_date, time.min)
         }
 
     def validate_product_availability(self, product_id: int, quantity: int) -> dict:
@@ -267,7 +270,7 @@ class SaleInputValidator:
             quantity: تعداد درخواستی
 
         Returns:
-            دیکشنری شامل: is_valid (bool), error_message (str|None), product (dict|None)
+            دیکشنری شامل: is_valid (bool), error_message (str|None), product (ProductView|None)
         """
         product_model = self.product_repo.get_by_id(product_id)
 
@@ -278,7 +281,7 @@ class SaleInputValidator:
                 'product': None
             }
 
-        product = product_to_dict(product_model)
+        product = product_to_view(product_model)
 
         if product["quantity"] <= 0:
             return {